@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.core.mail import send_mail
+
+from jobs.registry import task
+
+# Envio do e-mail de recuperação de senha, feito pelos workers para que a
+# requisição não espere o servidor SMTP. Falhas de envio são repetidas.
+
+
+@task(max_attempts=5)
+def send_password_reset_email(email, reset_link):
+    subject = "Recuperação de Senha Eletro Rápida"
+    message = f"Clique no link para redefinir sua senha:\n\n{reset_link}"
+    from_email = getattr(settings, "DEFAULT_FROM_EMAIL", None)
+    send_mail(subject, message, from_email, [email], fail_silently=False)
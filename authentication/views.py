@@ -3,18 +3,18 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework.permissions import AllowAny
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.conf import settings
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
+from core.throttling import LoginRateThrottle, PasswordResetRateThrottle
 from logsystem.utils import log_internal_error
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
+from core.swagger import openapi, swagger_auto_schema
 
 from .messages import AuthenticationMessages
+from .tasks import send_password_reset_email
 from .serializers import (
     LogoutSerializer,
     PasswordResetRequestSerializer,
@@ -24,6 +24,13 @@ from .serializers import (
 User = get_user_model()
 
 
+class LoginView(TokenObtainPairView):
+    throttle_classes = [LoginRateThrottle]
+
+    # Login (obtenção do par de tokens JWT) com limite de tentativas por IP,
+    # evitando que um cliente consuma CPU com hashes de senha em sequência.
+
+
 class LogoutView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -46,6 +53,7 @@ class LogoutView(APIView):
 
 class RequestPasswordResetView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [PasswordResetRateThrottle]
 
     # Classe responsável por enviar o email para o usuário
     # Esse email contem o link de acesso o uid e o token para validação do usuário.
@@ -79,11 +87,8 @@ class RequestPasswordResetView(APIView):
 
             reset_link = f"http://localhost:8080/reset-password?uid={uid}&token={token}"
 
-            subject = "Recuperação de Senha Eletro Rápida"
-            message = f"Clique no link para redefinir sua senha:\n\n{reset_link}"
-            from_email = getattr(settings, "DEFAULT_FROM_EMAIL", None)
-
-            send_mail(subject, message, from_email, [email], fail_silently=False)
+            # O e-mail é enviado em segundo plano pelos workers (run_workers).
+            send_password_reset_email.enqueue(email=email, reset_link=reset_link)
 
             return Response(
                 {"detail": AuthenticationMessages.SUCCESS_EMAIL_SEND},
@@ -0,0 +1,167 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections
+from django.urls import Resolver404, resolve
+from rest_framework.views import APIView
+
+from logsystem.utils import log_internal_error
+from .messages import BatchMessages
+
+# Execução das requisições de um lote dentro do próprio processo.
+# Cada item vira uma requisição interna resolvida pelas mesmas rotas da API e
+# entregue diretamente à view, sem passar de novo pelos middlewares nem pela
+# rede. O usuário já autenticado no /batch/ é repassado às views (autenticação
+# forçada do DRF), então o token JWT é validado uma única vez. Por isso só são
+# aceitas rotas da API (views do DRF): admin, Swagger, /metrics e demais views
+# do Django dependem de sessão, CSRF e outros middlewares e recebem 400. O
+# controle de admissão e as métricas contam o lote como uma única requisição.
+#
+# Sequências de GETs consecutivos rodam em paralelo em um pool de threads;
+# métodos de escrita rodam sozinhos e na ordem recebida, de modo que um item
+# sempre enxerga as alterações feitas pelos itens anteriores a ele.
+
+# Métodos aceitos em um item do lote (ver serializers.py); só GET é paralelizado.
+METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
+READ_ONLY_METHODS = {"GET"}
+
+# Cabeçalhos da requisição original que não se aplicam às requisições internas.
+# A Idempotency-Key do lote não vale para cada item (todos teriam a mesma chave).
+SKIPPED_META = {
+    "CONTENT_LENGTH",
+    "CONTENT_TYPE",
+    "QUERY_STRING",
+    "HTTP_AUTHORIZATION",
+    "HTTP_IDEMPOTENCY_KEY",
+}
+
+# Cabeçalhos das respostas internas repassados ao cliente.
+FORWARDED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Location", "Retry-After")
+
+
+def build_request(request, item):
+    url = urlsplit(item["path"])
+    body = b""
+    if "body" in item:
+        body = json.dumps(item["body"]).encode()
+    environ = {
+        key: value
+        for key, value in request.META.items()
+        if key not in SKIPPED_META and not key.startswith("wsgi.")
+    }
+    environ.update(
+        {
+            "REQUEST_METHOD": item["method"],
+            "PATH_INFO": url.path,
+            "QUERY_STRING": url.query,
+            "CONTENT_TYPE": "application/json",
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.input": BytesIO(body),
+            "wsgi.url_scheme": request.scheme,
+        }
+    )
+    sub_request = WSGIRequest(environ)
+    sub_request.user = request.user
+    sub_request._force_auth_user = request.user
+    sub_request._force_auth_token = request.auth
+    return sub_request
+
+
+def render_body(response):
+    content = response.content
+    if not content:
+        return None
+    if response.get("Content-Type", "").startswith("application/json"):
+        return json.loads(content)
+    return content.decode(response.charset or "utf-8", errors="replace")
+
+
+def is_api_view(view):
+    view_class = getattr(view, "cls", None)
+    return isinstance(view_class, type) and issubclass(view_class, APIView)
+
+
+def run_item(request, item):
+    path = urlsplit(item["path"]).path
+    if path.rstrip("/") == "/batch":
+        return {"status": 400, "body": {"detail": BatchMessages.NESTED_BATCH}}
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return {"status": 404, "body": {"detail": BatchMessages.NOT_FOUND}}
+    if not is_api_view(match.func):
+        return {"status": 400, "body": {"detail": BatchMessages.NOT_API_ROUTE}}
+
+    sub_request = build_request(request, item)
+    try:
+        response = match.func(sub_request, *match.args, **match.kwargs)
+        if response.streaming:
+            response.close()
+            return {
+                "status": 400,
+                "body": {"detail": BatchMessages.STREAMING_NOT_SUPPORTED},
+            }
+        if hasattr(response, "render"):
+            response.render()
+        return {
+            "status": response.status_code,
+            "headers": {
+                header: response[header]
+                for header in FORWARDED_HEADERS
+                if response.has_header(header)
+            },
+            "body": render_body(response),
+        }
+    except Exception as e:
+        log_internal_error(sub_request, e)
+        return {"status": 500, "body": {"detail": BatchMessages.ERROR}}
+
+
+# Executa um item em uma thread do pool e fecha as conexões abertas por ela,
+# já que as threads do pool não passam pelo ciclo de requisição do Django.
+
+
+def run_item_in_thread(request, item):
+    try:
+        return run_item(request, item)
+    finally:
+        connections.close_all()
+
+
+# Agrupa GETs consecutivos; cada escrita forma um grupo próprio.
+
+
+def group_items(items):
+    groups = []
+    for index, item in enumerate(items):
+        read_only = item["method"] in READ_ONLY_METHODS
+        if read_only and groups and groups[-1][0]:
+            groups[-1][1].append((index, item))
+        else:
+            groups.append((read_only, [(index, item)]))
+    return groups
+
+
+def run_batch(request, items):
+    results = [None] * len(items)
+    with ThreadPoolExecutor(max_workers=settings.BATCH_WORKERS) as pool:
+        for read_only, group in group_items(items):
+            if read_only and len(group) > 1:
+                futures = [
+                    (index, pool.submit(run_item_in_thread, request, item))
+                    for index, item in group
+                ]
+                for index, future in futures:
+                    results[index] = future.result()
+            else:
+                for index, item in group:
+                    results[index] = run_item(request, item)
+
+    return [
+        {"method": item["method"], "path": item["path"], "headers": {}, **result}
+        for item, result in zip(items, results)
+    ]
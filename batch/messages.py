@@ -0,0 +1,7 @@
+class BatchMessages:
+    ERROR = "Ocorreu um erro inesperado. Tente novamente mais tarde."
+    TOO_MANY_REQUESTS = "O lote aceita no máximo {max_requests} requisições."
+    NESTED_BATCH = "Uma requisição do lote não pode chamar /batch/."
+    NOT_FOUND = "Endereço não encontrado."
+    NOT_API_ROUTE = "Só rotas da API podem ser incluídas no lote."
+    STREAMING_NOT_SUPPORTED = "Respostas em stream não podem ser incluídas no lote."
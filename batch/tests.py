@@ -0,0 +1,83 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from .messages import BatchMessages
+
+
+class BatchAPITests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("ana", password="x")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def batch(self, *items):
+        response = self.client.post("/batch/", {"requests": list(items)}, format="json")
+        self.assertEqual(response.status_code, 200)
+        return response.json()["responses"]
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+        response = self.client.post(
+            "/batch/", {"requests": [{"path": "/components/"}]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_items_run_as_the_batch_user(self):
+        created, detail = self.batch(
+            {"method": "POST", "path": "/components/", "body": {"name": "Resistor", "quantity": 5}},
+            {"method": "GET", "path": "/components/"},
+        )
+
+        self.assertEqual(created["status"], 201)
+        self.assertEqual(detail["status"], 200)
+        self.assertEqual(detail["headers"]["Content-Type"], "application/json")
+
+    def test_writes_are_visible_to_later_items(self):
+        created, = self.batch(
+            {"method": "POST", "path": "/components/", "body": {"name": "Diodo", "quantity": 1}},
+        )
+        pk = created["body"]["data"]["id"]
+
+        updated, detail = self.batch(
+            {
+                "method": "PUT",
+                "path": f"/components/{pk}/",
+                "body": {"name": "Diodo Zener", "quantity": 2},
+            },
+            {"method": "GET", "path": f"/components/{pk}/"},
+        )
+
+        self.assertEqual(updated["status"], 200)
+        self.assertEqual(detail["body"]["name"], "Diodo Zener")
+
+    def test_non_api_routes_are_rejected(self):
+        for path in ("/admin/", "/metrics", "/swagger/", "/healthz"):
+            with self.subTest(path=path):
+                result, = self.batch({"method": "GET", "path": path})
+                self.assertEqual(result["status"], 400)
+                self.assertEqual(result["body"]["detail"], BatchMessages.NOT_API_ROUTE)
+
+    def test_nested_batch_is_rejected(self):
+        result, = self.batch({"method": "POST", "path": "/batch/", "body": {"requests": []}})
+
+        self.assertEqual(result["status"], 400)
+        self.assertEqual(result["body"]["detail"], BatchMessages.NESTED_BATCH)
+
+    def test_unknown_path_returns_404(self):
+        result, = self.batch({"method": "GET", "path": "/nao-existe/"})
+
+        self.assertEqual(result["status"], 404)
+
+    def test_unsupported_method_is_invalid(self):
+        response = self.client.post(
+            "/batch/",
+            {"requests": [{"method": "HEAD", "path": "/components/"}]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import BatchAPIView
+
+urlpatterns = [
+    path("", BatchAPIView.as_view(), name="batch"),
+]
@@ -0,0 +1,53 @@
+from django.conf import settings
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status, permissions
+from core.swagger import swagger_auto_schema
+
+from logsystem.utils import log_internal_error
+from .dispatch import run_batch
+from .messages import BatchMessages
+from .serializers import BatchRequestSerializer
+
+
+class BatchAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Executa várias requisições da API em uma única chamada. "
+            'Corpo: {"requests": [{"method": "GET", "path": "/components/", "body": {...}}]}'
+        ),
+        request_body=BatchRequestSerializer,
+        responses={200: "Lista com status, cabeçalhos e corpo de cada requisição"},
+    )
+
+    # Recebe uma lista de requisições (método, caminho e corpo) e as executa
+    # internamente com o usuário já autenticado nesta chamada.
+    # Retorna, na mesma ordem, o status, os principais cabeçalhos e o corpo de cada uma.
+    # O status desta resposta é sempre 200; falhas aparecem no status de cada item.
+    # Em caso de lote inválido ou maior que BATCH_MAX_REQUESTS, retorna status 400.
+    # Em caso de erro interno, registra no sistema de logs.
+
+    def post(self, request):
+        try:
+            serializer = BatchRequestSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            items = serializer.validated_data["requests"]
+            if len(items) > settings.BATCH_MAX_REQUESTS:
+                return Response(
+                    {
+                        "detail": BatchMessages.TOO_MANY_REQUESTS.format(
+                            max_requests=settings.BATCH_MAX_REQUESTS
+                        )
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            return Response({"responses": run_batch(request, items)})
+        except Exception as e:
+            log_internal_error(request, e)
+            return Response(
+                {"detail": BatchMessages.ERROR},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
@@ -0,0 +1,69 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Cache dos resultados da busca de componentes.
+# Todas as chaves carregam a "geração" atual do catálogo. Sempre que um
+# componente é criado, alterado ou excluído a geração é incrementada
+# (ver signals.py), o que invalida de uma vez todas as buscas em cache
+# sem precisar localizar e apagar chave por chave.
+# Buscas sem resultado também são armazenadas (cache negativo).
+
+GENERATION_KEY = "components:generation"
+SEARCH_KEY_PREFIX = "components:search_results"
+
+
+# Normaliza o termo de busca para uso como chave do cache.
+# Como a busca usa icontains, termos que diferem apenas em maiúsculas/minúsculas
+# ou em espaços nas pontas retornam exatamente o mesmo resultado.
+
+
+def normalize_search_term(term):
+    return term.strip().lower()
+
+
+# Retorna a geração atual do catálogo.
+# Caso ainda não exista no cache, inicializa com o timestamp atual para que
+# nunca reaproveite uma geração antiga após o cache ser reiniciado.
+
+
+def get_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_generation():
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+def _search_key(term, generation):
+    digest = hashlib.md5(term.encode("utf-8")).hexdigest()
+    return f"{SEARCH_KEY_PREFIX}:{generation}:{digest}"
+
+
+# Recupera o resultado serializado de uma busca já normalizada.
+# A entrada guarda os resultados e o total encontrado ({"results": ..., "total": ...}).
+# Retorna None quando não há entrada em cache (uma busca vazia também é guardada).
+# A geração deve ser lida uma única vez, antes da consulta, e repassada à leitura
+# e à gravação: se o catálogo mudar durante a consulta, o resultado antigo fica
+# na geração anterior e não é servido depois da mudança.
+
+
+def get_cached_search(term, generation):
+    return cache.get(_search_key(term, generation))
+
+
+def set_cached_search(term, generation, data):
+    cache.set(
+        _search_key(term, generation),
+        data,
+        timeout=settings.COMPONENT_SEARCH_CACHE_TIMEOUT,
+    )
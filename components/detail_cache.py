@@ -0,0 +1,129 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.metrics import COMPONENT_CACHE
+from .models import Component
+from .serializers import ComponentSerializer
+
+# Cache dos componentes serializados, usado no detalhe (GET /components/<pk>/).
+# Cada componente tem uma versão no cache, incrementada (após o commit) sempre
+# que ele é gravado ou excluído (ver signals.py); a chave dos dados inclui a
+# versão, então uma alteração invalida a entrada sem apagá-la e uma leitura
+# atrasada nunca sobrescreve a versão nova. Componentes inexistentes também
+# ficam em cache (cache negativo).
+#
+# Carregamento único (single-flight): quando a entrada não está no cache, só uma
+# requisição consulta o banco. No processo, as demais threads esperam o
+# resultado da primeira; entre processos, quem carrega segura uma trava no cache
+# (cache.add) e os outros aguardam a entrada aparecer, por até
+# COMPONENT_CACHE_WAIT segundos, antes de consultar o banco por conta própria.
+#
+# A versão só é compartilhada entre processos quando o cache é compartilhado
+# (REDIS_URL). Com o cache local, os outros workers só veem a alteração quando
+# a entrada expira (COMPONENT_CACHE_TIMEOUT).
+
+VERSION_KEY = "components:object_version:{pk}"
+OBJECT_KEY = "components:object:{pk}:{version}"
+LOCK_KEY = "components:object_lock:{pk}:{version}"
+MISSING = "missing"
+POLL_INTERVAL = 0.02
+
+
+def get_version(pk):
+    key = VERSION_KEY.format(pk=pk)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(pk):
+    key = VERSION_KEY.format(pk=pk)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def _decode(cached):
+    return None if cached == MISSING else cached
+
+
+def _load(pk):
+    component = Component.objects.filter(pk=pk).first()
+    return dict(ComponentSerializer(component).data) if component else None
+
+
+class Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.failed = False
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+# Retorna os dados serializados do componente, ou None se ele não existir.
+
+
+def get_component_data(pk):
+    version = get_version(pk)
+    key = OBJECT_KEY.format(pk=pk, version=version)
+    cached = cache.get(key)
+    if cached is not None:
+        COMPONENT_CACHE.labels("hit").inc()
+        return _decode(cached)
+
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = Flight()
+
+    if not leader:
+        COMPONENT_CACHE.labels("coalesced").inc()
+        if flight.done.wait(settings.COMPONENT_CACHE_WAIT) and not flight.failed:
+            return flight.result
+        return _load(pk)
+
+    COMPONENT_CACHE.labels("miss").inc()
+    try:
+        flight.result = _fill(pk, key, version)
+    except Exception:
+        flight.failed = True
+        raise
+    finally:
+        with _flights_lock:
+            _flights.pop(key, None)
+        flight.done.set()
+    return flight.result
+
+
+def _fill(pk, key, version):
+    lock_key = LOCK_KEY.format(pk=pk, version=version)
+    locked = cache.add(lock_key, 1, timeout=settings.COMPONENT_CACHE_LOCK_TIMEOUT)
+    if not locked:
+        # Outro processo já está carregando este componente.
+        deadline = time.monotonic() + settings.COMPONENT_CACHE_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            cached = cache.get(key)
+            if cached is not None:
+                return _decode(cached)
+    try:
+        data = _load(pk)
+        cache.set(
+            key,
+            MISSING if data is None else data,
+            timeout=settings.COMPONENT_CACHE_TIMEOUT,
+        )
+        return data
+    finally:
+        if locked:
+            cache.delete(lock_key)
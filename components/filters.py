@@ -0,0 +1,97 @@
+from django.conf import settings
+from django.db.models import Count, Q
+
+from .locations import build_location_path
+
+# Filtros da listagem de componentes e contagens por faceta.
+# Cada filtro ativo vira uma condição (Q). As contagens de uma faceta aplicam
+# todos os filtros ativos menos o da própria faceta, para que a interface mostre
+# quantos itens cada opção traria. Todas as contagens saem de um único
+# aggregate com Count(..., filter=Q(...)), ou seja, uma só varredura da tabela.
+
+
+def has_file(field):
+    return Q(**{f"{field}__isnull": False}) & ~Q(**{field: ""})
+
+
+def low_stock():
+    return Q(quantity__lte=settings.STOCK_ALERT_THRESHOLD)
+
+
+# Opções de cada faceta: nome da opção -> condição.
+
+
+def facet_options():
+    threshold = settings.STOCK_ALERT_THRESHOLD
+    return {
+        "quantity": {
+            "out_of_stock": Q(quantity=0),
+            "low": Q(quantity__gt=0, quantity__lte=threshold),
+            "available": Q(quantity__gt=threshold),
+        },
+        "low_stock": {"true": low_stock(), "false": ~low_stock()},
+        "has_image": {
+            "true": has_file("product_image"),
+            "false": ~has_file("product_image"),
+        },
+        "has_datasheet": {
+            "true": has_file("datasheet"),
+            "false": ~has_file("datasheet"),
+        },
+    }
+
+
+# Converte os filtros validados em condições, indexadas pela faceta a que pertencem.
+
+
+def build_conditions(filters):
+    conditions = {}
+    if filters.get("name"):
+        conditions["name"] = Q(name__icontains=filters["name"])
+    location = build_location_path(filters.get("location"))
+    if location:
+        conditions["location"] = Q(location_path__startswith=location)
+
+    quantity = Q()
+    if filters.get("min_quantity") is not None:
+        quantity &= Q(quantity__gte=filters["min_quantity"])
+    if filters.get("max_quantity") is not None:
+        quantity &= Q(quantity__lte=filters["max_quantity"])
+    if quantity:
+        conditions["quantity"] = quantity
+
+    if filters.get("low_stock") is not None:
+        conditions["low_stock"] = low_stock() if filters["low_stock"] else ~low_stock()
+    for field, facet in (("product_image", "has_image"), ("datasheet", "has_datasheet")):
+        if filters.get(facet) is not None:
+            conditions[facet] = has_file(field) if filters[facet] else ~has_file(field)
+    return conditions
+
+
+def combine(conditions, exclude=None):
+    combined = Q()
+    for facet, condition in conditions.items():
+        if facet != exclude:
+            combined &= condition
+    return combined
+
+
+def apply_filters(queryset, conditions):
+    return queryset.filter(combine(conditions))
+
+
+def facet_counts(queryset, conditions):
+    aggregates = {}
+    labels = {}
+    for facet, options in facet_options().items():
+        others = combine(conditions, exclude=facet)
+        for option, condition in options.items():
+            alias = f"{facet}_{option}"
+            labels[alias] = (facet, option)
+            aggregates[alias] = Count("pk", filter=others & condition)
+
+    row = queryset.aggregate(**aggregates)
+    facets = {facet: {} for facet in facet_options()}
+    for alias, (facet, option) in labels.items():
+        facets[facet][option] = row[alias]
+    return facets
@@ -0,0 +1,43 @@
+import re
+
+# Interpretação do campo location_reference dos componentes.
+# Referências como "A-3-2-7", "a/03/2/7" ou "A 3 2 7" são
+# quebradas em segmentos (depósito/corredor/prateleira/caixa) e gravadas em
+# location_path como um caminho materializado, ex.: "A/000003/000002/000007/".
+# Os segmentos ficam em maiúsculas e os números com zeros à esquerda, para que a
+# ordem alfabética do caminho coincida com a ordem física (2 antes de 10) e para
+# que "tudo na prateleira X" seja uma busca por prefixo atendida pelo índice.
+
+LEVELS = ("warehouse", "aisle", "shelf", "bin")
+SEPARATORS = re.compile(r"\s*(?:[/\\>|,;.\-]|\s)\s*")
+DIGITS = re.compile(r"\d+")
+NUMBER_WIDTH = 6
+
+
+def parse_location(reference):
+    if not reference:
+        return []
+    return [segment.upper() for segment in SEPARATORS.split(reference.strip()) if segment]
+
+
+def _sortable(segment):
+    return DIGITS.sub(lambda match: match.group().zfill(NUMBER_WIDTH), segment)
+
+
+def build_location_path(reference):
+    segments = parse_location(reference)
+    if not segments:
+        return ""
+    return "".join(f"{_sortable(segment)}/" for segment in segments)
+
+
+# Estrutura legível da localização: os quatro primeiros segmentos são nomeados
+# pelos níveis conhecidos e os demais, se houver, ficam em "extra".
+
+
+def describe_location(reference):
+    segments = parse_location(reference)
+    described = dict(zip(LEVELS, segments))
+    if len(segments) > len(LEVELS):
+        described["extra"] = segments[len(LEVELS):]
+    return described
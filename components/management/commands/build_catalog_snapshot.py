@@ -0,0 +1,22 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from components.snapshot import build_snapshot, snapshot_path
+
+# Gera o snapshot comprimido do catálogo na versão atual (maior sync_seq).
+# Nada é feito se o arquivo dessa versão já existir.
+
+
+class Command(BaseCommand):
+    help = "Gera o snapshot comprimido do catálogo de componentes."
+
+    def handle(self, *args, **options):
+        version, created = build_snapshot()
+        if not created:
+            self.stdout.write(self.style.SUCCESS(f"Snapshot da versão {version} já existe."))
+            return
+        size = os.path.getsize(snapshot_path(version))
+        self.stdout.write(
+            self.style.SUCCESS(f"Snapshot da versão {version} gerado ({size} bytes).")
+        )
@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from components.stock import compact_ledger
+from core.utils import parse_datetime_param
+
+# Consolida as movimentações de estoque em snapshots por componente.
+# Por padrão o corte é o início do dia atual (UTC): movimentações mais recentes
+# continuam sendo somadas a partir do último snapshot. O corte deve ficar no
+# passado para que nenhuma movimentação ainda em andamento fique para trás.
+
+
+class Command(BaseCommand):
+    help = "Gera snapshots de estoque consolidando as movimentações até a data de corte."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--before",
+            help="Data/hora de corte (ISO 8601). Padrão: início do dia atual.",
+        )
+
+    def handle(self, *args, **options):
+        if options["before"]:
+            cutoff = parse_datetime_param(options["before"])
+            if cutoff is None:
+                raise CommandError("Data de corte inválida.")
+        else:
+            cutoff = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        if cutoff > timezone.now() - timedelta(minutes=5):
+            raise CommandError("A data de corte deve estar no passado.")
+
+        created = compact_ledger(cutoff)
+        self.stdout.write(
+            self.style.SUCCESS(f"{created} snapshot(s) gerado(s) em {cutoff.isoformat()}.")
+        )
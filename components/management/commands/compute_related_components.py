@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from components.related import compute_related
+
+# Recalcula os componentes relacionados a partir das sessões de busca do
+# SearchLog. Também é executado periodicamente pelos workers (JOBS_PERIODIC).
+
+
+class Command(BaseCommand):
+    help = "Recalcula os componentes buscados juntos (relacionados)."
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        pairs = compute_related()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(f"{pairs} relação(ões) gravada(s) em {elapsed:.2f}s.")
+        )
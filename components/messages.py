@@ -5,3 +5,11 @@ class ComponentMessages:
     NOT_FOUND = "Componente não encontrado."
     ERROR = "Ocorreu um erro inesperado. Tente novamente mais tarde."
     SEARCH_TERM_REQUIRED = "O parâmetro 'term' é obrigatório para a busca."
+    INVALID_SYNC_TOKEN = "O parâmetro 'since' deve ser um token de sincronização válido."
+    INVALID_DATE = "O parâmetro 'as_of' deve ser uma data ou data/hora ISO 8601."
+    INVALID_PERIOD = "Informe 'since' e 'until' como datas ISO 8601, com 'since' anterior a 'until'."
+    LOCATION_PREFIX_REQUIRED = "O parâmetro 'prefix' é obrigatório (ex.: A/3)."
+    PICKING_LIST_TOO_LARGE = "A lista de separação aceita no máximo {max_items} itens."
+    INVALID_QUANTITY_RANGE = "'max_quantity' deve ser maior ou igual a 'min_quantity'."
+    SNAPSHOT_NOT_FOUND = "Versão do snapshot do catálogo não encontrada."
+    SNAPSHOT_UNAVAILABLE = "O snapshot do catálogo ainda não foi gerado."
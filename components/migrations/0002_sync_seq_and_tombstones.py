@@ -0,0 +1,30 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('components', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='component',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='Data da exclusão. Componentes excluídos são mantidos como tombstones.', null=True),
+        ),
+        migrations.AddField(
+            model_name='component',
+            name='sync_seq',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False, help_text='Número da última alteração, usado pela sincronização incremental.'),
+        ),
+        migrations.RunSQL(
+            sql=[
+                "CREATE SEQUENCE components_component_sync_seq",
+                "UPDATE components_component SET sync_seq = nextval('components_component_sync_seq')",
+            ],
+            reverse_sql="DROP SEQUENCE components_component_sync_seq",
+        ),
+    ]
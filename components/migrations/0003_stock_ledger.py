@@ -0,0 +1,54 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:23
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('components', '0002_sync_seq_and_tombstones'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('delta', models.IntegerField(help_text='Variação da quantidade (negativa para saídas).')),
+                ('reason', models.CharField(choices=[('initial', 'Saldo inicial'), ('create', 'Cadastro do componente'), ('adjustment', 'Ajuste de quantidade')], max_length=20)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('component', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_movements', to='components.component')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['component', 'created_at'], name='components__compone_9727ec_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StockSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('as_of', models.DateTimeField(help_text='Inclui as movimentações até este instante.')),
+                ('quantity', models.IntegerField()),
+                ('consumed', models.PositiveBigIntegerField(help_text='Total acumulado de saídas até as_of.')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('component', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_snapshots', to='components.component')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('component', 'as_of'), name='components_stocksnapshot_unique')],
+            },
+        ),
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO components_stockmovement (component_id, delta, reason, created_at)
+                SELECT id, quantity, 'initial', now()
+                FROM components_component
+                WHERE quantity <> 0
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
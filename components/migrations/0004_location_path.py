@@ -0,0 +1,69 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:25
+
+import re
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+# Mesma interpretação de components/locations.py, copiada para que a migração
+# não dependa de mudanças futuras no código.
+
+SEPARATORS = re.compile(r"\s*(?:[/\\>|,;.\-]|\s)\s*")
+DIGITS = re.compile(r"\d+")
+NUMBER_WIDTH = 6
+
+
+def build_location_path(reference):
+    if not reference:
+        return ""
+    segments = [
+        segment.upper() for segment in SEPARATORS.split(reference.strip()) if segment
+    ]
+    return "".join(
+        DIGITS.sub(lambda match: match.group().zfill(NUMBER_WIDTH), segment) + "/"
+        for segment in segments
+    )
+
+
+# Preenche location_path percorrendo os componentes com iterator() e gravando
+# em lotes de BATCH_SIZE, sem carregar a tabela inteira na memória.
+
+
+def fill_location_path(apps, schema_editor):
+    Component = apps.get_model("components", "Component")
+    components = (
+        Component.objects.exclude(location_reference__isnull=True)
+        .only("pk", "location_reference")
+        .order_by("pk")
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    batch = []
+    for component in components:
+        component.location_path = build_location_path(component.location_reference)
+        batch.append(component)
+        if len(batch) >= BATCH_SIZE:
+            Component.objects.bulk_update(batch, ["location_path"])
+            batch = []
+    if batch:
+        Component.objects.bulk_update(batch, ["location_path"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('components', '0003_stock_ledger'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='component',
+            name='location_path',
+            field=models.TextField(blank=True, default='', editable=False, help_text='Localização normalizada (ex.: A/000003/000002/), derivada de location_reference.'),
+        ),
+        migrations.AddIndex(
+            model_name='component',
+            index=models.Index(fields=['location_path'], name='component_location_path_idx', opclasses=['text_pattern_ops']),
+        ),
+        migrations.RunPython(fill_location_path, migrations.RunPython.noop),
+    ]
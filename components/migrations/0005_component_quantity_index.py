@@ -0,0 +1,17 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('components', '0004_location_path'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='component',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['quantity'], name='component_quantity_idx'),
+        ),
+    ]
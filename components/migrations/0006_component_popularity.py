@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('components', '0005_component_quantity_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='component',
+            name='popularity',
+            field=models.PositiveBigIntegerField(db_index=True, default=0, editable=False, help_text='Pontuação de popularidade, somada a cada busca e visualização do componente.'),
+        ),
+    ]
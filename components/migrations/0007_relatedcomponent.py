@@ -0,0 +1,27 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('components', '0006_component_popularity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedComponent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveIntegerField(help_text='Quantidade de sessões em que os dois componentes foram buscados.')),
+                ('rank', models.PositiveSmallIntegerField(help_text='Posição entre os vizinhos (1 = mais frequente).')),
+                ('component', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_links', to='components.component')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='components.component')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('component', 'rank'), name='components_relatedcomponent_rank_unique')],
+            },
+        ),
+    ]
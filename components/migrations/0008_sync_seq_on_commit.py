@@ -0,0 +1,44 @@
+from django.db import migrations
+
+
+# O número de sincronização passa a ser atribuído no commit, por uma constraint
+# trigger adiada: Component.save() grava sync_seq = 0 e o trigger, já no fim da
+# transação, adquire o advisory lock 7301 e troca o 0 pelo próximo valor da
+# sequência. O lock só é mantido entre esse ponto e o fim do commit, então os
+# números continuam ficando visíveis na ordem em que foram gerados sem que
+# gravações em componentes diferentes esperem umas pelas outras durante toda a
+# transação.
+
+CREATE_TRIGGER = """
+CREATE FUNCTION components_component_assign_sync_seq() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(7301);
+    UPDATE components_component
+       SET sync_seq = nextval('components_component_sync_seq')
+     WHERE id = NEW.id AND sync_seq = 0;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE CONSTRAINT TRIGGER components_component_sync_seq
+AFTER INSERT OR UPDATE OF sync_seq ON components_component
+DEFERRABLE INITIALLY DEFERRED
+FOR EACH ROW WHEN (NEW.sync_seq = 0)
+EXECUTE FUNCTION components_component_assign_sync_seq();
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER components_component_sync_seq ON components_component;
+DROP FUNCTION components_component_assign_sync_seq();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('components', '0007_relatedcomponent'),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=CREATE_TRIGGER, reverse_sql=DROP_TRIGGER),
+    ]
@@ -1,5 +1,9 @@
+from django.conf import settings
 from django.db import models
 from django.core.validators import MinValueValidator
+from django.utils import timezone
+
+from .locations import build_location_path
 
 
 def upload_to_images(instance, filename):
@@ -10,13 +14,186 @@ def upload_to_datasheets(instance, filename):
     return f"components/datasheets/{filename}"
 
 
+class ComponentManager(models.Manager):
+    # Manager padrão: ignora os componentes excluídos (tombstones).
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Component(models.Model):
     name = models.CharField(max_length=255, null=False, blank=False)
     description = models.TextField(blank=True, null=True)
     quantity = models.PositiveIntegerField(validators=[MinValueValidator(0)])
     product_image = models.ImageField(upload_to=upload_to_images, blank=True, null=True)
     location_reference = models.CharField(max_length=255, blank=True, null=True)
+    location_path = models.TextField(
+        blank=True,
+        default="",
+        editable=False,
+        help_text="Localização normalizada (ex.: A/000003/000002/), derivada de location_reference.",
+    )
     datasheet = models.FileField(upload_to=upload_to_datasheets, blank=True, null=True)
+    sync_seq = models.BigIntegerField(
+        default=0,
+        db_index=True,
+        editable=False,
+        help_text="Número da última alteração, usado pela sincronização incremental.",
+    )
+    popularity = models.PositiveBigIntegerField(
+        default=0,
+        db_index=True,
+        editable=False,
+        help_text="Pontuação de popularidade, somada a cada busca e visualização do componente.",
+    )
+    deleted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Data da exclusão. Componentes excluídos são mantidos como tombstones.",
+    )
+
+    objects = ComponentManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            # Permite buscas por prefixo (LIKE 'A/000003/%') sem varrer a tabela.
+            models.Index(
+                fields=["location_path"],
+                name="component_location_path_idx",
+                opclasses=["text_pattern_ops"],
+            ),
+            # Filtros e facetas por faixa de quantidade / estoque crítico.
+            models.Index(
+                fields=["quantity"],
+                name="component_quantity_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+        ]
+
+    # Guarda a quantidade lida do banco para que os sinais possam identificar
+    # quando o estoque cruza o limite de alerta sem precisar de outra consulta.
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_quantity = instance.__dict__.get("quantity")
+        return instance
+
+    # O caminho de localização é recalculado a cada gravação.
+    # Toda gravação recebe um novo número da sequência de sincronização: save()
+    # grava sync_seq = 0 e um trigger adiado troca o 0 pelo próximo número no
+    # commit, sob um advisory lock mantido só até o fim do commit (ver a
+    # migração 0008). Assim um cliente nunca recebe um número maior enquanto um
+    # menor ainda não foi confirmado, e só os commits são serializados, não as
+    # transações inteiras. Enquanto a transação não termina o componente fica
+    # com sync_seq = 0 e não aparece em /components/changes/.
+    # A popularidade só é alterada por incremento no banco (ver popularity.py);
+    # a gravação de um componente existente não a sobrescreve com um valor antigo.
+
+    def save(self, *args, **kwargs):
+        self.location_path = build_location_path(self.location_reference)
+        if kwargs.get("update_fields") is None and not self._state.adding:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "popularity"
+            ]
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {
+                *kwargs["update_fields"],
+                "location_path",
+                "sync_seq",
+            }
+        self.sync_seq = 0
+        super().save(*args, **kwargs)
+
+    # Exclusão lógica: o registro continua no banco para que os clientes
+    # sincronizados recebam a remoção.
+
+    def soft_delete(self):
+        self.deleted_at = timezone.now()
+        self.save()
 
     def __str__(self):
         return self.name
+
+
+class StockMovement(models.Model):
+    # Livro de movimentações de estoque (somente inclusão).
+    # Cada alteração de quantidade de um componente gera uma linha com a
+    # variação, o motivo e o usuário responsável.
+
+    class Reason(models.TextChoices):
+        INITIAL = "initial", "Saldo inicial"
+        CREATE = "create", "Cadastro do componente"
+        ADJUSTMENT = "adjustment", "Ajuste de quantidade"
+
+    component = models.ForeignKey(
+        Component, on_delete=models.CASCADE, related_name="stock_movements"
+    )
+    delta = models.IntegerField(help_text="Variação da quantidade (negativa para saídas).")
+    reason = models.CharField(max_length=20, choices=Reason.choices)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=["component", "created_at"])]
+
+    def __str__(self):
+        return f"{self.component_id} {self.delta:+d} ({self.reason})"
+
+
+class RelatedComponent(models.Model):
+    # Componentes buscados junto com outro nas mesmas sessões de busca.
+    # Recalculado periodicamente a partir do SearchLog (ver related.py), com os
+    # RELATED_TOP_K vizinhos de maior pontuação de cada componente.
+
+    component = models.ForeignKey(
+        Component, on_delete=models.CASCADE, related_name="related_links"
+    )
+    related = models.ForeignKey(Component, on_delete=models.CASCADE, related_name="+")
+    score = models.PositiveIntegerField(
+        help_text="Quantidade de sessões em que os dois componentes foram buscados."
+    )
+    rank = models.PositiveSmallIntegerField(help_text="Posição entre os vizinhos (1 = mais frequente).")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["component", "rank"], name="components_relatedcomponent_rank_unique"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.component_id} -> {self.related_id} ({self.score})"
+
+
+class StockSnapshot(models.Model):
+    # Saldo consolidado de um componente em um instante.
+    # Gerado periodicamente pelo comando compact_stock_ledger, permite calcular
+    # a quantidade em qualquer data lendo um snapshot e as poucas movimentações
+    # posteriores a ele, em vez do histórico inteiro.
+
+    component = models.ForeignKey(
+        Component, on_delete=models.CASCADE, related_name="stock_snapshots"
+    )
+    as_of = models.DateTimeField(help_text="Inclui as movimentações até este instante.")
+    quantity = models.IntegerField()
+    consumed = models.PositiveBigIntegerField(
+        help_text="Total acumulado de saídas até as_of."
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["component", "as_of"], name="components_stocksnapshot_unique"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.component_id} @ {self.as_of}: {self.quantity}"
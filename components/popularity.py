@@ -0,0 +1,109 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .models import Component
+
+logger = logging.getLogger(__name__)
+
+# Popularidade dos componentes.
+# Cada evento soma um peso à popularidade do componente:
+# - busca: o primeiro resultado recebe POPULARITY_SEARCH_WEIGHT
+# - visualização do detalhe: POPULARITY_DETAIL_WEIGHT
+# Os pesos são acumulados em memória no processo e entregues em lote à fila de
+# tarefas (tarefa apply_popularity), de modo que as requisições não gravam nas
+# linhas dos componentes mais acessados nem esperam pelas travas de um PUT.
+# O worker soma os pesos com um único UPDATE, sem ler os componentes nem passar
+# pelo save(): não gera nova versão de sincronização nem invalida caches.
+
+
+class PopularityBuffer:
+    # O flush acontece quando o intervalo configurado expira, quando há
+    # "capacity" componentes distintos acumulados e na finalização do processo.
+
+    def __init__(self, capacity, flush_interval):
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self._weights = Counter()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def add(self, component_id, weight):
+        with self._lock:
+            self._weights[component_id] += weight
+            due = (
+                len(self._weights) >= self.capacity
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        from jobs.queue import enqueue
+
+        with self._lock:
+            weights, self._weights = self._weights, Counter()
+            self._last_flush = time.monotonic()
+        if not weights:
+            return
+        try:
+            enqueue(
+                "components.tasks.apply_popularity",
+                {"weights": {str(pk): weight for pk, weight in weights.items()}},
+            )
+        except Exception:
+            # Os pesos voltam para a memória e seguem no próximo flush.
+            logger.exception("Falha ao enfileirar a popularidade dos componentes")
+            with self._lock:
+                self._weights.update(weights)
+
+
+buffer = PopularityBuffer(
+    capacity=settings.POPULARITY_BUFFER_SIZE,
+    flush_interval=settings.POPULARITY_FLUSH_INTERVAL,
+)
+atexit.register(buffer.flush)
+
+
+def add_popularity(component_id, weight):
+    if component_id is None or not weight:
+        return
+    buffer.add(component_id, weight)
+
+
+def record_search_hit(component_id):
+    add_popularity(component_id, settings.POPULARITY_SEARCH_WEIGHT)
+
+
+def record_detail_view(component_id):
+    add_popularity(component_id, settings.POPULARITY_DETAIL_WEIGHT)
+
+
+# Soma os pesos ({id: peso}) de uma vez. As linhas são travadas antes em ordem
+# de id para que lotes concorrentes não entrem em deadlock. Retorna a
+# quantidade de componentes atualizados.
+
+
+def apply_popularity(weights):
+    rows = sorted((int(pk), weight) for pk, weight in weights.items() if weight)
+    if not rows:
+        return 0
+    table = Component._meta.db_table
+    values = ", ".join(["(%s, %s)"] * len(rows))
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT id FROM {table} WHERE id = ANY(%s) ORDER BY id FOR UPDATE",
+                [[pk for pk, _ in rows]],
+            )
+            cursor.execute(
+                f"UPDATE {table} SET popularity = {table}.popularity + v.weight "
+                f"FROM (VALUES {values}) AS v (id, weight) WHERE {table}.id = v.id",
+                [value for row in rows for value in row],
+            )
+            return cursor.rowcount
@@ -0,0 +1,100 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from logs.models import SearchLog
+from .models import Component, RelatedComponent
+
+# Componentes relacionados ("buscados junto").
+# As buscas de cada usuário são divididas em sessões: uma nova sessão começa
+# quando passam mais de RELATED_SESSION_GAP minutos desde a busca anterior.
+# Dois componentes que aparecem como primeiro resultado na mesma sessão formam
+# um par; a pontuação do par é o número de sessões em que isso aconteceu
+# (matriz de coocorrência esparsa, só com os pares que existem). Para cada
+# componente ficam os RELATED_TOP_K vizinhos de maior pontuação.
+#
+# Todo o cálculo é uma única instrução SQL (funções de janela para as sessões,
+# auto-junção para os pares e ROW_NUMBER para o top-k), executada pelo
+# PostgreSQL sobre os últimos RELATED_LOOKBACK_DAYS dias do log, sem trazer as
+# linhas para o Python. A tabela é substituída em uma transação: as leituras
+# continuam vendo o resultado anterior até o commit.
+
+SQL = """
+WITH hits AS (
+    SELECT
+        user_id,
+        component_id,
+        created_at,
+        CASE
+            WHEN created_at - LAG(created_at) OVER w > %(gap)s THEN 1
+            ELSE 0
+        END AS new_session
+    FROM {logs}
+    WHERE user_id IS NOT NULL
+        AND component_id IS NOT NULL
+        AND created_at >= %(since)s
+    WINDOW w AS (PARTITION BY user_id ORDER BY created_at)
+),
+sessions AS (
+    SELECT DISTINCT
+        user_id,
+        SUM(new_session) OVER (
+            PARTITION BY user_id ORDER BY created_at ROWS UNBOUNDED PRECEDING
+        ) AS session,
+        component_id
+    FROM hits
+),
+pairs AS (
+    SELECT a.component_id, b.component_id AS related_id, COUNT(*) AS score
+    FROM sessions a
+    JOIN sessions b
+        ON a.user_id = b.user_id
+        AND a.session = b.session
+        AND a.component_id <> b.component_id
+    GROUP BY a.component_id, b.component_id
+    HAVING COUNT(*) >= %(min_score)s
+),
+ranked AS (
+    SELECT
+        pairs.component_id,
+        pairs.related_id,
+        pairs.score,
+        ROW_NUMBER() OVER (
+            PARTITION BY pairs.component_id ORDER BY pairs.score DESC, pairs.related_id
+        ) AS rank
+    FROM pairs
+    JOIN {components} related
+        ON related.id = pairs.related_id AND related.deleted_at IS NULL
+)
+INSERT INTO {related} (component_id, related_id, score, rank)
+SELECT ranked.component_id, ranked.related_id, ranked.score, ranked.rank
+FROM ranked
+JOIN {components} component
+    ON component.id = ranked.component_id AND component.deleted_at IS NULL
+WHERE ranked.rank <= %(top_k)s
+"""
+
+
+# Recalcula a tabela de relacionados. Retorna a quantidade de pares gravados.
+
+
+def compute_related(now=None):
+    now = now or timezone.now()
+    params = {
+        "gap": timedelta(minutes=settings.RELATED_SESSION_GAP),
+        "since": now - timedelta(days=settings.RELATED_LOOKBACK_DAYS),
+        "min_score": settings.RELATED_MIN_SCORE,
+        "top_k": settings.RELATED_TOP_K,
+    }
+    sql = SQL.format(
+        logs=SearchLog._meta.db_table,
+        components=Component._meta.db_table,
+        related=RelatedComponent._meta.db_table,
+    )
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {RelatedComponent._meta.db_table}")
+            cursor.execute(sql, params)
+            return cursor.rowcount
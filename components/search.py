@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from .cache import get_cached_search, get_generation, set_cached_search
+from .models import Component
+from .serializers import ComponentSerializer
+
+# Busca de componentes por termo no nome ou na descrição.
+# Recebe o termo já normalizado (ver cache.normalize_search_term) e retorna os
+# componentes serializados, usando o cache de buscas quando possível.
+# Os resultados vêm ordenados por relevância (nome igual ao termo, nome que
+# começa com o termo, nome que contém o termo, apenas a descrição contém) e,
+# dentro de cada faixa, pela popularidade. Só os COMPONENT_SEARCH_LIMIT
+# primeiros são retornados; com o LIMIT o PostgreSQL mantém apenas esses itens
+# durante a ordenação (top-N) em vez de ordenar todo o resultado.
+# Retorna (componentes, total de componentes encontrados); o total só é contado
+# à parte quando o resultado atinge o limite. Os dois ficam juntos no cache.
+
+
+def relevance(term):
+    return Case(
+        When(name__iexact=term, then=Value(3)),
+        When(name__istartswith=term, then=Value(2)),
+        When(name__icontains=term, then=Value(1)),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def search_components(term):
+    generation = get_generation()
+    cached = get_cached_search(term, generation)
+    if cached is None:
+        matches = Component.objects.filter(
+            Q(name__icontains=term) | Q(description__icontains=term)
+        )
+        queryset = (
+            matches.annotate(relevance=relevance(term))
+            .order_by("-relevance", "-popularity", "id")
+        )[: settings.COMPONENT_SEARCH_LIMIT]
+        data = list(ComponentSerializer(queryset, many=True).data)
+        total = len(data)
+        if total >= settings.COMPONENT_SEARCH_LIMIT:
+            total = matches.count()
+        cached = {"results": data, "total": total}
+        set_cached_search(term, generation, cached)
+    return cached["results"], cached["total"]
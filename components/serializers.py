@@ -1,5 +1,7 @@
 from rest_framework import serializers
-from .models import Component
+from .locations import describe_location
+from .messages import ComponentMessages
+from .models import Component, RelatedComponent, StockMovement
 
 
 class ComponentSerializer(serializers.ModelSerializer):
@@ -14,3 +16,55 @@ class ComponentSerializer(serializers.ModelSerializer):
             "location_reference",
             "datasheet",
         ]
+
+
+class ComponentFilterSerializer(serializers.Serializer):
+    name = serializers.CharField(required=False, allow_blank=True)
+    location = serializers.CharField(required=False, allow_blank=True)
+    min_quantity = serializers.IntegerField(required=False, min_value=0)
+    max_quantity = serializers.IntegerField(required=False, min_value=0)
+    low_stock = serializers.BooleanField(required=False, allow_null=True)
+    has_image = serializers.BooleanField(required=False, allow_null=True)
+    has_datasheet = serializers.BooleanField(required=False, allow_null=True)
+
+    def validate(self, data):
+        minimum = data.get("min_quantity")
+        maximum = data.get("max_quantity")
+        if minimum is not None and maximum is not None and minimum > maximum:
+            raise serializers.ValidationError(
+                {"max_quantity": ComponentMessages.INVALID_QUANTITY_RANGE}
+            )
+        return data
+
+
+class StockMovementSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StockMovement
+        fields = ["id", "delta", "reason", "user", "created_at"]
+
+
+class ComponentLocationSerializer(ComponentSerializer):
+    location = serializers.SerializerMethodField()
+
+    class Meta(ComponentSerializer.Meta):
+        fields = ComponentSerializer.Meta.fields + ["location"]
+
+    def get_location(self, obj):
+        return describe_location(obj.location_reference)
+
+
+class RelatedComponentSerializer(serializers.ModelSerializer):
+    component = ComponentSerializer(source="related")
+
+    class Meta:
+        model = RelatedComponent
+        fields = ["rank", "score", "component"]
+
+
+class PickingListItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    quantity = serializers.IntegerField(min_value=1, default=1)
+
+
+class PickingListRequestSerializer(serializers.Serializer):
+    items = PickingListItemSerializer(many=True, allow_empty=False)
@@ -0,0 +1,30 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_generation
+from .detail_cache import bump_version
+from .models import Component
+from .snapshot import schedule_snapshot
+
+# Invalida o cache de buscas e o cache do componente alterado sempre que o
+# catálogo muda. Os incrementos só acontecem após o commit da transação,
+# evitando que uma requisição concorrente grave no cache dados antigos com a
+# versão nova. O pk é guardado antes: após a exclusão o objeto fica sem pk.
+
+
+@receiver(post_save, sender=Component)
+@receiver(post_delete, sender=Component)
+def invalidate_component_caches(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(bump_generation)
+    transaction.on_commit(lambda: bump_version(pk))
+
+
+# Agenda a geração de um novo snapshot do catálogo (ver snapshot.py).
+
+
+@receiver(post_save, sender=Component)
+@receiver(post_delete, sender=Component)
+def schedule_catalog_snapshot(sender, instance, **kwargs):
+    transaction.on_commit(schedule_snapshot)
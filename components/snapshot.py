@@ -0,0 +1,118 @@
+import gzip
+import os
+import re
+import tempfile
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from core.compression import compress
+from core.renderers import FastJSONRenderer
+from .models import Component
+from .serializers import ComponentSerializer
+
+# Snapshot completo do catálogo para a carga inicial dos clientes.
+# Em vez de paginar a listagem de componentes, clientes novos (quiosques,
+# aplicativo) baixam um único arquivo JSON comprimido com gzip contendo todos os
+# componentes (com as URLs das imagens e datasheets). A versão do snapshot é o
+# maior sync_seq do catálogo, o mesmo token da sincronização incremental: depois
+# de carregar o arquivo o cliente continua com /components/changes/?since=<versão>.
+#
+# Cada versão é gravada uma única vez em CATALOG_SNAPSHOT_DIR e nunca muda, então
+# pode ser servida como arquivo imutável. As alterações no catálogo agendam na
+# fila de tarefas (jobs) uma nova geração após CATALOG_SNAPSHOT_DEBOUNCE
+# segundos; as alterações feitas nesse intervalo entram na mesma geração.
+
+FILENAME = re.compile(r"^catalog-(\d+)\.json\.gz$")
+SNAPSHOT_TASK = "components.tasks.build_catalog_snapshot"
+
+
+def snapshot_path(version):
+    return os.path.join(settings.CATALOG_SNAPSHOT_DIR, f"catalog-{version}.json.gz")
+
+
+def stored_versions():
+    try:
+        names = os.listdir(settings.CATALOG_SNAPSHOT_DIR)
+    except FileNotFoundError:
+        return []
+    matches = (FILENAME.match(name) for name in names)
+    return sorted((int(match.group(1)) for match in matches if match), reverse=True)
+
+
+def current_version():
+    versions = stored_versions()
+    return versions[0] if versions else None
+
+
+# Lê a versão e os componentes na mesma foto do banco (REPEATABLE READ), para que
+# o arquivo contenha exatamente as alterações até a versão informada.
+
+
+def _read_catalog():
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+        version = Component.all_objects.aggregate(version=Max("sync_seq"))["version"] or 0
+        if os.path.exists(snapshot_path(version)):
+            return version, None
+        components = Component.objects.order_by("id")
+        return version, {
+            "version": str(version),
+            "generated_at": timezone.now(),
+            "components": ComponentSerializer(components.iterator(), many=True).data,
+        }
+
+
+# Gera o snapshot da versão atual, se ainda não existir.
+# Retorna (versão, criado). O arquivo é escrito em um temporário e renomeado, de
+# modo que nunca é servido pela metade.
+
+
+def build_snapshot():
+    version, data = _read_catalog()
+    if data is None:
+        return version, False
+
+    body = compress(FastJSONRenderer().render(data), "gzip", level=9)
+    os.makedirs(settings.CATALOG_SNAPSHOT_DIR, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=settings.CATALOG_SNAPSHOT_DIR, suffix=".tmp")
+    with os.fdopen(fd, "wb") as handle:
+        handle.write(body)
+    os.chmod(temp_path, 0o644)
+    os.replace(temp_path, snapshot_path(version))
+    prune_snapshots()
+    return version, True
+
+
+# Mantém apenas as CATALOG_SNAPSHOT_KEEP versões mais recentes, para que
+# clientes que acabaram de receber a versão anterior ainda consigam baixá-la.
+
+
+def prune_snapshots():
+    for version in stored_versions()[settings.CATALOG_SNAPSHOT_KEEP :]:
+        try:
+            os.remove(snapshot_path(version))
+        except FileNotFoundError:
+            pass
+
+
+def read_decompressed(version):
+    with gzip.open(snapshot_path(version), "rb") as handle:
+        return handle.read()
+
+
+# Agenda a geração do snapshot na fila de tarefas (chamado após o commit de
+# cada alteração), para daqui a CATALOG_SNAPSHOT_DEBOUNCE segundos. Se já houver
+# uma geração na fila, não faz nada: ela lerá o catálogo no momento em que rodar
+# e incluirá esta alteração.
+
+
+def schedule_snapshot():
+    from jobs.queue import enqueue, is_pending
+
+    if settings.CATALOG_SNAPSHOT_DEBOUNCE <= 0 or is_pending(SNAPSHOT_TASK):
+        return
+    enqueue(SNAPSHOT_TASK, delay=settings.CATALOG_SNAPSHOT_DEBOUNCE)
@@ -0,0 +1,94 @@
+from django.db.models import F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from .models import StockMovement, StockSnapshot
+
+# Livro de movimentações de estoque e snapshots periódicos.
+# As movimentações nunca são alteradas. O comando compact_stock_ledger consolida
+# periodicamente o saldo de cada componente em um StockSnapshot; as consultas
+# "quantidade em uma data" e "consumo em um período" partem do snapshot mais
+# recente e somam apenas as movimentações posteriores a ele.
+
+
+# Registra em lote as variações de quantidade.
+# "changes" é uma lista de tuplas (componente, variação); variações nulas são ignoradas.
+
+
+def record_stock_changes(changes, reason, user=None):
+    movements = [
+        StockMovement(component=component, delta=delta, reason=reason, user=user)
+        for component, delta in changes
+        if delta
+    ]
+    return StockMovement.objects.bulk_create(movements)
+
+
+def _snapshot_before(component_id, when):
+    return (
+        StockSnapshot.objects.filter(component_id=component_id, as_of__lte=when)
+        .order_by("-as_of")
+        .first()
+    )
+
+
+# Retorna (quantidade, total consumido) de um componente no instante informado.
+
+
+def stock_as_of(component_id, when):
+    snapshot = _snapshot_before(component_id, when)
+    movements = StockMovement.objects.filter(
+        component_id=component_id, created_at__lte=when
+    )
+    if snapshot:
+        movements = movements.filter(created_at__gt=snapshot.as_of)
+    tail = movements.aggregate(
+        total_delta=Coalesce(Sum("delta"), 0),
+        total_outflow=Coalesce(Sum("delta", filter=Q(delta__lt=0)), 0),
+    )
+    quantity = (snapshot.quantity if snapshot else 0) + tail["total_delta"]
+    consumed = (snapshot.consumed if snapshot else 0) - tail["total_outflow"]
+    return quantity, consumed
+
+
+def consumption_between(component_id, start, end):
+    return stock_as_of(component_id, end)[1] - stock_as_of(component_id, start)[1]
+
+
+# Gera um snapshot em "cutoff" para cada componente com movimentações desde o
+# seu snapshot anterior. Retorna a quantidade de snapshots criados.
+
+
+def compact_ledger(cutoff):
+    previous = {
+        snapshot.component_id: snapshot
+        for snapshot in StockSnapshot.objects.filter(as_of__lte=cutoff)
+        .order_by("component_id", "-as_of")
+        .distinct("component_id")
+    }
+    last_as_of = StockSnapshot.objects.filter(
+        component_id=OuterRef("component_id"), as_of__lte=cutoff
+    ).order_by("-as_of")
+    pending = (
+        StockMovement.objects.filter(created_at__lte=cutoff)
+        .annotate(last_as_of=Subquery(last_as_of.values("as_of")[:1]))
+        .filter(Q(last_as_of__isnull=True) | Q(created_at__gt=F("last_as_of")))
+        .values("component_id")
+        .annotate(
+            total_delta=Sum("delta"),
+            total_outflow=Coalesce(Sum("delta", filter=Q(delta__lt=0)), 0),
+        )
+    )
+
+    snapshots = []
+    for row in pending:
+        base = previous.get(row["component_id"])
+        snapshots.append(
+            StockSnapshot(
+                component_id=row["component_id"],
+                as_of=cutoff,
+                quantity=(base.quantity if base else 0) + row["total_delta"],
+                consumed=(base.consumed if base else 0) - row["total_outflow"],
+            )
+        )
+    StockSnapshot.objects.bulk_create(snapshots, ignore_conflicts=True)
+    return len(snapshots)
@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from jobs.registry import task
+from .popularity import apply_popularity as apply_popularity_weights
+from .related import compute_related
+from .snapshot import build_snapshot
+from .stock import compact_ledger
+
+# Tarefas em segundo plano do catálogo (ver jobs/queue.py).
+
+
+# Consolida o livro de estoque até o início do dia atual (mesmo corte padrão
+# do comando compact_stock_ledger).
+
+
+@task
+def compact_stock_ledger():
+    cutoff = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    if cutoff > timezone.now() - timedelta(minutes=5):
+        return 0
+    return compact_ledger(cutoff)
+
+
+@task
+def build_catalog_snapshot():
+    return build_snapshot()[0]
+
+
+@task
+def compute_related_components():
+    return compute_related()
+
+
+# Soma na popularidade os pesos acumulados pelas requisições (ver popularity.py).
+
+
+@task
+def apply_popularity(weights):
+    return apply_popularity_weights(weights)
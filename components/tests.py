@@ -1,3 +1,118 @@
-from django.test import TestCase
+import threading
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+
+from .detail_cache import MISSING, OBJECT_KEY, get_component_data, get_version
+from .models import Component
+
+
+class DetailCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.component = Component.objects.create(name="Resistor", quantity=10)
+
+    def test_second_read_comes_from_cache(self):
+        first = get_component_data(self.component.pk)
+
+        with self.assertNumQueries(0):
+            second = get_component_data(self.component.pk)
+
+        self.assertEqual(first["name"], "Resistor")
+        self.assertEqual(second, first)
+
+    def test_write_bumps_version(self):
+        get_component_data(self.component.pk)
+        version = get_version(self.component.pk)
+
+        self.component.name = "Capacitor"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.component.save()
+
+        self.assertNotEqual(get_version(self.component.pk), version)
+        self.assertEqual(get_component_data(self.component.pk)["name"], "Capacitor")
+
+    def test_soft_delete_bumps_version(self):
+        get_component_data(self.component.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.component.soft_delete()
+
+        self.assertIsNone(get_component_data(self.component.pk))
+
+    def test_missing_component_is_cached(self):
+        pk = self.component.pk + 1000
+
+        self.assertIsNone(get_component_data(pk))
+        key = OBJECT_KEY.format(pk=pk, version=get_version(pk))
+        self.assertEqual(cache.get(key), MISSING)
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_component_data(pk))
+
+    def test_created_component_replaces_cached_missing(self):
+        pk = self.component.pk + 1
+        self.assertIsNone(get_component_data(pk))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            created = Component.objects.create(pk=pk, name="Diodo", quantity=1)
+
+        self.assertEqual(get_component_data(created.pk)["name"], "Diodo")
+
+
+class SyncSequenceTests(TransactionTestCase):
+    def test_number_is_assigned_on_commit(self):
+        with transaction.atomic():
+            component = Component.objects.create(name="Resistor", quantity=1)
+            self.assertEqual(Component.all_objects.get(pk=component.pk).sync_seq, 0)
+
+        self.assertGreater(Component.all_objects.get(pk=component.pk).sync_seq, 0)
+
+    def test_every_write_gets_a_new_number(self):
+        component = Component.objects.create(name="Resistor", quantity=1)
+        first = Component.all_objects.get(pk=component.pk).sync_seq
+
+        component.quantity = 2
+        component.save()
+
+        self.assertGreater(Component.all_objects.get(pk=component.pk).sync_seq, first)
+
+    def test_open_transaction_does_not_block_other_writes(self):
+        slow = Component.objects.create(name="Lento", quantity=1)
+        fast = Component.objects.create(name="Rápido", quantity=1)
+        saved = threading.Event()
+        release = threading.Event()
+
+        def write_slowly():
+            try:
+                with transaction.atomic():
+                    slow.quantity = 5
+                    slow.save()
+                    saved.set()
+                    release.wait(5)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=write_slowly)
+        thread.start()
+        self.assertTrue(saved.wait(5))
+
+        fast.quantity = 7
+        fast.save()
+        release.set()
+        thread.join()
+
+        slow_seq = Component.all_objects.get(pk=slow.pk).sync_seq
+        fast_seq = Component.all_objects.get(pk=fast.pk).sync_seq
+        # A gravação confirmada depois recebe o número maior.
+        self.assertGreater(slow_seq, fast_seq)
+
+    def test_popularity_update_keeps_number(self):
+        component = Component.objects.create(name="Resistor", quantity=1)
+        before = Component.all_objects.get(pk=component.pk).sync_seq
+
+        Component.objects.filter(pk=component.pk).update(popularity=10)
+
+        self.assertEqual(Component.all_objects.get(pk=component.pk).sync_seq, before)
@@ -2,11 +2,47 @@ from django.urls import path
 from .views import (
     ComponentListCreateAPIView,
     ComponentDetailAPIView,
+    ComponentChangesAPIView,
+    ComponentLocationAPIView,
+    ComponentPickingListAPIView,
+    ComponentStockAPIView,
+    ComponentConsumptionAPIView,
+    ComponentMovementsAPIView,
     ComponentSearchAPIView,
+    ComponentRelatedAPIView,
+    ComponentSnapshotAPIView,
+    ComponentSnapshotFileAPIView,
 )
 
 urlpatterns = [
     path("", ComponentListCreateAPIView.as_view(), name="component-list-create"),
     path("<int:pk>/", ComponentDetailAPIView.as_view(), name="component-detail"),
+    path("<int:pk>/stock/", ComponentStockAPIView.as_view(), name="component-stock"),
+    path(
+        "<int:pk>/stock/consumption/",
+        ComponentConsumptionAPIView.as_view(),
+        name="component-stock-consumption",
+    ),
+    path(
+        "<int:pk>/stock/movements/",
+        ComponentMovementsAPIView.as_view(),
+        name="component-stock-movements",
+    ),
+    path(
+        "<int:pk>/related/", ComponentRelatedAPIView.as_view(), name="component-related"
+    ),
     path("search/", ComponentSearchAPIView.as_view(), name="component-search"),
+    path("changes/", ComponentChangesAPIView.as_view(), name="component-changes"),
+    path("locations/", ComponentLocationAPIView.as_view(), name="component-locations"),
+    path(
+        "picking-list/",
+        ComponentPickingListAPIView.as_view(),
+        name="component-picking-list",
+    ),
+    path("snapshot/", ComponentSnapshotAPIView.as_view(), name="component-snapshot"),
+    path(
+        "snapshot/<int:version>/",
+        ComponentSnapshotFileAPIView.as_view(),
+        name="component-snapshot-file",
+    ),
 ]
@@ -1,14 +1,41 @@
+import os
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
-from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from core.swagger import openapi, swagger_auto_schema
+from django.conf import settings
+from django.db import transaction
+from django.http import FileResponse, HttpResponse
+from django.urls import reverse
+from django.utils import timezone
 
-from .models import Component
-from .serializers import ComponentSerializer
+from .models import Component, RelatedComponent, StockMovement
+from .filters import apply_filters, build_conditions, facet_counts
+from .locations import build_location_path
+from .serializers import (
+    ComponentFilterSerializer,
+    ComponentLocationSerializer,
+    ComponentSerializer,
+    PickingListRequestSerializer,
+    RelatedComponentSerializer,
+    StockMovementSerializer,
+)
+from .stock import consumption_between, record_stock_changes, stock_as_of
 from .messages import ComponentMessages
+from .cache import normalize_search_term
+from .detail_cache import get_component_data
+from .popularity import record_detail_view, record_search_hit
+from .search import search_components
+from .snapshot import current_version, read_decompressed, snapshot_path
 from logs.models import SearchLog
+from logs.terms import get_search_term
+from core.compression import negotiate_encoding
+from core.pagination import DefaultPagination
+from core.throttling import SearchRateThrottle
+from core.utils import parse_datetime_param
+from idempotency.decorators import idempotent
 from logsystem.utils import log_internal_error
 
 
@@ -16,19 +43,74 @@ class ComponentListCreateAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     @swagger_auto_schema(
-        operation_description="Lista todos os componentes.",
-        responses={200: ComponentSerializer(many=True)},
+        operation_description="Lista os componentes com filtros e contagens por faceta.",
+        manual_parameters=[
+            openapi.Parameter(
+                "page", in_=openapi.IN_QUERY, type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                "page_size", in_=openapi.IN_QUERY, type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                "name",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="Filtra por parte do nome",
+            ),
+            openapi.Parameter(
+                "location",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="Prefixo da localização, ex.: A/3",
+            ),
+            openapi.Parameter(
+                "min_quantity", in_=openapi.IN_QUERY, type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                "max_quantity", in_=openapi.IN_QUERY, type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                "low_stock", in_=openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN
+            ),
+            openapi.Parameter(
+                "has_image", in_=openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN
+            ),
+            openapi.Parameter(
+                "has_datasheet", in_=openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN
+            ),
+        ],
+        responses={200: ComponentSerializer(many=True), 400: "Filtros inválidos"},
     )
 
-    # Recupera todos os registros de componentes no banco de dados,
-    # serializa os resultados e retorna em formato JSON.
+    # Recupera os componentes uma página por vez, aplicando os filtros informados
+    # (nome, prefixo de localização, faixa de quantidade, estoque crítico, imagem
+    # e datasheet). Junto da página retorna "facets": para cada faceta, quantos
+    # componentes cada opção traria mantendo os demais filtros.
+    # O cabeçalho X-Catalog-Snapshot-Version informa a versão atual do snapshot
+    # completo do catálogo (ver ComponentSnapshotAPIView).
+    # Em caso de filtros inválidos, retorna status 400.
+    # Página inexistente ou inválida retorna status 404.
     # Em caso de erro interno, registra no sistema de logs
 
     def get(self, request):
         try:
-            components = Component.objects.all()
-            serializer = ComponentSerializer(components, many=True)
-            return Response(serializer.data)
+            filters = ComponentFilterSerializer(data=request.query_params.dict())
+            if not filters.is_valid():
+                return Response(filters.errors, status=status.HTTP_400_BAD_REQUEST)
+            conditions = build_conditions(filters.validated_data)
+
+            components = apply_filters(Component.objects.order_by("id"), conditions)
+            paginator = DefaultPagination()
+            page = paginator.paginate_queryset(components, request, view=self)
+            serializer = ComponentSerializer(page, many=True)
+            response = paginator.get_paginated_response(serializer.data)
+            response.data["facets"] = facet_counts(Component.objects.all(), conditions)
+            snapshot_version = current_version()
+            if snapshot_version is not None:
+                response["X-Catalog-Snapshot-Version"] = str(snapshot_version)
+            return response
+        except NotFound:
+            raise
         except Exception as e:
             log_internal_error(request, e)
             return Response(
@@ -39,19 +121,37 @@ class ComponentListCreateAPIView(APIView):
     @swagger_auto_schema(
         operation_description="Cria um novo componente.",
         request_body=ComponentSerializer,
+        manual_parameters=[
+            openapi.Parameter(
+                "Idempotency-Key",
+                in_=openapi.IN_HEADER,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="Chave única da operação; repetições recebem a mesma resposta.",
+            ),
+        ],
         responses={201: ComponentSerializer},
     )
 
     # Valida os dados recebidos no corpo da requisição e cria um novo componente.
+    # A quantidade inicial é registrada no livro de movimentações de estoque.
     # Em caso de sucesso, retorna os dados criados com status 201.
     # Em caso de erro de validação, retorna status 400.
+    # Com o cabeçalho Idempotency-Key, repetições recebem a resposta original.
     # Em caso de erro interno, registra no sistema de logs.
 
+    @idempotent
     def post(self, request):
         try:
             serializer = ComponentSerializer(data=request.data)
             if serializer.is_valid():
-                serializer.save()
+                with transaction.atomic():
+                    component = serializer.save()
+                    record_stock_changes(
+                        [(component, component.quantity)],
+                        StockMovement.Reason.CREATE,
+                        request.user,
+                    )
                 return Response(
                     {"message": ComponentMessages.CREATED, "data": serializer.data},
                     status=status.HTTP_201_CREATED,
@@ -68,12 +168,17 @@ class ComponentListCreateAPIView(APIView):
 class ComponentDetailAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
-    # Recupera um componente pelo ID (pk).
+    # Recupera um componente pelo ID (pk), direto do banco.
+    # Usado nas alterações (PUT/DELETE), que não devem partir de dados em cache.
+    # Com for_update, bloqueia a linha até o fim da transação.
     # Retorna o objeto se encontrado, ou None se não existir.
 
-    def get_object(self, pk):
+    def get_object(self, pk, for_update=False):
+        queryset = Component.objects.all()
+        if for_update:
+            queryset = queryset.select_for_update()
         try:
-            return Component.objects.get(pk=pk)
+            return queryset.get(pk=pk)
         except Component.DoesNotExist:
             return None
 
@@ -83,20 +188,24 @@ class ComponentDetailAPIView(APIView):
     )
 
     # Busca um componente específico pelo ID fornecido.
-    # Retorna os dados serializados caso o componente exista.
+    # Os dados serializados vêm do cache de componentes (ver detail_cache.py),
+    # que consulta o banco uma única vez por versão do componente.
+    # Retorna os dados caso o componente exista e soma a visualização à
+    # popularidade do componente (acumulada em memória e gravada em lote pelos
+    # workers, ver popularity.py).
     # Se não for encontrado, retorna status 404.
     # Em caso de erro interno, registra no sistema de logs.
 
     def get(self, request, pk):
         try:
-            component = self.get_object(pk)
-            if not component:
+            data = get_component_data(pk)
+            if data is None:
                 return Response(
                     {"detail": ComponentMessages.NOT_FOUND},
                     status=status.HTTP_404_NOT_FOUND,
                 )
-            serializer = ComponentSerializer(component)
-            return Response(serializer.data)
+            record_detail_view(pk)
+            return Response(data)
         except Exception as e:
             log_internal_error(request, e)
             return Response(
@@ -111,6 +220,8 @@ class ComponentDetailAPIView(APIView):
     )
 
     # Atualiza os dados de um componente existente com base no ID informado.
+    # A linha fica bloqueada durante a atualização para que a variação de
+    # quantidade registrada no livro de estoque seja sempre consistente.
     # Retorna os dados atualizados se a operação for bem-sucedida.
     # Se o componente não existir, retorna status 404.
     # Em caso de erro de validação, retorna status 400.
@@ -118,18 +229,25 @@ class ComponentDetailAPIView(APIView):
 
     def put(self, request, pk):
         try:
-            component = self.get_object(pk)
-            if not component:
-                return Response(
-                    {"detail": ComponentMessages.NOT_FOUND},
-                    status=status.HTTP_404_NOT_FOUND,
-                )
-            serializer = ComponentSerializer(component, data=request.data)
-            if serializer.is_valid():
-                serializer.save()
-                return Response(
-                    {"message": ComponentMessages.UPDATED, "data": serializer.data}
-                )
+            with transaction.atomic():
+                component = self.get_object(pk, for_update=True)
+                if not component:
+                    return Response(
+                        {"detail": ComponentMessages.NOT_FOUND},
+                        status=status.HTTP_404_NOT_FOUND,
+                    )
+                previous_quantity = component.quantity
+                serializer = ComponentSerializer(component, data=request.data)
+                if serializer.is_valid():
+                    serializer.save()
+                    record_stock_changes(
+                        [(component, component.quantity - previous_quantity)],
+                        StockMovement.Reason.ADJUSTMENT,
+                        request.user,
+                    )
+                    return Response(
+                        {"message": ComponentMessages.UPDATED, "data": serializer.data}
+                    )
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             log_internal_error(request, e)
@@ -146,7 +264,9 @@ class ComponentDetailAPIView(APIView):
         },
     )
 
-    # Remove permanentemente um componente com base no ID fornecido.
+    # Exclui um componente com base no ID fornecido.
+    # A exclusão é lógica: o registro fica como tombstone para que os clientes
+    # sincronizados recebam a remoção em /components/changes/.
     # Retorna status 200 em caso de exclusão bem-sucedida.
     # Se o componente não existir, retorna status 404.
     # Em caso de erro interno, registra no sistema de logs.
@@ -160,7 +280,7 @@ class ComponentDetailAPIView(APIView):
                     status=status.HTTP_404_NOT_FOUND,
                 )
 
-            component.delete()
+            component.soft_delete()
             return Response(
                 {"message": ComponentMessages.DELETED}, status=status.HTTP_200_OK
             )
@@ -172,8 +292,346 @@ class ComponentDetailAPIView(APIView):
             )
 
 
+# Recupera um componente pelo ID, incluindo os excluídos, para consultas de histórico.
+
+
+def get_component_for_history(pk):
+    return Component.all_objects.filter(pk=pk).first()
+
+
+class ComponentStockAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Quantidade em estoque de um componente em uma data.",
+        manual_parameters=[
+            openapi.Parameter(
+                "as_of",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="Data ou data/hora ISO 8601 (padrão: agora)",
+            ),
+        ],
+        responses={200: "Quantidade na data", 404: "Componente não encontrado"},
+    )
+
+    # Reconstrói a quantidade do componente na data "as_of" a partir do livro de
+    # movimentações: último snapshot anterior à data mais as movimentações seguintes.
+    # Se o componente não existir, retorna status 404.
+    # Em caso de data inválida, retorna status 400.
+    # Em caso de erro interno, registra no sistema de logs.
+
+    def get(self, request, pk):
+        try:
+            component = get_component_for_history(pk)
+            if not component:
+                return Response(
+                    {"detail": ComponentMessages.NOT_FOUND},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            as_of = timezone.now()
+            if request.query_params.get("as_of"):
+                as_of = parse_datetime_param(request.query_params["as_of"])
+                if as_of is None:
+                    return Response(
+                        {"detail": ComponentMessages.INVALID_DATE},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+
+            quantity, consumed = stock_as_of(component.pk, as_of)
+            return Response(
+                {
+                    "id": component.pk,
+                    "as_of": as_of,
+                    "quantity": quantity,
+                    "consumed": consumed,
+                }
+            )
+        except Exception as e:
+            log_internal_error(request, e)
+            return Response(
+                {"detail": ComponentMessages.ERROR},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class ComponentConsumptionAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Consumo (total de saídas) de um componente em um período.",
+        manual_parameters=[
+            openapi.Parameter(
+                "since",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="Início do período (data ou data/hora ISO 8601)",
+                required=True,
+            ),
+            openapi.Parameter(
+                "until",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="Fim do período (padrão: agora)",
+            ),
+        ],
+        responses={200: "Consumo no período", 404: "Componente não encontrado"},
+    )
+
+    # Calcula o total de saídas do componente entre "since" e "until" como a
+    # diferença entre o consumo acumulado nas duas datas.
+    # Se o componente não existir, retorna status 404.
+    # Em caso de datas inválidas, retorna status 400.
+    # Em caso de erro interno, registra no sistema de logs.
+
+    def get(self, request, pk):
+        try:
+            component = get_component_for_history(pk)
+            if not component:
+                return Response(
+                    {"detail": ComponentMessages.NOT_FOUND},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            since = parse_datetime_param(request.query_params.get("since", ""))
+            until = timezone.now()
+            if request.query_params.get("until"):
+                until = parse_datetime_param(request.query_params["until"])
+            if since is None or until is None or since >= until:
+                return Response(
+                    {"detail": ComponentMessages.INVALID_PERIOD},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            return Response(
+                {
+                    "id": component.pk,
+                    "since": since,
+                    "until": until,
+                    "consumed": consumption_between(component.pk, since, until),
+                }
+            )
+        except Exception as e:
+            log_internal_error(request, e)
+            return Response(
+                {"detail": ComponentMessages.ERROR},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class ComponentMovementsAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Histórico paginado de movimentações de estoque.",
+        responses={200: StockMovementSerializer(many=True)},
+    )
+
+    # Lista as movimentações de estoque do componente, da mais recente para a mais antiga.
+    # Se o componente ou a página não existirem, retorna status 404.
+    # Em caso de erro interno, registra no sistema de logs.
+
+    def get(self, request, pk):
+        try:
+            component = get_component_for_history(pk)
+            if not component:
+                return Response(
+                    {"detail": ComponentMessages.NOT_FOUND},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            movements = component.stock_movements.order_by("-created_at", "-id")
+            paginator = DefaultPagination()
+            page = paginator.paginate_queryset(movements, request, view=self)
+            serializer = StockMovementSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+        except NotFound:
+            raise
+        except Exception as e:
+            log_internal_error(request, e)
+            return Response(
+                {"detail": ComponentMessages.ERROR},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class ComponentLocationAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Lista os componentes armazenados sob um prefixo de localização.",
+        manual_parameters=[
+            openapi.Parameter(
+                "prefix",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="Prefixo da localização, ex.: A ou A/3 ou A-3-2",
+                required=True,
+            ),
+        ],
+        responses={200: ComponentLocationSerializer(many=True), 400: "Prefixo ausente"},
+    )
+
+    # Lista, de forma paginada e em ordem de localização, os componentes cujo
+    # caminho começa com o prefixo informado (depósito, corredor, prateleira...).
+    # A busca por prefixo usa o índice de location_path.
+    # Se o prefixo não for informado, retorna status 400.
+    # Página inexistente ou inválida retorna status 404.
+    # Em caso de erro interno, registra no sistema de logs.
+
+    def get(self, request):
+        try:
+            prefix = build_location_path(request.query_params.get("prefix"))
+            if not prefix:
+                return Response(
+                    {"detail": ComponentMessages.LOCATION_PREFIX_REQUIRED},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            components = Component.objects.filter(
+                location_path__startswith=prefix
+            ).order_by("location_path", "id")
+            paginator = DefaultPagination()
+            page = paginator.paginate_queryset(components, request, view=self)
+            serializer = ComponentLocationSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+        except NotFound:
+            raise
+        except Exception as e:
+            log_internal_error(request, e)
+            return Response(
+                {"detail": ComponentMessages.ERROR},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class ComponentPickingListAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Gera a lista de separação ordenada por localização.",
+        request_body=PickingListRequestSerializer,
+        responses={200: "Itens ordenados por localização", 400: "Requisição inválida"},
+    )
+
+    # Recebe os componentes (id e quantidade) a separar e devolve os itens na
+    # ordem do percurso pelo estoque (depósito, corredor, prateleira, caixa).
+    # Itens sem localização vão para o fim; IDs inexistentes são listados em "not_found".
+    # Cada item indica se há quantidade suficiente em estoque.
+    # Em caso de erro de validação, retorna status 400.
+    # Em caso de erro interno, registra no sistema de logs.
+
+    def post(self, request):
+        try:
+            serializer = PickingListRequestSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            items = serializer.validated_data["items"]
+            if len(items) > settings.PICKING_LIST_MAX_ITEMS:
+                return Response(
+                    {
+                        "detail": ComponentMessages.PICKING_LIST_TOO_LARGE.format(
+                            max_items=settings.PICKING_LIST_MAX_ITEMS
+                        )
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            requested = {}
+            for item in items:
+                requested[item["id"]] = requested.get(item["id"], 0) + item["quantity"]
+            components = sorted(
+                Component.objects.filter(pk__in=requested),
+                key=lambda c: (not c.location_path, c.location_path, c.name, c.pk),
+            )
+
+            picking_list = []
+            for component in components:
+                data = ComponentLocationSerializer(component).data
+                data["requested_quantity"] = requested[component.pk]
+                data["sufficient_stock"] = component.quantity >= requested[component.pk]
+                picking_list.append(data)
+            found = {component.pk for component in components}
+            return Response(
+                {
+                    "items": picking_list,
+                    "not_found": [pk for pk in requested if pk not in found],
+                }
+            )
+        except Exception as e:
+            log_internal_error(request, e)
+            return Response(
+                {"detail": ComponentMessages.ERROR},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class ComponentChangesAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Retorna os componentes criados, alterados ou excluídos desde o token "
+            "informado, junto com o novo token a ser usado na próxima chamada."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                "since",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="Token da última sincronização (omitir para carga completa)",
+            ),
+        ],
+        responses={200: "Alterações desde o token", 400: "Token inválido"},
+    )
+
+    # Sincronização incremental do catálogo.
+    # Retorna em "upserts" os componentes criados ou alterados e em "deletions" os
+    # IDs excluídos desde o token "since", em ordem de alteração e limitados a
+    # COMPONENT_CHANGES_PAGE_SIZE itens. Enquanto "has_more" for verdadeiro, o
+    # cliente deve chamar novamente com o "token" retornado.
+    # Em caso de token inválido, retorna status 400.
+    # Em caso de erro interno, registra no sistema de logs.
+
+    def get(self, request):
+        try:
+            try:
+                since = int(request.query_params.get("since", 0))
+            except ValueError:
+                since = -1
+            if since < 0:
+                return Response(
+                    {"detail": ComponentMessages.INVALID_SYNC_TOKEN},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            limit = settings.COMPONENT_CHANGES_PAGE_SIZE
+            changes = list(
+                Component.all_objects.filter(sync_seq__gt=since).order_by("sync_seq")[
+                    : limit + 1
+                ]
+            )
+            has_more = len(changes) > limit
+            changes = changes[:limit]
+
+            upserts = [c for c in changes if c.deleted_at is None]
+            deletions = [c.pk for c in changes if c.deleted_at is not None]
+            return Response(
+                {
+                    "token": str(changes[-1].sync_seq if changes else since),
+                    "has_more": has_more,
+                    "upserts": ComponentSerializer(upserts, many=True).data,
+                    "deletions": deletions,
+                }
+            )
+        except Exception as e:
+            log_internal_error(request, e)
+            return Response(
+                {"detail": ComponentMessages.ERROR},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
 class ComponentSearchAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [SearchRateThrottle]
 
     @swagger_auto_schema(
         operation_description="Busca componentes por termo no nome ou descrição.",
@@ -195,24 +653,168 @@ class ComponentSearchAPIView(APIView):
     # Realiza uma busca de componentes com base em um termo informado via query string.
     # A busca é feita nos campos de nome e descrição.
     # Se nenhum termo for informado, retorna status 400.
-    # Também registra a tentativa de busca no log de pesquisas.
+    # O resultado é mantido em cache pelo termo normalizado até que o catálogo mude,
+    # inclusive quando a busca não encontra nada.
+    # Os resultados vêm ordenados por relevância e popularidade, limitados a
+    # COMPONENT_SEARCH_LIMIT itens; o cabeçalho X-Total-Count informa quantos
+    # componentes foram encontrados no total.
+    # Também registra a busca no log de pesquisas (quantidade total de resultados,
+    # sem o limite, e o primeiro colocado) e soma popularidade ao primeiro colocado.
     # Em caso de erro interno, registra no sistema de logs.
 
     def get(self, request):
         try:
             term = request.query_params.get("term")
-            if not term:
+            if not term or not term.strip():
                 return Response(
                     {"detail": ComponentMessages.SEARCH_TERM_REQUIRED},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            queryset = Component.objects.filter(
-                Q(name__icontains=term) | Q(description__icontains=term)
+            data, total = search_components(normalize_search_term(term))
+            top_hit = data[0]["id"] if data else None
+            SearchLog.objects.create(
+                term=get_search_term(term),
+                found=bool(data),
+                result_count=total,
+                component_id=top_hit,
+                user=request.user,
+            )
+            record_search_hit(top_hit)
+            return Response(data, headers={"X-Total-Count": str(total)})
+        except Exception as e:
+            log_internal_error(request, e)
+            return Response(
+                {"detail": ComponentMessages.ERROR},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class ComponentRelatedAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Lista os componentes mais buscados junto com o componente informado."
+        ),
+        responses={200: RelatedComponentSerializer(many=True), 404: "Componente não encontrado"},
+    )
+
+    # Retorna os componentes relacionados ao componente informado, em ordem de
+    # pontuação (sessões de busca em que os dois apareceram), com os dados de
+    # cada um. A lista é pré-calculada pelo comando compute_related_components
+    # (também executado periodicamente pelos workers) e lida com uma consulta;
+    # componentes excluídos depois do último cálculo ficam de fora.
+    # Se o componente não existir, retorna status 404.
+    # Em caso de erro interno, registra no sistema de logs.
+
+    def get(self, request, pk):
+        try:
+            related = list(
+                RelatedComponent.objects.filter(
+                    component_id=pk,
+                    component__deleted_at__isnull=True,
+                    related__deleted_at__isnull=True,
+                )
+                .select_related("related")
+                .order_by("rank")
+            )
+            if not related and not Component.objects.filter(pk=pk).exists():
+                return Response(
+                    {"detail": ComponentMessages.NOT_FOUND},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            return Response(RelatedComponentSerializer(related, many=True).data)
+        except Exception as e:
+            log_internal_error(request, e)
+            return Response(
+                {"detail": ComponentMessages.ERROR},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class ComponentSnapshotAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Informa a versão atual do snapshot completo do catálogo e o endereço "
+            "do arquivo para download."
+        ),
+        responses={200: "Versão e endereço do snapshot", 404: "Snapshot ainda não gerado"},
+    )
+
+    # Retorna a versão atual do snapshot do catálogo, o endereço do arquivo e seu
+    # tamanho comprimido. A versão é o token de sincronização a ser usado em
+    # /components/changes/ depois de carregar o arquivo.
+    # Se nenhum snapshot tiver sido gerado, retorna status 404.
+    # Em caso de erro interno, registra no sistema de logs.
+
+    def get(self, request):
+        try:
+            version = current_version()
+            if version is None:
+                return Response(
+                    {"detail": ComponentMessages.SNAPSHOT_UNAVAILABLE},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            return Response(
+                {
+                    "version": str(version),
+                    "url": reverse("component-snapshot-file", args=[version]),
+                    "size": os.path.getsize(snapshot_path(version)),
+                }
+            )
+        except Exception as e:
+            log_internal_error(request, e)
+            return Response(
+                {"detail": ComponentMessages.ERROR},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
-            SearchLog.objects.create(search_term=term, found=queryset.exists())
-            serializer = ComponentSerializer(queryset, many=True)
-            return Response(serializer.data)
+
+
+class ComponentSnapshotFileAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Baixa o snapshot do catálogo na versão informada (JSON comprimido com gzip)."
+        ),
+        responses={200: "Snapshot do catálogo", 404: "Versão não encontrada"},
+    )
+
+    # Entrega o arquivo do snapshot. Cada versão nunca muda, então a resposta é
+    # cacheável indefinidamente (immutable) e identificada pelo ETag da versão.
+    # O arquivo é enviado como está, com Content-Encoding: gzip; clientes que não
+    # aceitam gzip recebem o JSON descomprimido, com um ETag próprio, para que
+    # uma requisição condicional nunca confunda as duas representações.
+    # Se a versão não existir (ou já tiver sido descartada), retorna status 404.
+    # Em caso de erro interno, registra no sistema de logs.
+
+    def get(self, request, version):
+        try:
+            path = snapshot_path(version)
+            if not os.path.exists(path):
+                return Response(
+                    {"detail": ComponentMessages.SNAPSHOT_NOT_FOUND},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            if negotiate_encoding(request.headers.get("Accept-Encoding", "")) == "gzip":
+                response = FileResponse(
+                    open(path, "rb"),
+                    content_type="application/json",
+                    filename=f"catalog-{version}.json",
+                )
+                response["Content-Encoding"] = "gzip"
+                response["ETag"] = f'"catalog-{version}"'
+            else:
+                response = HttpResponse(
+                    read_decompressed(version), content_type="application/json"
+                )
+                response["ETag"] = f'"catalog-{version}-identity"'
+            response["Cache-Control"] = "private, max-age=31536000, immutable"
+            response["Vary"] = "Accept-Encoding"
+            return response
         except Exception as e:
             log_internal_error(request, e)
             return Response(
@@ -0,0 +1,27 @@
+from .pagination import EstimatedCountPaginator
+
+
+class LargeTableAdminMixin:
+    # Listagem do admin para tabelas de log com milhões de linhas.
+    # - contagem estimada (EstimatedCountPaginator), sem o COUNT(*) total
+    # - ordenação pela chave primária, decrescente (mais recentes primeiro)
+    # - navegação por chave: o link "Registros mais antigos" filtra por
+    #   id__lt=<último id da página>, que o banco resolve pelo índice da chave
+    #   primária, ao contrário de páginas distantes que precisam de OFFSET.
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    ordering = ("-id",)
+    change_list_template = "admin/large_table_change_list.html"
+
+    def changelist_view(self, request, extra_context=None):
+        response = super().changelist_view(request, extra_context)
+        context = getattr(response, "context_data", None)
+        changelist = context and context.get("cl")
+        if changelist is not None:
+            results = list(changelist.result_list)
+            if len(results) == changelist.list_per_page:
+                context["keyset_next_url"] = changelist.get_query_string(
+                    {"id__lt": results[-1].pk}, remove=["p"]
+                )
+        return response
@@ -0,0 +1,128 @@
+import heapq
+import itertools
+import threading
+import time
+
+from django.conf import settings
+
+from .metrics import ADMISSION_SHED, ADMISSION_WAIT
+
+# Controle de admissão por processo.
+# No máximo ADMISSION_MAX_CONCURRENCY requisições são atendidas ao mesmo tempo;
+# as excedentes esperam em uma fila curta (ADMISSION_QUEUE_SIZE lugares, até
+# ADMISSION_QUEUE_TIMEOUT milissegundos) e, quando não há lugar ou o tempo
+# acaba, são recusadas na hora com 503, em vez de acumular atrás dos workers
+# até todas estourarem o tempo limite.
+#
+# Cada rota tem uma classe de prioridade (ADMISSION_ROUTE_PRIORITIES): consultas
+# baratas como detalhe e estoque ("high") passam à frente na fila das demais
+# ("normal") e das pesadas, como dashboard e lotes ("low"). Com a fila cheia,
+# uma requisição mais prioritária toma o lugar da menos prioritária, que é
+# recusada. As requisições "low" nunca ocupam os últimos
+# ADMISSION_RESERVED_SLOTS lugares, que ficam livres para as outras classes.
+
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+LABELS = {value: key for key, value in PRIORITIES.items()}
+
+
+class Waiter:
+    def __init__(self):
+        self.event = threading.Event()
+        self.admitted = False
+
+
+class AdmissionController:
+    def __init__(self, limit, queue_size, reserved):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.reserved = reserved
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._waiters = []
+        self._sequence = itertools.count()
+
+    def _capacity(self, priority):
+        if priority == PRIORITIES["low"]:
+            return max(1, self.limit - self.reserved)
+        return self.limit
+
+    # Entrega os lugares livres aos primeiros da fila (maior prioridade e, na
+    # mesma prioridade, quem chegou antes). Chamado com o lock adquirido.
+
+    def _dispatch(self):
+        while self._waiters:
+            priority, _, waiter = self._waiters[0]
+            if self.in_flight >= self._capacity(priority):
+                return
+            heapq.heappop(self._waiters)
+            self.in_flight += 1
+            waiter.admitted = True
+            waiter.event.set()
+
+    # Tenta ocupar um lugar. Retorna (admitida, motivo da recusa).
+
+    def acquire(self, priority, timeout):
+        with self._lock:
+            ahead = self._waiters and self._waiters[0][0] <= priority
+            if not ahead and self.in_flight < self._capacity(priority):
+                self.in_flight += 1
+                return True, None
+            if len(self._waiters) >= self.queue_size:
+                if not self._waiters:
+                    return False, "queue_full"
+                worst = max(self._waiters)
+                if worst[0] <= priority:
+                    return False, "queue_full"
+                self._waiters.remove(worst)
+                heapq.heapify(self._waiters)
+                worst[2].event.set()
+            waiter = Waiter()
+            entry = (priority, next(self._sequence), waiter)
+            heapq.heappush(self._waiters, entry)
+
+        waiter.event.wait(timeout)
+        with self._lock:
+            if waiter.admitted:
+                return True, None
+            if entry in self._waiters:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                return False, "timeout"
+            return False, "evicted"
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+            self._dispatch()
+
+
+controller = AdmissionController(
+    limit=settings.ADMISSION_MAX_CONCURRENCY,
+    queue_size=settings.ADMISSION_QUEUE_SIZE,
+    reserved=settings.ADMISSION_RESERVED_SLOTS,
+)
+
+
+def route_priority(view_name):
+    return PRIORITIES[settings.ADMISSION_ROUTE_PRIORITIES.get(view_name, "normal")]
+
+
+# Admite a requisição da rota informada, esperando na fila se preciso.
+# Retorna (admitida, motivo da recusa) e registra a espera e as recusas nas métricas.
+
+
+def admit(view_name):
+    priority = route_priority(view_name)
+    started = time.perf_counter()
+    admitted, reason = controller.acquire(
+        priority, settings.ADMISSION_QUEUE_TIMEOUT / 1000
+    )
+    label = LABELS[priority]
+    ADMISSION_WAIT.labels(label).observe(time.perf_counter() - started)
+    if not admitted:
+        ADMISSION_SHED.labels(label, reason).inc()
+    return admitted, reason
+
+
+def release():
+    controller.release()
@@ -0,0 +1,102 @@
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+
+from django.conf import settings
+
+# Compressão das respostas (gzip/deflate) negociada pelo Accept-Encoding.
+# Respostas com ETag são cacheáveis: o corpo comprimido fica guardado em um
+# cache LRU do processo, indexado pelo caminho, ETag e codificação, e as próximas
+# respostas iguais reaproveitam os bytes prontos em vez de comprimir de novo.
+
+ENCODINGS = ("gzip", "deflate")
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-yaml",
+    "application/yaml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+# Escolhe a codificação aceita pelo cliente com maior peso (q); em caso de
+# empate prefere gzip. Retorna None quando nenhuma é aceita.
+
+
+def negotiate_encoding(accept_encoding):
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[name] = quality
+
+    best = None
+    for encoding in ENCODINGS:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > 0 and (best is None or quality > best[1]):
+            best = (encoding, quality)
+    return best and best[0]
+
+
+def is_compressible(content_type):
+    content_type = content_type.split(";")[0].strip().lower()
+    if content_type == "text/event-stream":
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def compress(body, encoding, level=None):
+    level = settings.COMPRESSION_LEVEL if level is None else level
+    if encoding == "gzip":
+        # mtime fixo: a mesma entrada gera sempre os mesmos bytes.
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    return zlib.compress(body, level)
+
+
+class CompressedBodyCache:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def set(self, key, body):
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+compressed_bodies = CompressedBodyCache(settings.COMPRESSION_CACHE_ENTRIES)
+
+
+def compress_cached(body, encoding, path, etag):
+    key = (path, etag, encoding)
+    compressed = compressed_bodies.get(key)
+    if compressed is None:
+        compressed = compress(body, encoding)
+        compressed_bodies.set(key, compressed)
+    return compressed
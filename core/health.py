@@ -0,0 +1,37 @@
+from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
+
+from . import warmup
+
+# Endpoints para o balanceador de carga e o orquestrador.
+# /healthz (liveness): o processo está respondendo. Sempre 200; informa a
+# latência do banco quando ele está acessível.
+# /readyz (readiness): 200 apenas quando o banco responde e o aquecimento do
+# processo terminou; caso contrário 503, para que o tráfego vá a outro worker.
+
+
+def check_database():
+    try:
+        return {"ok": True, "latency_ms": warmup.database_latency_ms()}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+
+@never_cache
+def healthz(request):
+    return JsonResponse({"status": "ok", "database": check_database()})
+
+
+@never_cache
+def readyz(request):
+    database = check_database()
+    warmed = warmup.finished.is_set()
+    ready = database["ok"] and warmed
+    return JsonResponse(
+        {
+            "status": "ready" if ready else "not_ready",
+            "database": database,
+            "warmup": {"finished": warmed, **warmup.state},
+        },
+        status=200 if ready else 503,
+    )
@@ -0,0 +1,89 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import Resolver404, resolve
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.compression import compress
+from core.renderers import FastJSONRenderer, orjson
+
+# Microbenchmark de serialização e compressão por endpoint.
+# Cada caminho é chamado uma vez (no próprio processo, autenticado como o
+# usuário informado); os dados retornados são então codificados várias vezes
+# com o JSONRenderer do DRF e com o FastJSONRenderer, e comprimidos com gzip e
+# deflate. Mostra o tamanho em bytes e o tempo médio de cada etapa.
+
+DEFAULT_PATHS = [
+    "/components/",
+    "/components/changes/",
+    "/dashboard/dashboard/",
+    "/users/",
+]
+
+
+def average_ms(function, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        result = function()
+    return result, (time.perf_counter() - started) * 1000 / iterations
+
+
+class Command(BaseCommand):
+    help = "Compara tamanho e tempo de codificação/compressão das respostas JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="*", default=DEFAULT_PATHS)
+        parser.add_argument("--iterations", type=int, default=100)
+        parser.add_argument(
+            "--username",
+            help="Usuário usado nas requisições (padrão: o primeiro superusuário).",
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        users = User.objects.filter(is_active=True)
+        if options["username"]:
+            user = users.filter(username=options["username"]).first()
+        else:
+            user = users.filter(is_superuser=True).order_by("id").first()
+        if user is None:
+            raise CommandError("Nenhum usuário encontrado para executar as requisições.")
+
+        iterations = options["iterations"]
+        factory = APIRequestFactory()
+        standard = JSONRenderer()
+        fast = FastJSONRenderer()
+        if orjson is None:
+            self.stdout.write(
+                self.style.WARNING("orjson não instalado: FastJSONRenderer usa o json padrão.")
+            )
+
+        self.stdout.write(
+            f"{'endpoint':<28}{'bytes':>10}{'json ms':>10}{'fast ms':>10}"
+            f"{'gzip':>10}{'gzip ms':>10}{'deflate':>10}{'defl ms':>10}"
+        )
+        for path in options["paths"]:
+            try:
+                match = resolve(path.split("?")[0])
+            except Resolver404:
+                self.stderr.write(f"{path}: endereço não encontrado.")
+                continue
+            request = factory.get(path)
+            force_authenticate(request, user=user)
+            response = match.func(request, *match.args, **match.kwargs)
+            data = getattr(response, "data", None)
+            if response.status_code != 200 or data is None:
+                self.stderr.write(f"{path}: status {response.status_code}, ignorado.")
+                continue
+
+            body, json_ms = average_ms(lambda: standard.render(data), iterations)
+            _, fast_ms = average_ms(lambda: fast.render(data), iterations)
+            gzipped, gzip_ms = average_ms(lambda: compress(body, "gzip"), iterations)
+            deflated, deflate_ms = average_ms(lambda: compress(body, "deflate"), iterations)
+            self.stdout.write(
+                f"{path:<28}{len(body):>10}{json_ms:>10.3f}{fast_ms:>10.3f}"
+                f"{len(gzipped):>10}{gzip_ms:>10.3f}{len(deflated):>10}{deflate_ms:>10.3f}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Média de {iterations} execuções por etapa."))
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.schema import write_schema
+
+# Gera o schema OpenAPI da API e grava em OPENAPI_SCHEMA_FILE.
+# Executado no deploy (entrypoint.sh), para que os workers sirvam o arquivo
+# pronto em vez de percorrer todas as views a cada acesso ao /swagger/.
+
+
+class Command(BaseCommand):
+    help = "Gera o schema OpenAPI da API em um arquivo estático."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=settings.OPENAPI_SCHEMA_FILE,
+            help="Arquivo de destino (padrão: OPENAPI_SCHEMA_FILE).",
+        )
+
+    def handle(self, *args, **options):
+        size = write_schema(options["output"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Schema OpenAPI gravado em {options['output']} ({size} bytes).")
+        )
@@ -0,0 +1,23 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from core.warmup import run_warmup
+
+# Executa o aquecimento (ver core/warmup.py) e mostra o tempo de cada etapa.
+# Os caches de busca só são compartilhados com os workers quando o cache do
+# Django é o Redis (REDIS_URL); o banco é aquecido em qualquer caso.
+
+
+class Command(BaseCommand):
+    help = "Executa consultas representativas e preenche os caches da API."
+
+    def handle(self, *args, **options):
+        state = run_warmup()
+        self.stdout.write(json.dumps(state["steps"], indent=2))
+        if state["error"]:
+            self.stderr.write(f"Aquecimento concluído com erro: {state['error']}")
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f"Aquecimento concluído em {state['duration_ms']} ms.")
+            )
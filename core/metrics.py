@@ -0,0 +1,216 @@
+import hmac
+import os
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+# Métricas da API no formato do Prometheus, expostas em /metrics.
+# Com a variável de ambiente PROMETHEUS_MULTIPROC_DIR definida (servidor com
+# vários workers), cada processo grava seus contadores em arquivos mapeados em
+# memória nesse diretório e o /metrics soma os arquivos de todos os processos;
+# o registro de uma métrica é só uma escrita na memória do próprio processo,
+# sem chamadas de rede nem locks entre workers. O diretório deve ser esvaziado
+# a cada início do servidor (ver entrypoint.sh). Sem a variável, as métricas
+# ficam apenas na memória do processo.
+
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "Requisições HTTP atendidas, por view, método e status.",
+    ["view", "method", "status"],
+)
+LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Tempo de resposta das requisições HTTP, por view e método.",
+    ["view", "method"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Consultas ao banco executadas por requisição, por view.",
+    ["view"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+SEARCHES = Counter(
+    "component_searches_total",
+    "Buscas registradas no SearchLog, por resultado (found=true|false).",
+    ["found"],
+)
+INTERNAL_ERRORS = Counter(
+    "internal_errors_total",
+    "Erros internos registrados com log_internal_error.",
+)
+COMPONENT_CACHE = Counter(
+    "component_cache_requests_total",
+    "Leituras do cache de componentes no detalhe, por resultado "
+    "(hit, miss ou coalesced, quando aguardou o carregamento de outra requisição).",
+    ["result"],
+)
+THROTTLE_REJECTIONS = Counter(
+    "throttle_rejections_total",
+    "Requisições recusadas pela limitação de taxa, por escopo.",
+    ["scope"],
+)
+ADMISSION_WAIT = Histogram(
+    "admission_queue_wait_seconds",
+    "Espera na fila do controle de admissão, por classe de prioridade.",
+    ["priority"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+ADMISSION_SHED = Counter(
+    "admission_shed_total",
+    "Requisições recusadas com 503 pelo controle de admissão, por classe de "
+    "prioridade e motivo (queue_full, timeout ou evicted).",
+    ["priority", "reason"],
+)
+JOBS_PROCESSED = Counter(
+    "jobs_processed_total",
+    "Tarefas executadas pelos workers, por tarefa e resultado.",
+    ["task", "outcome"],
+)
+JOB_DURATION = Histogram(
+    "job_duration_seconds",
+    "Tempo de execução das tarefas em segundo plano, por tarefa.",
+    ["task"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300),
+)
+
+
+class LowStockCollector:
+    # Quantidade atual de componentes com estoque crítico, calculada a cada coleta.
+    # describe() evita que o registro do coletor execute a consulta na importação.
+
+    def family(self):
+        return GaugeMetricFamily(
+            "low_stock_components",
+            "Componentes com quantidade menor ou igual a STOCK_ALERT_THRESHOLD.",
+        )
+
+    def describe(self):
+        yield self.family()
+
+    def collect(self):
+        from components.models import Component
+
+        gauge = self.family()
+        gauge.add_metric(
+            [],
+            Component.objects.filter(
+                quantity__lte=settings.STOCK_ALERT_THRESHOLD
+            ).count(),
+        )
+        yield gauge
+
+
+class JobQueueCollector:
+    # Profundidade da fila de tarefas (jobs), calculada a cada coleta: tarefas
+    # por situação ("ready" são as que já podem ser executadas, "scheduled" as
+    # agendadas para depois) e há quantos segundos a tarefa pronta mais antiga espera.
+
+    def families(self):
+        return (
+            GaugeMetricFamily(
+                "jobs_queue_depth", "Tarefas na fila, por situação.", labels=["state"]
+            ),
+            GaugeMetricFamily(
+                "jobs_oldest_ready_age_seconds",
+                "Espera da tarefa pronta mais antiga.",
+            ),
+        )
+
+    def describe(self):
+        yield from self.families()
+
+    def collect(self):
+        from django.db.models import Count, Min, Q
+        from django.utils import timezone
+        from jobs.models import Job
+
+        now = timezone.now()
+        queued = Q(status=Job.Status.QUEUED)
+        counts = Job.objects.filter(
+            status__in=[Job.Status.QUEUED, Job.Status.RUNNING]
+        ).aggregate(
+            ready=Count("id", filter=queued & Q(run_at__lte=now)),
+            scheduled=Count("id", filter=queued & Q(run_at__gt=now)),
+            running=Count("id", filter=Q(status=Job.Status.RUNNING)),
+            oldest=Min("run_at", filter=queued & Q(run_at__lte=now)),
+        )
+        depth, age = self.families()
+        for state in ("ready", "scheduled", "running"):
+            depth.add_metric([state], counts[state])
+        oldest = counts["oldest"]
+        age.add_metric([], (now - oldest).total_seconds() if oldest else 0)
+        yield depth
+        yield age
+
+
+low_stock_collector = LowStockCollector()
+job_queue_collector = JobQueueCollector()
+if not MULTIPROCESS:
+    REGISTRY.register(low_stock_collector)
+    REGISTRY.register(job_queue_collector)
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    # Mede cada requisição: contagem, tempo de resposta e consultas ao banco.
+    # A view é identificada pelo nome da rota (ex.: "component-list"); caminhos
+    # que não correspondem a nenhuma rota são agrupados em "unresolved", para
+    # que a quantidade de séries não cresça com URLs arbitrárias.
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = QueryCounter()
+        started = time.perf_counter()
+        with connection.execute_wrapper(queries):
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        match = request.resolver_match
+        view = match.view_name if match else "unresolved"
+        REQUESTS.labels(view, request.method, response.status_code).inc()
+        LATENCY.labels(view, request.method).observe(elapsed)
+        DB_QUERIES.labels(view).observe(queries.count)
+        return response
+
+
+# O endpoint exige o token METRICS_TOKEN; sem token configurado fica fechado.
+
+
+def metrics(request):
+    token = settings.METRICS_TOKEN
+    supplied = request.headers.get("Authorization", "")
+    if not token or not hmac.compare_digest(supplied, f"Bearer {token}"):
+        return HttpResponseForbidden()
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(low_stock_collector)
+        registry.register(job_queue_collector)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,85 @@
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
+
+from . import admission
+from .compression import compress, compress_cached, is_compressible, negotiate_encoding
+
+
+class AdmissionMiddleware:
+    # Limita as requisições atendidas ao mesmo tempo pelo processo (ver
+    # core/admission.py). A admissão acontece em process_view, depois da
+    # resolução da rota, para que a prioridade venha do nome da rota; o lugar é
+    # liberado quando a resposta fica pronta (o corpo de respostas em stream não
+    # conta). Rotas em ADMISSION_EXEMPT_ROUTES (health checks, métricas e o
+    # stream de eventos do dashboard, que fica aberto) não passam pelo controle.
+    # Requisições recusadas recebem 503 com Retry-After.
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            if getattr(request, "_admitted", False):
+                admission.release()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_name = request.resolver_match.view_name
+        if (
+            settings.ADMISSION_MAX_CONCURRENCY <= 0
+            or view_name in settings.ADMISSION_EXEMPT_ROUTES
+        ):
+            return None
+        admitted, _ = admission.admit(view_name)
+        if not admitted:
+            response = JsonResponse(
+                {"detail": "Servidor sobrecarregado. Tente novamente em instantes."},
+                status=503,
+            )
+            response["Retry-After"] = str(settings.ADMISSION_RETRY_AFTER)
+            return response
+        request._admitted = True
+        return None
+
+
+class CompressionMiddleware:
+    # Comprime as respostas com gzip ou deflate conforme o Accept-Encoding.
+    # Corpos menores que COMPRESSION_MIN_SIZE, respostas em stream, tipos já
+    # comprimidos (imagens, PDFs...) e respostas que já têm Content-Encoding
+    # seguem sem alteração. Com ETag, o corpo comprimido vem do cache (ver
+    # core/compression.py) e o ETag passa a ser fraco, como no GZipMiddleware.
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            response.streaming
+            or response.has_header("Content-Encoding")
+            or len(response.content) < settings.COMPRESSION_MIN_SIZE
+            or not is_compressible(response.get("Content-Type", ""))
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        etag = response.get("ETag")
+        if etag:
+            compressed = compress_cached(response.content, encoding, request.path, etag)
+        else:
+            compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = encoding
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        return response
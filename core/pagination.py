@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connection
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+
+# Paginação padrão das listagens da API.
+# O cliente escolhe a página com "page" e o tamanho com "page_size",
+# limitado a API_MAX_PAGE_SIZE.
+
+
+class DefaultPagination(PageNumberPagination):
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+
+# Paginação das listagens do admin para tabelas grandes (logs).
+# Em vez de COUNT(*) a contagem vem das estatísticas do PostgreSQL: sem filtros,
+# o número de linhas estimado da tabela (pg_class.reltuples); com filtros, a
+# estimativa do planejador (EXPLAIN). Quando a estimativa fica abaixo de
+# ADMIN_EXACT_COUNT_LIMIT, a contagem exata é barata e é usada no lugar.
+
+
+def estimate_count(queryset):
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            estimate = row[0] if row else -1
+        else:
+            sql, params = queryset.order_by().query.sql_with_params()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            estimate = cursor.fetchone()[0][0]["Plan"]["Plan Rows"]
+    return None if estimate < 0 else int(estimate)
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list)
+        if estimate is None or estimate < settings.ADMIN_EXACT_COUNT_LIMIT:
+            return self.object_list.count()
+        return estimate
@@ -0,0 +1,31 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+# Renderizador JSON padrão da API.
+# Usa o orjson quando ele está instalado (codificação bem mais rápida) e cai no
+# JSONRenderer do DRF (json da biblioteca padrão) quando não está, ou quando o
+# cliente pede saída indentada. Tipos que o orjson não conhece (Decimal, datas,
+# textos traduzíveis...) são convertidos pelo mesmo encoder do DRF, então o
+# conteúdo gerado é o mesmo nos dois caminhos.
+
+
+class FastJSONRenderer(JSONRenderer):
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(
+            accepted_media_type or "", renderer_context or {}
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        return orjson.dumps(
+            data,
+            default=self.encoder.default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+        )
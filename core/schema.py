@@ -0,0 +1,89 @@
+import hashlib
+import os
+import threading
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control
+
+from .swagger import materialize
+
+# Schema OpenAPI da API.
+# O comando generate_schema grava o schema em OPENAPI_SCHEMA_FILE durante o
+# deploy (ver entrypoint.sh); a view openapi_schema serve esse arquivo com ETag,
+# e os clientes revalidam com If-None-Match (304). Sem o arquivo, por exemplo em
+# desenvolvimento, o schema é gerado na primeira requisição e mantido em memória.
+# A interface do Swagger lê o schema dessa URL (SWAGGER_SETTINGS["SPEC_URL"]).
+
+API_INFO = {
+    "title": "Eletro Rápida",
+    "default_version": "v1",
+    "description": "Documentação ",
+}
+
+_lock = threading.Lock()
+_schema = None
+_swagger_ui = None
+
+
+def generate_schema():
+    materialize()
+    from drf_yasg import openapi
+    from drf_yasg.codecs import OpenAPICodecJson
+    from drf_yasg.generators import OpenAPISchemaGenerator
+
+    generator = OpenAPISchemaGenerator(info=openapi.Info(**API_INFO))
+    schema = generator.get_schema(request=None, public=True)
+    return OpenAPICodecJson(validators=[]).encode(schema)
+
+
+def load_schema():
+    global _schema
+    with _lock:
+        if _schema is None:
+            try:
+                with open(settings.OPENAPI_SCHEMA_FILE, "rb") as handle:
+                    content = handle.read()
+            except FileNotFoundError:
+                content = generate_schema()
+            etag = '"%s"' % hashlib.md5(content, usedforsecurity=False).hexdigest()
+            _schema = (content, etag)
+        return _schema
+
+
+def write_schema(path):
+    content = generate_schema()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as handle:
+        handle.write(content)
+    os.replace(temporary, path)
+    return len(content)
+
+
+def openapi_schema(request):
+    content, etag = load_schema()
+    response = HttpResponse(content, content_type="application/json")
+    response["ETag"] = etag
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
+
+
+# Interface do Swagger. A view do drf_yasg só é criada no primeiro acesso.
+
+
+def swagger_ui(request, *args, **kwargs):
+    global _swagger_ui
+    if _swagger_ui is None:
+        materialize()
+        from drf_yasg import openapi
+        from drf_yasg.views import get_schema_view
+        from rest_framework import permissions
+
+        schema_view = get_schema_view(
+            openapi.Info(**API_INFO),
+            public=True,
+            permission_classes=(permissions.AllowAny,),
+        )
+        _swagger_ui = schema_view.with_ui("swagger", cache_timeout=0)
+    return _swagger_ui(request, *args, **kwargs)
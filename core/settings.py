@@ -49,30 +49,40 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # libs
     "rest_framework",
     "drf_yasg",
     "rest_framework_simplejwt",
     "rest_framework_simplejwt.token_blacklist",
     # custom
+    "core",
     "authentication",
     "users",
     "components",
     "logs",
     "dashboard",
     "logsystem",
+    "batch",
+    "idempotency",
+    "jobs",
 ]
 
 AUTH_USER_MODEL = "users.User"
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "core.metrics.MetricsMiddleware",
+    "core.middleware.AdmissionMiddleware",
+    "core.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.http.ConditionalGetMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "logsystem.profiling.ProfilingMiddleware",
 ]
 
 ROOT_URLCONF = "core.urls"
@@ -121,6 +131,190 @@ DATABASES = {
     }
 }
 
+# Cache
+# Por padrão usa memória local do processo. Em produção com vários workers,
+# defina REDIS_URL (requer o pacote redis) para que a invalidação do cache seja
+# compartilhada entre eles: com o cache local, uma alteração só invalida o cache
+# do processo que a fez, e os demais seguem respondendo com dados antigos até a
+# entrada expirar.
+SHARED_CACHE = bool(os.getenv("REDIS_URL"))
+
+if SHARED_CACHE:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "eletrorapida",
+            "OPTIONS": {"MAX_ENTRIES": 5000},
+        }
+    }
+
+# Tempo (segundos) que o resultado de uma busca de componentes fica em cache.
+# A entrada também é descartada sempre que o catálogo é alterado, mas sem
+# REDIS_URL só no processo que fez a alteração: nos outros, a busca pode ficar
+# desatualizada por até este tempo, por isso o padrão é menor nesse caso.
+COMPONENT_SEARCH_CACHE_TIMEOUT = int(
+    os.getenv("COMPONENT_SEARCH_CACHE_TIMEOUT", 3600 if SHARED_CACHE else 60)
+)
+
+# Cache do detalhe de componentes: validade (segundos) de cada entrada, validade
+# da trava de carregamento e espera máxima pelo carregamento feito por outra
+# requisição antes de consultar o banco diretamente. Sem REDIS_URL, um PUT ou
+# DELETE só invalida a entrada no processo que o atendeu; os outros podem
+# devolver o componente antigo por até COMPONENT_CACHE_TIMEOUT segundos.
+COMPONENT_CACHE_TIMEOUT = int(
+    os.getenv("COMPONENT_CACHE_TIMEOUT", 300 if SHARED_CACHE else 30)
+)
+COMPONENT_CACHE_LOCK_TIMEOUT = int(os.getenv("COMPONENT_CACHE_LOCK_TIMEOUT", 10))
+COMPONENT_CACHE_WAIT = float(os.getenv("COMPONENT_CACHE_WAIT", 2))
+
+# Quantidade máxima de resultados retornados pela busca de componentes.
+COMPONENT_SEARCH_LIMIT = int(os.getenv("COMPONENT_SEARCH_LIMIT", 50))
+# Pesos somados à popularidade de um componente quando ele é o primeiro
+# resultado de uma busca e quando seu detalhe é visualizado.
+POPULARITY_SEARCH_WEIGHT = int(os.getenv("POPULARITY_SEARCH_WEIGHT", 1))
+POPULARITY_DETAIL_WEIGHT = int(os.getenv("POPULARITY_DETAIL_WEIGHT", 2))
+# Os pesos são acumulados em memória e enviados aos workers quando há esta
+# quantidade de componentes distintos ou a cada intervalo (segundos).
+POPULARITY_BUFFER_SIZE = int(os.getenv("POPULARITY_BUFFER_SIZE", 1000))
+POPULARITY_FLUSH_INTERVAL = int(os.getenv("POPULARITY_FLUSH_INTERVAL", 30))
+
+# Quantidade máxima de alterações retornadas por chamada em /components/changes/.
+COMPONENT_CHANGES_PAGE_SIZE = int(os.getenv("COMPONENT_CHANGES_PAGE_SIZE", 500))
+
+# Componentes relacionados (/components/<pk>/related/): intervalo (minutos) sem
+# buscas que encerra uma sessão, dias do SearchLog considerados, mínimo de
+# sessões em comum e quantidade de vizinhos guardados por componente.
+RELATED_SESSION_GAP = int(os.getenv("RELATED_SESSION_GAP", 30))
+RELATED_LOOKBACK_DAYS = int(os.getenv("RELATED_LOOKBACK_DAYS", 90))
+RELATED_MIN_SCORE = int(os.getenv("RELATED_MIN_SCORE", 1))
+RELATED_TOP_K = int(os.getenv("RELATED_TOP_K", 10))
+
+# Quantidade máxima de itens em uma lista de separação.
+PICKING_LIST_MAX_ITEMS = int(os.getenv("PICKING_LIST_MAX_ITEMS", 500))
+
+# Dashboard
+# Componentes com quantidade menor ou igual a este valor aparecem nos alertas.
+STOCK_ALERT_THRESHOLD = int(os.getenv("STOCK_ALERT_THRESHOLD", 2))
+# Quantidade padrão e máxima de termos retornados em cada ranking de buscas.
+DASHBOARD_TOP_DEFAULT = int(os.getenv("DASHBOARD_TOP_DEFAULT", 10))
+DASHBOARD_TOP_MAX = int(os.getenv("DASHBOARD_TOP_MAX", 100))
+# Quantidade de termos de busca (logs.SearchTerm) cujo id fica em cache em cada processo.
+SEARCH_TERM_CACHE_SIZE = int(os.getenv("SEARCH_TERM_CACHE_SIZE", 10000))
+
+# Contagens de buscas em memória (dashboard/search_counts.py): quantidade de
+# contadores distintos (hora, termo, encontrado) que dispara a gravação no banco,
+# e intervalo (segundos) entre as gravações. Os nomes antigos
+# DASHBOARD_SKETCH_* continuam aceitos.
+DASHBOARD_COUNTS_CAPACITY = int(
+    os.getenv("DASHBOARD_COUNTS_CAPACITY", os.getenv("DASHBOARD_SKETCH_CAPACITY", 1000))
+)
+DASHBOARD_COUNTS_FLUSH_INTERVAL = int(
+    os.getenv(
+        "DASHBOARD_COUNTS_FLUSH_INTERVAL",
+        os.getenv("DASHBOARD_SKETCH_FLUSH_INTERVAL", 30),
+    )
+)
+# Stream de eventos do dashboard (distribuídos entre os processos por
+# LISTEN/NOTIFY no PostgreSQL; cada processo com clientes conectados mantém uma
+# conexão extra com o banco): eventos mantidos para retomada via Last-Event-ID,
+# intervalo do heartbeat e duração máxima de cada conexão (segundos), e o tempo
+# que o navegador espera antes de reconectar (milissegundos).
+DASHBOARD_EVENTS_BUFFER = int(os.getenv("DASHBOARD_EVENTS_BUFFER", 1000))
+DASHBOARD_EVENTS_HEARTBEAT = int(os.getenv("DASHBOARD_EVENTS_HEARTBEAT", 15))
+DASHBOARD_EVENTS_MAX_DURATION = int(os.getenv("DASHBOARD_EVENTS_MAX_DURATION", 300))
+DASHBOARD_EVENTS_RETRY_MS = int(os.getenv("DASHBOARD_EVENTS_RETRY_MS", 3000))
+
+# Importação de usuários em lote: máximo de linhas por requisição e processos
+# usados para calcular os hashes de senha (padrão: todos os núcleos).
+USER_IMPORT_MAX_ROWS = int(os.getenv("USER_IMPORT_MAX_ROWS", 1000))
+USER_IMPORT_WORKERS = int(os.getenv("USER_IMPORT_WORKERS", 0)) or os.cpu_count()
+
+# Aquecimento ao iniciar o processo (core/warmup.py): habilitado, quantidade de
+# termos mais buscados levados ao cache, janela (dias) considerada no SearchLog e
+# páginas da listagem de componentes consultadas.
+WARMUP_ON_BOOT = os.getenv("WARMUP_ON_BOOT", "true").lower() in ("1", "true")
+WARMUP_SEARCH_TERMS = int(os.getenv("WARMUP_SEARCH_TERMS", 50))
+WARMUP_SEARCH_WINDOW = timedelta(days=int(os.getenv("WARMUP_SEARCH_WINDOW_DAYS", 7)))
+WARMUP_LIST_PAGES = int(os.getenv("WARMUP_LIST_PAGES", 2))
+
+# Métricas (/metrics, ver core/metrics.py). O token deve ser enviado no
+# cabeçalho "Authorization: Bearer <token>"; sem token definido o endpoint
+# responde 403 a todos.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Profiling sob demanda (logsystem/profiling.py): fração das requisições
+# perfiladas por amostragem (0 desliga), validade em segundos dos tokens do
+# cabeçalho X-Profile e linhas do resumo gravado com cada perfil.
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", 0))
+PROFILING_TOKEN_MAX_AGE = int(os.getenv("PROFILING_TOKEN_MAX_AGE", 3600))
+PROFILING_SUMMARY_LINES = int(os.getenv("PROFILING_SUMMARY_LINES", 60))
+
+# Erros internos agrupados (logsystem.ErrorGroup): além da primeira ocorrência
+# de cada grupo, esta fração das ocorrências seguintes grava o traceback completo.
+ERROR_TRACEBACK_SAMPLE_RATE = float(os.getenv("ERROR_TRACEBACK_SAMPLE_RATE", 0.01))
+
+# Listagens do admin de logs: abaixo desta quantidade estimada de linhas a
+# contagem exata (COUNT) é usada; acima, a estimativa do PostgreSQL.
+ADMIN_EXACT_COUNT_LIMIT = int(os.getenv("ADMIN_EXACT_COUNT_LIMIT", 10000))
+
+# Requisições em lote (/batch/): máximo de itens por lote e threads usadas
+# para executar em paralelo as leituras (GET) consecutivas.
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", 20))
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", 4))
+
+# Cabeçalho Idempotency-Key nas criações de componentes e usuários: por quanto
+# tempo a resposta de uma chave é guardada e devolvida nas repetições.
+IDEMPOTENCY_KEY_TTL = timedelta(hours=int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", 24)))
+
+# Fila de tarefas em segundo plano (app jobs, comando run_workers).
+# Processos e threads por processo dos workers; intervalo (segundos) entre
+# consultas à fila vazia e entre verificações dos agendamentos periódicos.
+JOBS_PROCESSES = int(os.getenv("JOBS_PROCESSES", 2))
+JOBS_THREADS = int(os.getenv("JOBS_THREADS", 4))
+JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", 1))
+JOBS_SCHEDULER_INTERVAL = float(os.getenv("JOBS_SCHEDULER_INTERVAL", 15))
+# Tentativas padrão por tarefa e espera (segundos) antes de repetir uma falha,
+# dobrada a cada tentativa até o máximo.
+JOBS_MAX_ATTEMPTS = int(os.getenv("JOBS_MAX_ATTEMPTS", 3))
+JOBS_RETRY_BACKOFF = int(os.getenv("JOBS_RETRY_BACKOFF", 10))
+JOBS_RETRY_BACKOFF_MAX = int(os.getenv("JOBS_RETRY_BACKOFF_MAX", 3600))
+# Intervalo (segundos) do heartbeat das tarefas em execução; sem heartbeat por
+# mais de JOBS_HEARTBEAT_TIMEOUT segundos o worker é considerado encerrado e a
+# tarefa volta para a fila.
+JOBS_HEARTBEAT_INTERVAL = int(os.getenv("JOBS_HEARTBEAT_INTERVAL", 30))
+JOBS_HEARTBEAT_TIMEOUT = int(os.getenv("JOBS_HEARTBEAT_TIMEOUT", 120))
+JOBS_KEEP_FINISHED_DAYS = int(os.getenv("JOBS_KEEP_FINISHED_DAYS", 7))
+# Tarefas periódicas: nome -> tarefa registrada e intervalo em segundos.
+JOBS_PERIODIC = {
+    "prune_idempotency_keys": {
+        "task": "idempotency.tasks.prune_expired_keys",
+        "interval": 3600,
+    },
+    "compact_stock_ledger": {
+        "task": "components.tasks.compact_stock_ledger",
+        "interval": 86400,
+    },
+    "build_catalog_snapshot": {
+        "task": "components.tasks.build_catalog_snapshot",
+        "interval": 3600,
+    },
+    "compute_related_components": {
+        "task": "components.tasks.compute_related_components",
+        "interval": 86400,
+    },
+    "prune_finished_jobs": {
+        "task": "jobs.tasks.prune_finished_jobs",
+        "interval": 86400,
+    },
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -160,17 +354,83 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+# Snapshot comprimido do catálogo (components/snapshot.py): diretório dos
+# arquivos, quantas versões manter e o intervalo (segundos) entre uma alteração
+# no catálogo e a geração da nova versão. Com 0 a geração automática é
+# desligada e o snapshot só é gerado pelo comando build_catalog_snapshot.
+CATALOG_SNAPSHOT_DIR = os.getenv(
+    "CATALOG_SNAPSHOT_DIR", os.path.join(BASE_DIR, "catalog_snapshots")
+)
+CATALOG_SNAPSHOT_KEEP = int(os.getenv("CATALOG_SNAPSHOT_KEEP", 3))
+CATALOG_SNAPSHOT_DEBOUNCE = int(os.getenv("CATALOG_SNAPSHOT_DEBOUNCE", 30))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Tamanho padrão e máximo das páginas nas listagens paginadas.
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", 50))
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", 500))
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
+    # JSON via orjson quando instalado, com a biblioteca padrão como alternativa.
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    # Limites por endpoint (ver core/throttling.py), no formato "N/período".
+    "DEFAULT_THROTTLE_RATES": {
+        "login": os.getenv("THROTTLE_RATE_LOGIN", "10/min"),
+        "search": os.getenv("THROTTLE_RATE_SEARCH", "120/min"),
+        "password_reset": os.getenv("THROTTLE_RATE_PASSWORD_RESET", "5/hour"),
+    },
+    # Quantidade de proxies confiáveis na frente da aplicação. Com 0 (servidor
+    # exposto diretamente) o cliente anônimo é identificado pelo REMOTE_ADDR e
+    # o X-Forwarded-For, que o próprio cliente pode forjar, é ignorado; atrás
+    # de N proxies vale o N-ésimo endereço a partir do fim do cabeçalho.
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", 0)),
 }
 
+# Compressão das respostas (core/middleware.py): tamanho mínimo do corpo em
+# bytes, nível de compressão (1-9) e quantidade de corpos comprimidos de
+# respostas com ETag mantidos em memória para reutilização.
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", 6))
+COMPRESSION_CACHE_ENTRIES = int(os.getenv("COMPRESSION_CACHE_ENTRIES", 256))
+
+# Controle de admissão (core/admission.py): requisições atendidas ao mesmo
+# tempo por processo (0 desativa), lugares na fila de espera, espera máxima na
+# fila (milissegundos), lugares reservados às classes "high" e "normal" e o
+# Retry-After (segundos) das respostas 503.
+ADMISSION_MAX_CONCURRENCY = int(os.getenv("ADMISSION_MAX_CONCURRENCY", 16))
+ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", 32))
+ADMISSION_QUEUE_TIMEOUT = int(os.getenv("ADMISSION_QUEUE_TIMEOUT", 500))
+ADMISSION_RESERVED_SLOTS = int(os.getenv("ADMISSION_RESERVED_SLOTS", 4))
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", 1))
+
+# Classe de prioridade por nome de rota; as demais rotas são "normal".
+ADMISSION_ROUTE_PRIORITIES = {
+    "component-detail": "high",
+    "component-stock": "high",
+    "component-stock-consumption": "high",
+    "component-stock-movements": "high",
+    "dashboard": "low",
+    "batch": "low",
+    "user-bulk-import": "low",
+}
+
+# Rotas que não passam pelo controle de admissão.
+ADMISSION_EXEMPT_ROUTES = {"healthz", "readyz", "metrics", "dashboard-events"}
+
+# Onde os baldes de limitação ficam: "local" (memória do processo) ou
+# "cache" (cache do Django, compartilhado entre workers quando REDIS_URL é usado).
+THROTTLE_STORE = os.getenv("THROTTLE_STORE", "local")
+THROTTLE_MAX_KEYS = int(os.getenv("THROTTLE_MAX_KEYS", 100000))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
@@ -184,8 +444,15 @@ SWAGGER_SETTINGS = {
         "Bearer": {"type": "apiKey", "name": "Authorization", "in": "header"}
     },
     "USE_SESSION_AUTH": False,
+    # A interface lê o schema pré-gerado (ver core/schema.py).
+    "SPEC_URL": "openapi-schema",
 }
 
+# Arquivo do schema OpenAPI gerado pelo comando generate_schema.
+OPENAPI_SCHEMA_FILE = os.getenv(
+    "OPENAPI_SCHEMA_FILE", os.path.join(STATIC_ROOT, "openapi.json")
+)
+
 
 # EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
@@ -0,0 +1,74 @@
+import threading
+from importlib import import_module
+
+# Decoradores de documentação (drf_yasg) sem custo na inicialização.
+# As views usam "swagger_auto_schema" e "openapi" deste módulo em vez dos do
+# drf_yasg. O decorador apenas registra os argumentos, e "openapi" devolve
+# objetos adiados (openapi.Parameter(...), openapi.IN_QUERY...). O drf_yasg só é
+# importado quando o schema é gerado: materialize() aplica o decorador real
+# com os objetos já construídos. Assim os workers em produção, que servem o
+# schema pré-gerado, não importam o drf_yasg.
+
+_registry = []
+_lock = threading.Lock()
+_materialized = False
+
+
+class Deferred:
+    def __init__(self, name, args=None, kwargs=None):
+        self._name = name
+        self._args = args
+        self._kwargs = kwargs
+
+    def __call__(self, *args, **kwargs):
+        return Deferred(self._name, args, kwargs)
+
+    def resolve(self):
+        value = getattr(import_module("drf_yasg.openapi"), self._name)
+        if self._args is None and self._kwargs is None:
+            return value
+        return value(*resolve(self._args or ()), **resolve(self._kwargs or {}))
+
+
+class DeferredModule:
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return Deferred(name)
+
+
+openapi = DeferredModule()
+
+
+def resolve(value):
+    if isinstance(value, Deferred):
+        return value.resolve()
+    if isinstance(value, dict):
+        return {resolve(key): resolve(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(resolve(item) for item in value)
+    return value
+
+
+def swagger_auto_schema(**kwargs):
+    def decorator(view_method):
+        _registry.append((view_method, kwargs))
+        return view_method
+
+    return decorator
+
+
+# Aplica o swagger_auto_schema do drf_yasg a todas as views registradas.
+# Deve ser chamada antes de gerar o schema; chamadas seguintes não fazem nada.
+
+
+def materialize():
+    global _materialized
+    with _lock:
+        if _materialized:
+            return
+        from drf_yasg.utils import swagger_auto_schema as real_swagger_auto_schema
+
+        for view_method, kwargs in _registry:
+            real_swagger_auto_schema(**resolve(kwargs))(view_method)
+        _materialized = True
@@ -0,0 +1,201 @@
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from .admission import PRIORITIES, AdmissionController
+from .throttling import LocalBucketStore, parse_rate
+
+HIGH, NORMAL, LOW = PRIORITIES["high"], PRIORITIES["normal"], PRIORITIES["low"]
+
+
+class TokenBucketTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch("core.throttling.time.monotonic", return_value=1000.0)
+        self.clock = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.store = LocalBucketStore(max_keys=10)
+
+    def advance(self, seconds):
+        self.clock.return_value += seconds
+
+    def consume(self, key="login:ip:1", capacity=3, refill_rate=1.0):
+        return self.store.consume(key, capacity, refill_rate)
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("10/min"), (10, 60))
+        self.assertEqual(parse_rate("5/hour"), (5, 3600))
+        self.assertEqual(parse_rate("2/s"), (2, 1))
+
+    def test_burst_up_to_capacity_then_rejects(self):
+        results = [self.consume()[0] for _ in range(4)]
+
+        self.assertEqual(results, [True, True, True, False])
+
+    def test_rejection_reports_wait_until_next_token(self):
+        for _ in range(3):
+            self.consume(refill_rate=0.5)
+
+        allowed, wait = self.consume(refill_rate=0.5)
+
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 2.0)
+
+    def test_tokens_refill_over_time(self):
+        for _ in range(3):
+            self.consume()
+        self.advance(1)
+
+        self.assertTrue(self.consume()[0])
+        self.assertFalse(self.consume()[0])
+
+    def test_refill_is_capped_at_capacity(self):
+        self.consume()
+        self.advance(3600)
+
+        results = [self.consume()[0] for _ in range(4)]
+
+        self.assertEqual(results, [True, True, True, False])
+
+    def test_clients_have_separate_buckets(self):
+        for _ in range(3):
+            self.consume(key="login:ip:1")
+
+        self.assertFalse(self.consume(key="login:ip:1")[0])
+        self.assertTrue(self.consume(key="login:ip:2")[0])
+
+    def test_least_recently_used_buckets_are_evicted(self):
+        store = LocalBucketStore(max_keys=2)
+        store.consume("a", 1, 1.0)
+        store.consume("b", 1, 1.0)
+        store.consume("a", 1, 1.0)
+        store.consume("c", 1, 1.0)
+
+        # "a" foi usado depois de "b" e continua sem fichas; "b" foi descartado
+        # e volta cheio.
+        self.assertFalse(store.consume("a", 1, 1.0)[0])
+        self.assertTrue(store.consume("b", 1, 1.0)[0])
+
+
+class AdmissionControllerTests(SimpleTestCase):
+    def make(self, limit=1, queue_size=4, reserved=0):
+        return AdmissionController(limit=limit, queue_size=queue_size, reserved=reserved)
+
+    # Chama acquire() em uma thread e espera a requisição entrar na fila.
+
+    def queue(self, controller, priority, results, name, timeout=5):
+        before = {id(entry[2]) for entry in controller._waiters}
+
+        def queued():
+            return any(id(entry[2]) not in before for entry in controller._waiters)
+
+        def run():
+            results[name] = controller.acquire(priority, timeout)
+            if results[name][0]:
+                results.setdefault("order", []).append(name)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        deadline = time.monotonic() + 5
+        while not queued() and time.monotonic() < deadline:
+            time.sleep(0.001)
+        return thread
+
+    def test_admits_up_to_limit(self):
+        controller = self.make(limit=2)
+
+        self.assertEqual(controller.acquire(NORMAL, 0), (True, None))
+        self.assertEqual(controller.acquire(NORMAL, 0), (True, None))
+        self.assertEqual(controller.in_flight, 2)
+
+    def test_times_out_when_no_slot_frees(self):
+        controller = self.make()
+        controller.acquire(NORMAL, 0)
+
+        self.assertEqual(controller.acquire(NORMAL, 0.01), (False, "timeout"))
+        self.assertEqual(controller._waiters, [])
+
+    def test_rejects_when_queue_is_full(self):
+        controller = self.make(queue_size=0)
+        controller.acquire(NORMAL, 0)
+
+        self.assertEqual(controller.acquire(HIGH, 1), (False, "queue_full"))
+
+    def test_higher_priority_is_admitted_first(self):
+        controller = self.make()
+        controller.acquire(NORMAL, 0)
+        results = {}
+        threads = [
+            self.queue(controller, LOW, results, "low"),
+            self.queue(controller, NORMAL, results, "normal"),
+            self.queue(controller, HIGH, results, "high"),
+        ]
+
+        for _ in range(3):
+            controller.release()
+            deadline = time.monotonic() + 5
+            admitted = len(results.get("order", []))
+            while len(results.get("order", [])) == admitted and time.monotonic() < deadline:
+                time.sleep(0.001)
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results["order"], ["high", "normal", "low"])
+
+    def test_same_priority_is_first_come_first_served(self):
+        controller = self.make()
+        controller.acquire(NORMAL, 0)
+        results = {}
+        first = self.queue(controller, NORMAL, results, "first")
+        second = self.queue(controller, NORMAL, results, "second")
+
+        controller.release()
+        first.join()
+        controller.release()
+        second.join()
+
+        self.assertEqual(results["order"], ["first", "second"])
+
+    def test_full_queue_evicts_lower_priority(self):
+        controller = self.make(queue_size=1)
+        controller.acquire(NORMAL, 0)
+        results = {}
+        low = self.queue(controller, LOW, results, "low")
+        high = self.queue(controller, HIGH, results, "high")
+        low.join()
+
+        self.assertEqual(results["low"], (False, "evicted"))
+        controller.release()
+        high.join()
+        self.assertEqual(results["high"], (True, None))
+
+    def test_full_queue_keeps_equal_priority(self):
+        controller = self.make(queue_size=1)
+        controller.acquire(NORMAL, 0)
+        results = {}
+        queued = self.queue(controller, NORMAL, results, "queued")
+
+        self.assertEqual(controller.acquire(NORMAL, 1), (False, "queue_full"))
+        controller.release()
+        queued.join()
+        self.assertEqual(results["queued"], (True, None))
+
+    def test_reserved_slots_are_kept_for_other_classes(self):
+        controller = self.make(limit=2, reserved=1)
+
+        self.assertEqual(controller.acquire(LOW, 0), (True, None))
+        self.assertEqual(controller.acquire(LOW, 0.01), (False, "timeout"))
+        self.assertEqual(controller.acquire(HIGH, 0), (True, None))
+
+    def test_release_admits_waiter(self):
+        controller = self.make()
+        controller.acquire(NORMAL, 0)
+        results = {}
+        waiter = self.queue(controller, NORMAL, results, "waiter")
+
+        controller.release()
+        waiter.join()
+
+        self.assertEqual(results["waiter"], (True, None))
+        self.assertEqual(controller.in_flight, 1)
@@ -0,0 +1,127 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from .metrics import THROTTLE_REJECTIONS
+
+# Limitação de requisições por token bucket.
+# Cada cliente (usuário autenticado ou IP) tem um balde por escopo com
+# capacidade N fichas, reabastecido continuamente à taxa N/período, conforme
+# REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"] (ex.: "10/min"). Rajadas de até N
+# requisições passam; acima disso o cliente recebe 429 com Retry-After.
+#
+# Os baldes ficam por padrão na memória do processo (THROTTLE_STORE = "local").
+# Com THROTTLE_STORE = "cache" eles são guardados no cache do Django, que pode
+# ser compartilhado entre workers (ver REDIS_URL).
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    count, period = rate.split("/")
+    return int(count), PERIODS[period[0]]
+
+
+def refill(state, capacity, refill_rate, now):
+    if state is None:
+        return float(capacity)
+    tokens, updated_at = state
+    return min(capacity, tokens + (now - updated_at) * refill_rate)
+
+
+class LocalBucketStore:
+    # Baldes guardados na memória do processo, em ordem de uso (LRU).
+    # Acima de max_keys baldes, os usados há mais tempo são descartados; um
+    # balde descartado volta cheio, o que no pior caso aceita algumas requisições
+    # a mais de um cliente inativo. O lock protege a reordenação do dicionário
+    # entre as threads.
+
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_rate):
+        with self._lock:
+            now = time.monotonic()
+            tokens = refill(self._buckets.get(key), capacity, refill_rate, now)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0 if allowed else (1 - tokens) / refill_rate
+
+
+class CacheBucketStore:
+    # Baldes guardados no cache do Django, compartilhados entre processos.
+    # A leitura e a escrita não são atômicas; como no armazenamento local,
+    # corridas podem aceitar uma requisição a mais, nunca recusar indevidamente.
+
+    prefix = "throttle"
+
+    def consume(self, key, capacity, refill_rate):
+        now = time.time()
+        cache_key = f"{self.prefix}:{key}"
+        tokens = refill(cache.get(cache_key), capacity, refill_rate, now)
+        timeout = math.ceil(capacity / refill_rate)
+        if tokens < 1:
+            cache.set(cache_key, (tokens, now), timeout)
+            return False, (1 - tokens) / refill_rate
+        cache.set(cache_key, (tokens - 1, now), timeout)
+        return True, 0
+
+
+def get_store():
+    if settings.THROTTLE_STORE == "cache":
+        return CacheBucketStore()
+    return LocalBucketStore(max_keys=settings.THROTTLE_MAX_KEYS)
+
+
+store = get_store()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    scope = None
+
+    def get_cache_key(self, request):
+        if request.user and request.user.is_authenticated:
+            ident = f"user:{request.user.pk}"
+        else:
+            ident = f"ip:{self.get_ident(request)}"
+        return f"{self.scope}:{ident}"
+
+    def allow_request(self, request, view):
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        if not rate:
+            return True
+        capacity, period = parse_rate(rate)
+        allowed, self._wait = store.consume(
+            self.get_cache_key(request), capacity, capacity / period
+        )
+        if not allowed:
+            THROTTLE_REJECTIONS.labels(self.scope).inc()
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+
+class LoginRateThrottle(TokenBucketThrottle):
+    scope = "login"
+
+
+class SearchRateThrottle(TokenBucketThrottle):
+    scope = "search"
+
+
+class PasswordResetRateThrottle(TokenBucketThrottle):
+    scope = "password_reset"
@@ -1,32 +1,24 @@
 from django.contrib import admin
 from django.urls import path, include
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
 from django.conf import settings
 from django.conf.urls.static import static
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Eletro Rápida",
-        default_version="v1",
-        description="Documentação ",
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-)
+from .health import healthz, readyz
+from .metrics import metrics
+from .schema import openapi_schema, swagger_ui
 
 urlpatterns = [
-    path(
-        "swagger/",
-        schema_view.with_ui("swagger", cache_timeout=0),
-        name="schema-swagger-ui",
-    ),
+    path("swagger/", swagger_ui, name="schema-swagger-ui"),
+    path("swagger.json", openapi_schema, name="openapi-schema"),
+    path("healthz", healthz, name="healthz"),
+    path("readyz", readyz, name="readyz"),
+    path("metrics", metrics, name="metrics"),
     path("admin/", admin.site.urls),
     path("auth/", include("authentication.urls")),
     path("users/", include("users.urls")),
     path("components/", include("components.urls")),
     path("dashboard/", include("dashboard.urls")),
+    path("batch/", include("batch.urls")),
 ]
 
 if settings.DEBUG:
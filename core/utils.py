@@ -0,0 +1,24 @@
+from datetime import datetime, time, timezone as dt_timezone
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+# Converte o valor de um parâmetro de data/hora da query string.
+# Aceita data/hora ou apenas data ISO 8601; valores sem fuso são tratados como UTC.
+# Retorna None quando o valor é inválido, inclusive datas bem formadas que não
+# existem (ex.: 2024-02-30).
+
+
+def parse_datetime_param(value):
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            date = parse_date(value)
+            if date is None:
+                return None
+            parsed = datetime.combine(date, time.min)
+    except ValueError:
+        return None
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, dt_timezone.utc)
+    return parsed
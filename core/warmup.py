@@ -0,0 +1,161 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, connections
+from django.db.models import Count, F
+from django.urls import resolve
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Aquecimento do processo após o deploy.
+# Executa as consultas mais comuns para abrir a conexão com o banco, carregar
+# os módulos das views e trazer para a memória (do PostgreSQL e do cache do
+# Django) os dados que as primeiras requisições vão pedir:
+# - buscas mais frequentes do SearchLog, já gravadas no cache de buscas
+# - componentes com estoque crítico e rankings do dashboard
+# - primeiras páginas da listagem de componentes, com as facetas
+#
+# Com WARMUP_ON_BOOT, o wsgi/asgi inicia o aquecimento em uma thread assim que
+# o processo sobe, e o /readyz responde 503 até que ele termine.
+
+state = {
+    "started_at": None,
+    "finished_at": None,
+    "duration_ms": None,
+    "steps": {},
+    "error": None,
+}
+finished = threading.Event()
+_started = threading.Lock()
+
+
+def database_latency_ms():
+    started = time.perf_counter()
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+WARM_PATHS = ("/components/", "/components/search/", "/dashboard/dashboard/", "/users/")
+
+
+def warm_urls():
+    for path in WARM_PATHS:
+        resolve(path)
+    return len(WARM_PATHS)
+
+
+def warm_searches():
+    from components.cache import normalize_search_term
+    from components.search import search_components
+    from logs.models import SearchLog
+
+    since = timezone.now() - settings.WARMUP_SEARCH_WINDOW
+    terms = (
+        SearchLog.objects.filter(created_at__gte=since, found=True)
+        .values("term_id")
+        .annotate(count=Count("id"), search_term=F("term__query"))
+        .order_by("-count")[: settings.WARMUP_SEARCH_TERMS]
+    )
+    warmed = {normalize_search_term(row["search_term"]) for row in terms}
+    for term in warmed:
+        search_components(term)
+    return len(warmed)
+
+
+def warm_dashboard():
+    from components.models import Component
+    from dashboard.models import SearchTermCount
+    from dashboard.views import top_terms
+
+    alerts = list(
+        Component.objects.filter(quantity__lte=settings.STOCK_ALERT_THRESHOLD).values(
+            "id", "name", "quantity"
+        )
+    )
+    for found in (True, False):
+        list(
+            top_terms(
+                SearchTermCount.objects.filter(found=found), settings.DASHBOARD_TOP_DEFAULT
+            )
+        )
+    return len(alerts)
+
+
+def warm_component_list():
+    from components.filters import facet_counts
+    from components.models import Component
+    from components.serializers import ComponentSerializer
+
+    page_size = settings.API_PAGE_SIZE
+    components = Component.objects.order_by("id")
+    Component.objects.count()
+    facet_counts(Component.objects.all(), {})
+    rows = 0
+    for page in range(settings.WARMUP_LIST_PAGES):
+        offset = page * page_size
+        page_components = components[offset : offset + page_size]
+        rows += len(ComponentSerializer(page_components, many=True).data)
+    return rows
+
+
+STEPS = (
+    ("urls", warm_urls),
+    ("searches", warm_searches),
+    ("dashboard", warm_dashboard),
+    ("component_list", warm_component_list),
+)
+
+
+# Executa todas as etapas. Falhas são registradas no estado e no log, mas não
+# impedem as demais etapas nem deixam o processo eternamente "não pronto".
+
+
+def run_warmup():
+    state["started_at"] = timezone.now().isoformat()
+    started = time.perf_counter()
+    try:
+        state["steps"]["database_ms"] = database_latency_ms()
+        for name, step in STEPS:
+            step_started = time.perf_counter()
+            try:
+                count = step()
+            except Exception as e:
+                logger.exception("Falha no aquecimento (%s)", name)
+                state["error"] = f"{name}: {e}"
+                continue
+            state["steps"][name] = {
+                "items": count,
+                "ms": round((time.perf_counter() - step_started) * 1000, 3),
+            }
+    except Exception as e:
+        logger.exception("Falha no aquecimento")
+        state["error"] = str(e)
+    finally:
+        state["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        state["finished_at"] = timezone.now().isoformat()
+        finished.set()
+    return state
+
+
+def _run_in_thread():
+    try:
+        run_warmup()
+    finally:
+        connections.close_all()
+
+
+# Inicia o aquecimento em segundo plano, uma única vez por processo.
+
+
+def start_warmup():
+    if not settings.WARMUP_ON_BOOT:
+        finished.set()
+        return
+    if not _started.acquire(blocking=False):
+        return
+    threading.Thread(target=_run_in_thread, name="warmup", daemon=True).start()
@@ -0,0 +1,205 @@
+import itertools
+import json
+import logging
+import select
+import threading
+import time
+import uuid
+from collections import deque
+
+from django.conf import settings
+from django.db import connection, connections
+
+logger = logging.getLogger(__name__)
+
+# Distribuição de eventos do dashboard em tempo real (Server-Sent Events).
+# Os eventos (alertas de estoque e buscas registradas) são publicados com
+# NOTIFY no PostgreSQL, o único recurso compartilhado entre o servidor e os
+# workers, de modo que um cliente conectado a qualquer processo recebe os
+# eventos publicados por todos eles. Em cada processo com clientes conectados,
+# uma thread faz LISTEN no canal e repassa os eventos a todos os clientes, que
+# ficam aguardando na mesma variável de condição. Sem eventos, nenhum cliente
+# consulta o banco: apenas um heartbeat é enviado periodicamente.
+# Os últimos eventos ficam em um buffer circular para permitir que o cliente
+# retome a conexão a partir do cabeçalho Last-Event-ID.
+
+CHANNEL = "dashboard_events"
+RECONNECT_DELAY = 1
+POLL_TIMEOUT = 1
+
+
+class EventBroker:
+    def __init__(self, buffer_size):
+        # Os ids são gerados por quem publica (identificador do processo e
+        # sequência local) e são os mesmos em todos os processos. Como o
+        # PostgreSQL entrega as notificações a todos na mesma ordem, o cliente
+        # pode retomar em qualquer processo que ainda tenha o evento no buffer;
+        # caso contrário recebe um evento "reset" para recarregar o dashboard.
+        self.stream_id = uuid.uuid4().hex[:12]
+        self._published = itertools.count(1)
+        self._events = deque(maxlen=buffer_size)
+        self._positions = {}
+        self._sequence = itertools.count(1)
+        self._condition = threading.Condition()
+        self._last_sequence = 0
+        self._listener = None
+        self._listener_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    # Publica um evento para todos os processos. Deve ser chamado depois do
+    # commit (transaction.on_commit): fora de uma transação o NOTIFY é entregue
+    # imediatamente. Uma falha é apenas registrada, para não afetar a requisição
+    # que gerou o evento.
+
+    def publish(self, event_type, data):
+        event_id = f"{self.stream_id}-{next(self._published)}"
+        payload = json.dumps(
+            {"id": event_id, "type": event_type, "data": data},
+            separators=(",", ":"),
+            default=str,
+        )
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_notify(%s, %s)", [CHANNEL, payload])
+        except Exception:
+            logger.exception("Falha ao publicar o evento do dashboard")
+
+    def _append(self, event_id, event_type, data):
+        with self._condition:
+            self._last_sequence = next(self._sequence)
+            if len(self._events) == self._events.maxlen:
+                self._positions.pop(self._events[0][1], None)
+            self._events.append((self._last_sequence, event_id, event_type, data))
+            if event_id:
+                self._positions[event_id] = self._last_sequence
+            self._condition.notify_all()
+
+    # Thread que escuta o canal com uma conexão própria (fora do ciclo de
+    # requisição do Django). Se a conexão cair, eventos podem ter sido perdidos:
+    # o buffer é descartado e os clientes recebem "reset".
+
+    def ensure_listening(self):
+        with self._listener_lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(
+                    target=self._listen, name="dashboard-events", daemon=True
+                )
+                self._listener.start()
+
+    def close(self):
+        self._stop.set()
+        with self._listener_lock:
+            if self._listener is not None:
+                self._listener.join()
+                self._listener = None
+
+    def _listen(self):
+        reconnecting = False
+        while not self._stop.is_set():
+            try:
+                wrapper = connections["default"]
+                conn = wrapper.get_new_connection(wrapper.get_connection_params())
+                try:
+                    conn.autocommit = True
+                    with conn.cursor() as cursor:
+                        cursor.execute(f"LISTEN {CHANNEL}")
+                    if reconnecting:
+                        self._reset()
+                    reconnecting = True
+                    self._receive(conn)
+                finally:
+                    conn.close()
+            except Exception:
+                logger.exception("Falha ao escutar os eventos do dashboard")
+            self._stop.wait(RECONNECT_DELAY)
+
+    def _receive(self, conn):
+        while not self._stop.is_set():
+            readable, _, _ = select.select([conn], [], [], POLL_TIMEOUT)
+            if not readable:
+                continue
+            conn.poll()
+            while conn.notifies:
+                notification = conn.notifies.pop(0)
+                event = json.loads(notification.payload)
+                self._append(event["id"], event["type"], event["data"])
+
+    def _reset(self):
+        with self._condition:
+            self._events.clear()
+            self._positions.clear()
+        self._append("", "reset", {})
+
+    def parse_id(self, event_id):
+        with self._condition:
+            return self._positions.get(event_id or "")
+
+    def latest(self):
+        with self._condition:
+            if not self._events:
+                return self._last_sequence, ""
+            return self._last_sequence, self._events[-1][1]
+
+    # Retorna os eventos posteriores à sequência informada.
+    # Retorna None quando a sequência já saiu do buffer e não pode ser retomada.
+
+    def events_after(self, sequence):
+        with self._condition:
+            if sequence > self._last_sequence:
+                return None
+            if self._events and sequence < self._events[0][0] - 1:
+                return None
+            return [event for event in self._events if event[0] > sequence]
+
+    def wait(self, sequence, timeout):
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._last_sequence > sequence, timeout=timeout
+            )
+            return self._last_sequence
+
+    # Gera o corpo da resposta SSE para um cliente.
+    # A conexão é encerrada após EVENTS_MAX_DURATION segundos; o navegador
+    # reconecta sozinho enviando o Last-Event-ID e continua de onde parou.
+
+    def stream(self, last_event_id=None):
+        self.ensure_listening()
+        yield f"retry: {settings.DASHBOARD_EVENTS_RETRY_MS}\n\n"
+
+        sequence = self.parse_id(last_event_id) if last_event_id else None
+        backlog = self.events_after(sequence) if sequence is not None else None
+        if backlog is None:
+            sequence, event_id = self.latest()
+            event_type = "reset" if last_event_id else "ready"
+            yield format_event(event_id, event_type, {})
+            backlog = []
+
+        for sequence, event_id, event_type, data in backlog:
+            yield format_event(event_id, event_type, data)
+
+        deadline = time.monotonic() + settings.DASHBOARD_EVENTS_MAX_DURATION
+        while time.monotonic() < deadline:
+            latest = self.wait(sequence, settings.DASHBOARD_EVENTS_HEARTBEAT)
+            if latest == sequence:
+                yield ": heartbeat\n\n"
+                continue
+            events = self.events_after(sequence)
+            if events is None:
+                # Cliente lento demais: o buffer já descartou eventos não enviados.
+                sequence, event_id = self.latest()
+                yield format_event(event_id, "reset", {})
+                continue
+            for sequence, event_id, event_type, data in events:
+                yield format_event(event_id, event_type, data)
+
+
+# Um id vazio apaga o Last-Event-ID do navegador (eventos sem posição no buffer,
+# como "ready" antes de qualquer evento), e a reconexão começa do zero.
+
+
+def format_event(event_id, event_type, data):
+    payload = json.dumps(data, separators=(",", ":"), default=str)
+    return f"id: {event_id}\nevent: {event_type}\ndata: {payload}\n\n"
+
+
+broker = EventBroker(buffer_size=settings.DASHBOARD_EVENTS_BUFFER)
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from dashboard.models import SearchTermCount
+from logs.models import SearchLog
+
+# Reconstrói a tabela de contagens por hora a partir do SearchLog.
+# Útil para corrigir divergências (por exemplo, contadores em memória que
+# não chegaram a ser persistidos porque o processo foi encerrado à força).
+
+
+class Command(BaseCommand):
+    help = "Reconstrói as contagens de termos de busca por hora a partir do SearchLog."
+
+    def handle(self, *args, **options):
+        counts_table = SearchTermCount._meta.db_table
+        logs_table = SearchLog._meta.db_table
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(f"DELETE FROM {counts_table}")
+                cursor.execute(
+                    f"INSERT INTO {counts_table} (bucket, term_id, found, count) "
+                    "SELECT date_trunc('hour', created_at), term_id, found, COUNT(*) "
+                    f"FROM {logs_table} GROUP BY 1, 2, 3"
+                )
+                rows = cursor.rowcount
+        self.stdout.write(self.style.SUCCESS(f"{rows} contagens reconstruídas."))
@@ -0,0 +1,5 @@
+class DashboardMessages:
+    INVALID_SINCE = "O parâmetro 'since' deve ser uma data ou data/hora ISO 8601."
+    INVALID_UNTIL = "O parâmetro 'until' deve ser uma data ou data/hora ISO 8601."
+    INVALID_WINDOW = "O parâmetro 'since' deve ser anterior a 'until'."
+    INVALID_TOP = "O parâmetro 'top' deve ser um número inteiro positivo."
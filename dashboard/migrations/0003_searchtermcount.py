@@ -0,0 +1,37 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0002_delete_searchlog'),
+        ('logs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTermCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField(help_text='Início da hora a que a contagem se refere.')),
+                ('search_term', models.CharField(max_length=255)),
+                ('found', models.BooleanField(help_text='Indica se as buscas contadas retornaram ao menos um resultado.')),
+                ('count', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['found', 'bucket'], name='dashboard_s_found_252765_idx')],
+                'constraints': [models.UniqueConstraint(fields=('bucket', 'found', 'search_term'), name='dashboard_searchtermcount_unique')],
+            },
+        ),
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO dashboard_searchtermcount (bucket, search_term, found, count)
+                SELECT date_trunc('hour', created_at), search_term, found, COUNT(*)
+                FROM logs_searchlog
+                GROUP BY 1, 2, 3
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
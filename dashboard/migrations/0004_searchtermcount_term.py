@@ -0,0 +1,49 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# As contagens por hora são derivadas do SearchLog. Como a normalização junta
+# termos que antes eram contados separadamente, a tabela é esvaziada e
+# reconstruída a partir do SearchLog já ligado ao dicionário de termos.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0003_searchtermcount'),
+        ('logs', '0005_remove_searchlog_search_term'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="DELETE FROM dashboard_searchtermcount",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RemoveConstraint(
+            model_name='searchtermcount',
+            name='dashboard_searchtermcount_unique',
+        ),
+        migrations.RemoveField(
+            model_name='searchtermcount',
+            name='search_term',
+        ),
+        migrations.AddField(
+            model_name='searchtermcount',
+            name='term',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='logs.searchterm'),
+            preserve_default=False,
+        ),
+        migrations.AddConstraint(
+            model_name='searchtermcount',
+            constraint=models.UniqueConstraint(fields=('bucket', 'found', 'term'), name='dashboard_searchtermcount_unique'),
+        ),
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO dashboard_searchtermcount (bucket, term_id, found, count)
+                SELECT date_trunc('hour', created_at), term_id, found, COUNT(*)
+                FROM logs_searchlog
+                GROUP BY 1, 2, 3
+            """,
+            reverse_sql="DELETE FROM dashboard_searchtermcount",
+        ),
+    ]
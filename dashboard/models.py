@@ -1,3 +1,28 @@
 from django.db import models
 
-# Create your models here.
+from logs.models import SearchTerm
+
+
+class SearchTermCount(models.Model):
+    # Total de buscas por termo agregado por hora.
+    # Alimentado pelas contagens em memória (ver search_counts.py) e usado pelo dashboard
+    # para calcular os termos mais buscados em uma janela de tempo.
+
+    bucket = models.DateTimeField(help_text="Início da hora a que a contagem se refere.")
+    term = models.ForeignKey(SearchTerm, on_delete=models.CASCADE, related_name="+")
+    found = models.BooleanField(
+        help_text="Indica se as buscas contadas retornaram ao menos um resultado."
+    )
+    count = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["bucket", "found", "term"],
+                name="dashboard_searchtermcount_unique",
+            )
+        ]
+        indexes = [models.Index(fields=["found", "bucket"])]
+
+    def __str__(self):
+        return f"{self.bucket:%Y-%m-%d %H:00} {self.term_id} ({self.count})"
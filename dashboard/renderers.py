@@ -0,0 +1,18 @@
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+# Renderer para o content type text/event-stream.
+# O stream em si é devolvido como StreamingHttpResponse; este renderer só é
+# usado quando o DRF precisa responder com um erro (ex.: 401), que é enviado
+# como um evento "error".
+
+
+class EventStreamRenderer(BaseRenderer):
+    media_type = "text/event-stream"
+    format = "event-stream"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        payload = json.dumps(data, separators=(",", ":"), default=str)
+        return f"event: error\ndata: {payload}\n\n".encode(self.charset)
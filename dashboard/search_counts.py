@@ -0,0 +1,106 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import SearchTermCount
+
+logger = logging.getLogger(__name__)
+
+# Contagem de termos de busca em memória para o dashboard.
+# Cada evento de busca incrementa um contador por (hora, termo, encontrado),
+# com o termo identificado pelo id do dicionário de termos (logs.SearchTerm).
+# Periodicamente os contadores acumulados são somados na tabela SearchTermCount,
+# que guarda um total por termo e por hora. Assim o dashboard responde o
+# top-k de qualquer janela lendo apenas essa tabela, sem varrer o SearchLog.
+#
+# As contagens são exatas, e não um sketch aproximado (Space-Saving,
+# Count-Min): a memória já é limitada pelo flush ao atingir "capacity"
+# contadores, e os totais são somados no banco, onde uma estimativa não pode
+# ser corrigida depois. Cada processo mantém os próprios contadores, então o
+# dashboard só inclui as buscas de outros processos após o flush deles.
+
+
+class SearchTermAggregator:
+    # Agrupa os eventos de busca do processo e os persiste em lote.
+    # O flush acontece quando o intervalo configurado expira, quando há
+    # "capacity" contadores distintos em memória, quando o dashboard é
+    # consultado e na finalização do processo. As contagens são exatas: os
+    # totais gravados são somados no banco, então nada pode ser estimado.
+
+    def __init__(self, capacity, flush_interval):
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self._counts = Counter()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def record(self, term_id, found, when=None):
+        key = (truncate_to_hour(when or timezone.now()), term_id, found)
+        with self._lock:
+            self._counts[key] += 1
+            due = (
+                len(self._counts) >= self.capacity
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+            self._last_flush = time.monotonic()
+        if not counts:
+            return
+        rows = [
+            (bucket, term, found, count)
+            for (bucket, term, found), count in counts.items()
+        ]
+        try:
+            persist_counts(rows)
+        except Exception:
+            # Em caso de falha os contadores voltam para a memória e
+            # serão persistidos no próximo flush. O erro só é registrado:
+            # o flush pode acontecer durante uma busca, que não deve falhar.
+            logger.exception("Falha ao gravar as contagens de buscas")
+            with self._lock:
+                self._counts.update(counts)
+
+
+def truncate_to_hour(value):
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+# Soma os contadores na tabela de agregação com um único upsert.
+# Os valores são incrementados (e não sobrescritos) em caso de conflito,
+# o que permite que vários processos façam flush ao mesmo tempo.
+# As linhas são ordenadas para que processos concorrentes travem as
+# mesmas chaves na mesma ordem e não entrem em deadlock.
+
+
+def persist_counts(rows):
+    rows = sorted(rows)
+    table = SearchTermCount._meta.db_table
+    sql = (
+        f"INSERT INTO {table} (bucket, term_id, found, count) "
+        "VALUES (%s, %s, %s, %s) "
+        "ON CONFLICT (bucket, found, term_id) "
+        f"DO UPDATE SET count = {table}.count + EXCLUDED.count"
+    )
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+
+
+aggregator = SearchTermAggregator(
+    capacity=settings.DASHBOARD_COUNTS_CAPACITY,
+    flush_interval=settings.DASHBOARD_COUNTS_FLUSH_INTERVAL,
+)
+
+
+atexit.register(aggregator.flush)
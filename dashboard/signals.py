@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from components.models import Component
+from logs.models import SearchLog
+from .events import broker
+from .search_counts import aggregator
+
+# Alimenta as contagens de termos mais buscados a cada busca registrada
+# e avisa os clientes conectados ao stream do dashboard, ambos só depois do
+# commit, para que buscas desfeitas não sejam contadas.
+
+
+@receiver(post_save, sender=SearchLog)
+def count_search(sender, instance, created, **kwargs):
+    if created:
+        term_id, found, when = instance.term_id, instance.found, instance.created_at
+        payload = {"search_term": instance.term.term, "found": found}
+
+        def on_commit():
+            aggregator.record(term_id, found, when)
+            broker.publish("search", payload)
+
+        transaction.on_commit(on_commit)
+
+
+# Publica um evento quando a quantidade de um componente entra ou sai
+# da faixa de estoque crítico (STOCK_ALERT_THRESHOLD). Um componente em alerta
+# que é excluído (tombstone) também sai da lista de alertas.
+
+
+@receiver(post_save, sender=Component)
+def publish_stock_alert(sender, instance, created, **kwargs):
+    threshold = settings.STOCK_ALERT_THRESHOLD
+    previous = getattr(instance, "_loaded_quantity", None)
+    instance._loaded_quantity = instance.quantity
+
+    was_alert = previous is not None and previous <= threshold
+    is_alert = instance.quantity <= threshold
+    if instance.deleted_at is not None:
+        was_alert, is_alert = is_alert, False
+    if was_alert == is_alert:
+        return
+
+    payload = {
+        "id": instance.pk,
+        "name": instance.name,
+        "quantity": instance.quantity,
+        "alert": is_alert,
+    }
+    transaction.on_commit(lambda: broker.publish("stock_alert", payload))
+
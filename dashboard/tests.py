@@ -1,3 +1,58 @@
-from django.test import TestCase
+import time
 
-# Create your tests here.
+from django.test import TransactionTestCase
+
+from .events import EventBroker
+
+
+class EventBrokerTests(TransactionTestCase):
+    def wait_for(self, condition, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return condition()
+
+    def listening(self, broker):
+        # Publica até o listener estar conectado (o LISTEN é assíncrono).
+        self.addCleanup(broker.close)
+        broker.ensure_listening()
+        self.assertTrue(
+            self.wait_for(lambda: broker.publish("ping", {}) or broker.latest()[0] > 0)
+        )
+
+    def test_events_reach_other_processes(self):
+        publisher = EventBroker(buffer_size=10)
+        subscriber = EventBroker(buffer_size=10)
+        self.listening(subscriber)
+
+        publisher.publish("stock_alert", {"id": 1, "alert": True})
+
+        self.assertTrue(
+            self.wait_for(lambda: subscriber.events_after(0)[-1][2] == "stock_alert")
+        )
+        _, event_id, _, data = subscriber.events_after(0)[-1]
+        self.assertTrue(event_id.startswith(publisher.stream_id))
+        self.assertEqual(data, {"id": 1, "alert": True})
+
+    def test_resume_from_event_published_elsewhere(self):
+        publisher = EventBroker(buffer_size=10)
+        subscriber = EventBroker(buffer_size=10)
+        self.listening(subscriber)
+        publisher.publish("search", {"search_term": "a"})
+        publisher.publish("search", {"search_term": "b"})
+        self.assertTrue(
+            self.wait_for(
+                lambda: subscriber.events_after(0)[-1][3] == {"search_term": "b"}
+            )
+        )
+
+        first_id = subscriber.events_after(0)[-2][1]
+        sequence = subscriber.parse_id(first_id)
+        events = subscriber.events_after(sequence)
+
+        self.assertEqual([event[3] for event in events], [{"search_term": "b"}])
+
+    def test_unknown_id_cannot_be_resumed(self):
+        broker = EventBroker(buffer_size=10)
+
+        self.assertIsNone(broker.parse_id("outro-processo-1"))
@@ -1,6 +1,7 @@
 from django.urls import path
-from .views import DashboardAPIView
+from .views import DashboardAPIView, DashboardEventsAPIView
 
 urlpatterns = [
     path("dashboard/", DashboardAPIView.as_view(), name="dashboard"),
+    path("events/", DashboardEventsAPIView.as_view(), name="dashboard-events"),
 ]
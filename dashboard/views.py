@@ -1,36 +1,118 @@
-from django.db.models import Count
+from django.conf import settings
+from django.db.models import F, Sum
+from django.http import StreamingHttpResponse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from core.swagger import openapi, swagger_auto_schema
 
-from logs.models import SearchLog
 from components.models import Component
+from core.utils import parse_datetime_param
+from .events import broker
+from .messages import DashboardMessages
+from .models import SearchTermCount
+from .renderers import EventStreamRenderer
 from .serializers import DashboardSerializer
+from .search_counts import aggregator, truncate_to_hour
+
+
+# Termos com mais buscas nas contagens informadas. O agrupamento é feito pelo id
+# do termo; o texto vem do dicionário (logs.SearchTerm) só para os "top" termos.
+
+
+def top_terms(counts, top):
+    return (
+        counts.values("term_id")
+        .annotate(count=Sum("count"), search_term=F("term__term"))
+        .order_by("-count", "search_term")[:top]
+    )
 
 
 class DashboardAPIView(APIView):
     # Retorna os dados consolidados para o dashboard:
     # - Termos de busca mais frequentes com resultados encontrados
-    # - Componentes com estoque crítico (quantidade menor ou igual a 2)
+    # - Componentes com estoque crítico (quantidade menor ou igual a STOCK_ALERT_THRESHOLD)
     # - Termos de busca que não retornaram nenhum resultado
+    # Os rankings de busca são limitados a "top" termos e podem ser restritos
+    # a uma janela de tempo com "since" e "until" (granularidade de uma hora).
+    # As contagens vêm da agregação por hora (SearchTermCount), sem varrer o SearchLog.
     # Os dados são serializados e retornados em formato JSON.
 
+    @swagger_auto_schema(
+        operation_description="Dados consolidados do dashboard.",
+        manual_parameters=[
+            openapi.Parameter(
+                "since",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="Início da janela (data ou data/hora ISO 8601)",
+            ),
+            openapi.Parameter(
+                "until",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="Fim da janela, exclusivo (data ou data/hora ISO 8601)",
+            ),
+            openapi.Parameter(
+                "top",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                description="Quantidade máxima de termos em cada ranking",
+            ),
+        ],
+        responses={200: DashboardSerializer, 400: "Parâmetros inválidos"},
+    )
     def get(self, request):
-        top_searches = (
-            SearchLog.objects.filter(found=True)
-            .values("search_term")
-            .annotate(count=Count("id"))
-            .order_by("-count")
-        )
-        alerts = Component.objects.filter(quantity__lte=2).values(
+        since = until = None
+        if request.query_params.get("since"):
+            since = parse_datetime_param(request.query_params["since"])
+            if since is None:
+                return Response(
+                    {"detail": DashboardMessages.INVALID_SINCE},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        if request.query_params.get("until"):
+            until = parse_datetime_param(request.query_params["until"])
+            if until is None:
+                return Response(
+                    {"detail": DashboardMessages.INVALID_UNTIL},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        if since and until and since >= until:
+            return Response(
+                {"detail": DashboardMessages.INVALID_WINDOW},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            top = int(request.query_params.get("top", settings.DASHBOARD_TOP_DEFAULT))
+        except ValueError:
+            top = 0
+        if top <= 0:
+            return Response(
+                {"detail": DashboardMessages.INVALID_TOP},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        top = min(top, settings.DASHBOARD_TOP_MAX)
+
+        # Persiste as buscas ainda em memória neste processo antes de consultar.
+        # As dos outros processos aparecem no próximo flush de cada um (no
+        # máximo DASHBOARD_COUNTS_FLUSH_INTERVAL segundos depois).
+        aggregator.flush()
+
+        counts = SearchTermCount.objects.all()
+        if since:
+            counts = counts.filter(bucket__gte=truncate_to_hour(since))
+        if until:
+            counts = counts.filter(bucket__lt=until)
+
+        top_searches = top_terms(counts.filter(found=True), top)
+        alerts = Component.objects.filter(
+            quantity__lte=settings.STOCK_ALERT_THRESHOLD
+        ).values(
             "id", "name", "quantity"
         )
-        missing_searches = (
-            SearchLog.objects.filter(found=False)
-            .values("search_term")
-            .annotate(count=Count("id"))
-            .order_by("-count")
-        )
+        missing_searches = top_terms(counts.filter(found=False), top)
 
         data = {
             "most_frequent_searches": list(top_searches),
@@ -41,3 +123,38 @@ class DashboardAPIView(APIView):
         serializer = DashboardSerializer(data=data)
         serializer.is_valid(raise_exception=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class DashboardEventsAPIView(APIView):
+    renderer_classes = [EventStreamRenderer]
+
+    # Stream (Server-Sent Events) com as mudanças do dashboard em tempo real:
+    # - "stock_alert": componente entrou ("alert": true) ou saiu do estoque crítico
+    # - "search": busca registrada, com o termo e se encontrou resultados
+    # - "ready"/"reset": o cliente deve carregar o dashboard completo uma vez
+    # Aceita o cabeçalho Last-Event-ID (ou o parâmetro last_event_id) para retomar
+    # a conexão sem perder eventos. Cada conexão ocupa uma thread do servidor
+    # enquanto estiver aberta.
+
+    @swagger_auto_schema(
+        operation_description="Stream de eventos do dashboard (text/event-stream).",
+        manual_parameters=[
+            openapi.Parameter(
+                "last_event_id",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="Id do último evento recebido (alternativa ao Last-Event-ID)",
+            ),
+        ],
+        responses={200: "Stream de eventos"},
+    )
+    def get(self, request):
+        last_event_id = request.headers.get(
+            "Last-Event-ID", request.query_params.get("last_event_id")
+        )
+        response = StreamingHttpResponse(
+            broker.stream(last_event_id), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
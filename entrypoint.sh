@@ -6,6 +6,12 @@ python manage.py migrate
 echo "Coletando arquivos estáticos (se houver)..."
 python manage.py collectstatic --noinput
 
+echo "Gerando o schema OpenAPI..."
+python manage.py generate_schema
+
+echo "Gerando o snapshot do catálogo..."
+python manage.py build_catalog_snapshot
+
 echo "Criando superusuário padrão (se não existir)..."
 python manage.py shell << END
 from django.contrib.auth import get_user_model
@@ -14,5 +20,19 @@ if not User.objects.filter(username='admin').exists():
     User.objects.create_superuser('admin', 'admin@example.com', 'Senai@2025')
 END
 
-echo "Iniciando o servidor Django..."
-python manage.py runserver 0.0.0.0:8000
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+    echo "Limpando as métricas da execução anterior..."
+    # O diretório pode ser um volume compartilhado com os workers: só o
+    # conteúdo é apagado. Os workers só iniciam depois (healthcheck do backend).
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+    find "$PROMETHEUS_MULTIPROC_DIR" -mindepth 1 -delete
+fi
+
+# Sem argumentos inicia o servidor Django; com argumentos (ex.: "command" do
+# docker-compose) executa o comando informado no lugar deste script.
+if [ "$#" -eq 0 ]; then
+    set -- python manage.py runserver 0.0.0.0:8000
+fi
+
+echo "Iniciando: $*"
+exec "$@"
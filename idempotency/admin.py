@@ -0,0 +1,28 @@
+from django.contrib import admin
+
+from .models import IdempotencyKey
+
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "user", "method", "path", "status_code", "key")
+    list_filter = ("method", "status_code")
+    list_select_related = ("user",)
+    search_fields = ("key",)
+    date_hierarchy = "created_at"
+    readonly_fields = (
+        "user",
+        "key",
+        "method",
+        "path",
+        "request_hash",
+        "status_code",
+        "response_body",
+        "created_at",
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
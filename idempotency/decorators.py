@@ -0,0 +1,118 @@
+import functools
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import transaction
+from django.utils import timezone
+from django.utils.datastructures import MultiValueDict
+from rest_framework import status
+from rest_framework.response import Response
+
+from .messages import IdempotencyMessages
+from .models import IdempotencyKey
+
+# Suporte ao cabeçalho Idempotency-Key nas views de criação.
+# A primeira requisição com uma chave executa a view e guarda o status e o corpo
+# da resposta. Repetições com a mesma chave e a mesma requisição recebem a
+# resposta guardada (com o cabeçalho Idempotent-Replayed), sem validar nem
+# gravar nada de novo. A mesma chave com outra requisição recebe 422.
+#
+# A linha da chave é criada e travada (SELECT ... FOR UPDATE) na mesma transação
+# em que a view é executada; uma repetição concorrente espera na trava e, quando
+# a primeira termina, encontra a resposta pronta. Respostas 5xx não são
+# guardadas: a chave é liberada para que o cliente possa tentar de novo.
+# Como a view roda dentro dessa transação, as gravações que podem falhar no
+# banco devem ficar em um transaction.atomic() próprio (savepoint); assim um
+# erro não invalida a transação e a view ainda consegue registrar o erro.
+# As chaves valem por IDEMPOTENCY_KEY_TTL e são removidas pelo comando
+# prune_idempotency_keys.
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = IdempotencyKey._meta.get_field("key").max_length
+
+
+def _canonical(value):
+    if isinstance(value, MultiValueDict):
+        return {key: [_canonical(item) for item in value.getlist(key)] for key in value}
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, UploadedFile):
+        digest = hashlib.sha256()
+        for chunk in value.chunks():
+            digest.update(chunk)
+        value.seek(0)
+        return {"name": value.name, "size": value.size, "sha256": digest.hexdigest()}
+    return value
+
+
+# Hash do método, do caminho e do corpo da requisição. O corpo é usado já
+# interpretado (JSON ou multipart), com as chaves ordenadas.
+
+
+def request_hash(request):
+    body = json.dumps(_canonical(request.data), sort_keys=True, default=str)
+    content = "\n".join([request.method, request.path, body])
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def replay(record):
+    return Response(
+        record.response_body,
+        status=record.status_code,
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+def idempotent(view_method):
+    @functools.wraps(view_method)
+    def wrapper(view, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return view_method(view, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {"detail": IdempotencyMessages.KEY_TOO_LONG.format(max_length=MAX_KEY_LENGTH)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        fingerprint = request_hash(request)
+        now = timezone.now()
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "request_hash": fingerprint,
+            "status_code": None,
+            "response_body": None,
+            "created_at": now,
+        }
+        with transaction.atomic():
+            record, created = IdempotencyKey.objects.select_for_update().get_or_create(
+                user=request.user, key=key, defaults=fields
+            )
+            if not created and record.created_at < now - settings.IDEMPOTENCY_KEY_TTL:
+                # Chave expirada que ainda não foi removida: vale como nova.
+                for field, value in fields.items():
+                    setattr(record, field, value)
+            elif not created:
+                if record.request_hash != fingerprint:
+                    return Response(
+                        {"detail": IdempotencyMessages.KEY_REUSED},
+                        status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    )
+                if record.status_code is not None:
+                    return replay(record)
+
+            response = view_method(view, request, *args, **kwargs)
+            if response.status_code >= 500:
+                record.delete()
+                return response
+            record.status_code = response.status_code
+            record.response_body = response.data
+            record.save()
+        return response
+
+    return wrapper
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from idempotency.tasks import prune_expired_keys
+
+# Remove as chaves Idempotency-Key mais antigas que IDEMPOTENCY_KEY_TTL.
+# A remoção também roda periodicamente nos workers (ver JOBS_PERIODIC); as
+# chaves expiradas já são ignoradas pelas views, a remoção apenas evita que a
+# tabela cresça indefinidamente.
+
+
+class Command(BaseCommand):
+    help = "Remove as chaves de idempotência expiradas."
+
+    def handle(self, *args, **options):
+        deleted = prune_expired_keys()
+        self.stdout.write(
+            self.style.SUCCESS(f"{deleted} chave(s) de idempotência removida(s).")
+        )
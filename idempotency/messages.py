@@ -0,0 +1,6 @@
+class IdempotencyMessages:
+    KEY_TOO_LONG = "O cabeçalho Idempotency-Key aceita no máximo {max_length} caracteres."
+    KEY_REUSED = (
+        "Esta Idempotency-Key já foi usada com outra requisição. "
+        "Gere uma nova chave para cada operação."
+    )
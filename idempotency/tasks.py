@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.utils import timezone
+
+from jobs.registry import task
+from .models import IdempotencyKey
+
+# Remove as chaves Idempotency-Key mais antigas que IDEMPOTENCY_KEY_TTL.
+# Executada periodicamente pelos workers (JOBS_PERIODIC) e pelo comando
+# prune_idempotency_keys.
+
+
+@task
+def prune_expired_keys():
+    cutoff = timezone.now() - settings.IDEMPOTENCY_KEY_TTL
+    deleted, _ = IdempotencyKey.objects.filter(created_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from .decorators import idempotent
+from .models import IdempotencyKey
+
+
+class CreateView(APIView):
+    # View de criação mínima: conta as execuções e responde com o status pedido.
+
+    calls = 0
+
+    @idempotent
+    def post(self, request):
+        CreateView.calls += 1
+        status_code = request.data.get("status", status.HTTP_201_CREATED)
+        return Response({"call": CreateView.calls}, status=status_code)
+
+
+class IdempotentDecoratorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("ana", password="x")
+
+    def setUp(self):
+        CreateView.calls = 0
+        self.factory = APIRequestFactory()
+
+    def post(self, data, key="key-1"):
+        headers = {"HTTP_IDEMPOTENCY_KEY": key} if key else {}
+        request = self.factory.post("/things/", data, format="json", **headers)
+        force_authenticate(request, user=self.user)
+        return CreateView.as_view()(request)
+
+    def test_without_key_runs_every_time(self):
+        self.post({"name": "a"}, key=None)
+        self.post({"name": "a"}, key=None)
+
+        self.assertEqual(CreateView.calls, 2)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_replays_stored_response(self):
+        first = self.post({"name": "a"})
+        second = self.post({"name": "a"})
+
+        self.assertEqual(CreateView.calls, 1)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertFalse(first.has_header("Idempotent-Replayed"))
+
+    def test_same_key_with_other_request_is_rejected(self):
+        self.post({"name": "a"})
+        response = self.post({"name": "b"})
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(CreateView.calls, 1)
+
+    def test_server_error_releases_the_key(self):
+        failed = self.post({"status": 500})
+        self.assertEqual(failed.status_code, 500)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+        retried = self.post({"status": 500})
+        self.assertEqual(retried.status_code, 500)
+        self.assertEqual(CreateView.calls, 2)
+
+    def test_client_error_is_stored(self):
+        self.post({"status": 400})
+        response = self.post({"status": 400})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(CreateView.calls, 1)
+
+    def test_expired_key_counts_as_new(self):
+        self.post({"name": "a"})
+        IdempotencyKey.objects.update(
+            created_at=IdempotencyKey.objects.get().created_at
+            - settings.IDEMPOTENCY_KEY_TTL
+            - timedelta(seconds=1)
+        )
+
+        response = self.post({"name": "b"})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(response.has_header("Idempotent-Replayed"))
+        self.assertEqual(CreateView.calls, 2)
+        record = IdempotencyKey.objects.get()
+        self.assertEqual(record.response_body, {"call": 2})
+
+    def test_keys_are_per_user(self):
+        other = get_user_model().objects.create_user("bia", password="x")
+        self.post({"name": "a"})
+
+        request = self.factory.post(
+            "/things/", {"name": "a"}, format="json", HTTP_IDEMPOTENCY_KEY="key-1"
+        )
+        force_authenticate(request, user=other)
+        response = CreateView.as_view()(request)
+
+        self.assertFalse(response.has_header("Idempotent-Replayed"))
+        self.assertEqual(CreateView.calls, 2)
+
+    def test_too_long_key_is_rejected(self):
+        response = self.post({"name": "a"}, key="k" * 256)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(CreateView.calls, 0)
@@ -0,0 +1,52 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import Job, PeriodicJob
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "task", "status", "attempts", "run_at", "started_at", "finished_at")
+    list_filter = ("status", "task")
+    search_fields = ("task",)
+    ordering = ("-id",)
+    date_hierarchy = "created_at"
+    readonly_fields = (
+        "task",
+        "kwargs",
+        "status",
+        "run_at",
+        "attempts",
+        "max_attempts",
+        "last_error",
+        "worker",
+        "created_at",
+        "started_at",
+        "heartbeat_at",
+        "finished_at",
+    )
+    actions = ["requeue"]
+
+    def has_add_permission(self, request):
+        return False
+
+    # Devolve as tarefas selecionadas à fila, com as tentativas zeradas.
+
+    @admin.action(description="Executar novamente")
+    def requeue(self, request, queryset):
+        updated = queryset.exclude(status=Job.Status.RUNNING).update(
+            status=Job.Status.QUEUED,
+            run_at=timezone.now(),
+            attempts=0,
+            finished_at=None,
+        )
+        self.message_user(request, f"{updated} tarefa(s) devolvida(s) à fila.")
+
+
+@admin.register(PeriodicJob)
+class PeriodicJobAdmin(admin.ModelAdmin):
+    list_display = ("name", "next_run_at", "last_enqueued_at")
+    readonly_fields = ("name", "last_enqueued_at")
+
+    def has_add_permission(self, request):
+        return False
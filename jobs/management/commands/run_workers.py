@@ -0,0 +1,115 @@
+import multiprocessing
+import signal
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from jobs.queue import enqueue_periodic, requeue_stale, work
+
+# Executa os workers da fila de tarefas.
+# Inicia --processes processos, cada um com --threads threads consumindo a
+# fila. O processo principal não executa tarefas: ele enfileira as tarefas
+# periódicas, devolve à fila as tarefas abandonadas e reinicia processos que
+# tenham terminado. Com --processes 0 as threads rodam no próprio processo
+# principal (útil em desenvolvimento).
+# SIGTERM ou Ctrl+C encerram os workers depois que terminam a tarefa atual.
+
+
+def run_threads(threads, stop):
+    workers = [
+        threading.Thread(target=work, args=(stop,), name=f"jobs-worker-{index}")
+        for index in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def run_process(threads, stop):
+    # O encerramento é coordenado pelo processo principal via "stop".
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    run_threads(threads, stop)
+
+
+class Command(BaseCommand):
+    help = "Executa os workers da fila de tarefas em segundo plano."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=settings.JOBS_PROCESSES,
+            help="Processos de workers (0 executa as threads neste processo).",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=settings.JOBS_THREADS,
+            help="Threads consumindo a fila em cada processo.",
+        )
+
+    def handle(self, *args, **options):
+        processes, threads = options["processes"], options["threads"]
+        if processes < 0 or threads < 1:
+            raise CommandError("Use --processes >= 0 e --threads >= 1.")
+
+        context = multiprocessing.get_context("fork")
+        stop = context.Event()
+        # O sinal só marca o pedido de encerramento; o "stop" é sinalizado pelo
+        # laço de supervisão (chamar stop.set() dentro do tratador de sinal pode
+        # travar se o sinal chegar enquanto o próprio processo espera nele).
+        self.stopping = False
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, self.request_stop)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Workers iniciados: {processes} processo(s) x {threads} thread(s)."
+            )
+        )
+        if processes == 0:
+            local = threading.Thread(target=run_threads, args=(threads, stop))
+            local.start()
+            self.supervise(stop, [])
+            local.join()
+        else:
+            # Os processos filhos abrem as próprias conexões com o banco.
+            connections.close_all()
+            children = [self.start_child(context, threads, stop) for _ in range(processes)]
+            self.supervise(stop, children, context, threads)
+            for child in children:
+                child.join()
+        self.stdout.write(self.style.SUCCESS("Workers encerrados."))
+
+    def request_stop(self, signum, frame):
+        self.stopping = True
+
+    def start_child(self, context, threads, stop):
+        child = context.Process(target=run_process, args=(threads, stop))
+        child.start()
+        return child
+
+    def supervise(self, stop, children, context=None, threads=None):
+        while not self.stopping:
+            try:
+                enqueue_periodic()
+                requeue_stale()
+            except Exception as e:
+                self.stderr.write(f"Falha ao verificar os agendamentos: {e}")
+            finally:
+                connections.close_all()
+            for index, child in enumerate(children):
+                if not child.is_alive():
+                    self.stderr.write(
+                        f"Processo {child.pid} terminou (código {child.exitcode}); reiniciando."
+                    )
+                    children[index] = self.start_child(context, threads, stop)
+            deadline = time.monotonic() + settings.JOBS_SCHEDULER_INTERVAL
+            while not self.stopping and time.monotonic() < deadline:
+                time.sleep(0.2)
+        stop.set()
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        # Tarefas já em execução passam a contar o heartbeat a partir do início.
+        migrations.RunSQL(
+            sql="UPDATE jobs_job SET heartbeat_at = started_at WHERE status = 'running'",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
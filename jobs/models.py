@@ -0,0 +1,58 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    # Tarefa enfileirada para execução em segundo plano (ver queue.py).
+    # "task" é o nome registrado da função e "kwargs" os argumentos, em JSON.
+    # Tarefas com run_at no futuro são agendadas; as que falham voltam para a
+    # fila com run_at adiado até atingir max_attempts. Durante a execução o
+    # worker atualiza heartbeat_at periodicamente.
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Na fila"
+        RUNNING = "running", "Em execução"
+        SUCCEEDED = "succeeded", "Concluída"
+        FAILED = "failed", "Falhou"
+
+    task = models.CharField(max_length=255)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.QUEUED
+    )
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=1)
+    last_error = models.TextField(blank=True)
+    worker = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Busca da próxima tarefa pronta: só as linhas na fila entram no índice.
+            models.Index(
+                fields=["run_at", "id"],
+                name="job_queued_run_at_idx",
+                condition=models.Q(status="queued"),
+            ),
+            models.Index(fields=["status", "finished_at"], name="job_status_finished_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.status})"
+
+
+class PeriodicJob(models.Model):
+    # Próxima execução de cada tarefa periódica configurada em JOBS_PERIODIC.
+    # A linha é travada (SKIP LOCKED) ao enfileirar, então vários processos de
+    # workers podem verificar os agendamentos sem enfileirar a mesma tarefa duas vezes.
+
+    name = models.CharField(max_length=100, unique=True)
+    next_run_at = models.DateTimeField()
+    last_enqueued_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return self.name
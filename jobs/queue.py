@@ -0,0 +1,256 @@
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.metrics import JOB_DURATION, JOBS_PROCESSED
+from .models import Job, PeriodicJob
+from .registry import get_task, task_name
+
+logger = logging.getLogger(__name__)
+
+# Fila de tarefas em segundo plano guardada no PostgreSQL.
+# enqueue() apenas insere uma linha em Job, na mesma transação de quem chama:
+# se a transação for desfeita a tarefa também é. Os workers (comando
+# run_workers) buscam a próxima tarefa pronta com
+# SELECT ... FOR UPDATE SKIP LOCKED, marcam-na como em execução e confirmam a
+# transação antes de executá-la; assim vários workers consomem a fila ao mesmo
+# tempo sem disputar a mesma linha e sem manter transações abertas durante a
+# execução. Falhas voltam para a fila com espera exponencial
+# (JOBS_RETRY_BACKOFF * 2^(tentativa - 1), limitada a JOBS_RETRY_BACKOFF_MAX).
+# Enquanto uma tarefa executa, o processo do worker atualiza heartbeat_at; só
+# tarefas sem heartbeat recente (worker encerrado) voltam para a fila.
+
+
+def enqueue(task, kwargs=None, *, run_at=None, delay=None, max_attempts=None):
+    name = task if isinstance(task, str) else task_name(task)
+    func = get_task(name)
+    if run_at is None:
+        run_at = timezone.now() + timedelta(seconds=delay or 0)
+    return Job.objects.create(
+        task=name,
+        kwargs=kwargs or {},
+        run_at=run_at,
+        max_attempts=max_attempts or func.max_attempts or settings.JOBS_MAX_ATTEMPTS,
+    )
+
+
+# Indica se já existe uma tarefa na fila (ainda não iniciada) com este nome.
+# Usado para coalescer pedidos repetidos de uma mesma tarefa sem argumentos.
+
+
+def is_pending(task):
+    name = task if isinstance(task, str) else task_name(task)
+    return Job.objects.filter(task=name, status=Job.Status.QUEUED).exists()
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_native_id()}"
+
+
+# Heartbeat das tarefas em execução no processo.
+# Uma única thread por processo atualiza heartbeat_at de todas as tarefas que
+# as threads do processo estão executando, a cada JOBS_HEARTBEAT_INTERVAL
+# segundos. O filtro por worker e tentativa garante que uma tarefa devolvida à
+# fila (e talvez já assumida por outro worker) não seja marcada como viva.
+
+
+class Heartbeat:
+    def __init__(self):
+        self._running = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def add(self, job):
+        with self._lock:
+            self._running[job.pk] = (job.worker, job.attempts)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._beat, name="jobs-heartbeat", daemon=True
+                )
+                self._thread.start()
+
+    def remove(self, job):
+        with self._lock:
+            self._running.pop(job.pk, None)
+
+    def _beat(self):
+        while True:
+            time.sleep(settings.JOBS_HEARTBEAT_INTERVAL)
+            with self._lock:
+                running = list(self._running.items())
+            try:
+                now = timezone.now()
+                for pk, (worker, attempts) in running:
+                    Job.objects.filter(
+                        pk=pk, status=Job.Status.RUNNING, worker=worker, attempts=attempts
+                    ).update(heartbeat_at=now)
+            except Exception:
+                logger.exception("Falha ao registrar o heartbeat das tarefas")
+            finally:
+                connections.close_all()
+
+
+heartbeat = Heartbeat()
+
+
+def claim_job(worker):
+    with transaction.atomic():
+        job = (
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.Status.QUEUED, run_at__lte=timezone.now())
+            .order_by("run_at", "id")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = Job.Status.RUNNING
+        job.attempts += 1
+        job.worker = worker
+        job.started_at = job.heartbeat_at = timezone.now()
+        job.save(
+            update_fields=["status", "attempts", "worker", "started_at", "heartbeat_at"]
+        )
+    return job
+
+
+def retry_delay(attempts):
+    delay = settings.JOBS_RETRY_BACKOFF * 2 ** (attempts - 1)
+    delay = min(delay, settings.JOBS_RETRY_BACKOFF_MAX)
+    # Variação aleatória para que falhas simultâneas não voltem todas juntas.
+    return delay * random.uniform(0.8, 1.2)
+
+
+# Executa a tarefa e grava o resultado. A gravação só vale se a linha ainda
+# estiver em execução por este worker nesta tentativa: se ela foi devolvida à
+# fila (heartbeat perdido), o resultado não sobrescreve o estado atual.
+
+
+def run_job(job):
+    started = time.perf_counter()
+    heartbeat.add(job)
+    try:
+        get_task(job.task)(**job.kwargs)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            job.status = Job.Status.QUEUED
+            job.run_at = timezone.now() + timedelta(seconds=retry_delay(job.attempts))
+            outcome = "retried"
+        else:
+            job.status = Job.Status.FAILED
+            job.finished_at = timezone.now()
+            outcome = "failed"
+        logger.warning("Tarefa %s #%s falhou (%s)", job.task, job.pk, outcome)
+    else:
+        job.status = Job.Status.SUCCEEDED
+        job.finished_at = timezone.now()
+        outcome = "succeeded"
+    finally:
+        heartbeat.remove(job)
+    JOBS_PROCESSED.labels(job.task, outcome).inc()
+    JOB_DURATION.labels(job.task).observe(time.perf_counter() - started)
+    updated = Job.objects.filter(
+        pk=job.pk,
+        status=Job.Status.RUNNING,
+        worker=job.worker,
+        attempts=job.attempts,
+    ).update(
+        status=job.status,
+        run_at=job.run_at,
+        last_error=job.last_error,
+        finished_at=job.finished_at,
+    )
+    if not updated:
+        logger.warning(
+            "Tarefa %s #%s já havia sido devolvida à fila; resultado descartado",
+            job.task,
+            job.pk,
+        )
+    return outcome
+
+
+# Executa tarefas até que "stop" seja sinalizado; sem tarefas prontas, espera
+# JOBS_POLL_INTERVAL segundos antes de consultar a fila de novo.
+
+
+def work(stop):
+    worker = worker_id()
+    while not stop.is_set():
+        close_old_connections()
+        try:
+            job = claim_job(worker)
+        except Exception:
+            logger.exception("Falha ao buscar a próxima tarefa")
+            job = None
+        if job is None:
+            stop.wait(settings.JOBS_POLL_INTERVAL)
+            continue
+        try:
+            run_job(job)
+        except Exception:
+            logger.exception("Falha ao registrar o resultado da tarefa #%s", job.pk)
+    close_old_connections()
+
+
+# Enfileira as tarefas periódicas (JOBS_PERIODIC) cujo horário já chegou.
+# Retorna a quantidade enfileirada.
+
+
+def enqueue_periodic():
+    now = timezone.now()
+    configured = settings.JOBS_PERIODIC
+    existing = set(
+        PeriodicJob.objects.filter(name__in=configured).values_list("name", flat=True)
+    )
+    PeriodicJob.objects.bulk_create(
+        [PeriodicJob(name=name, next_run_at=now) for name in configured if name not in existing],
+        ignore_conflicts=True,
+    )
+
+    enqueued = 0
+    with transaction.atomic():
+        due = PeriodicJob.objects.select_for_update(skip_locked=True).filter(
+            name__in=configured, next_run_at__lte=now
+        )
+        for periodic in due:
+            entry = configured[periodic.name]
+            enqueue(entry["task"], entry.get("kwargs"))
+            periodic.last_enqueued_at = now
+            periodic.next_run_at = now + timedelta(seconds=entry["interval"])
+            periodic.save(update_fields=["last_enqueued_at", "next_run_at"])
+            enqueued += 1
+    return enqueued
+
+
+# Devolve à fila as tarefas "em execução" sem heartbeat há mais de
+# JOBS_HEARTBEAT_TIMEOUT segundos, cujo worker foi encerrado no meio da
+# execução. Tarefas demoradas de um worker vivo continuam em execução. As que
+# já esgotaram as tentativas são marcadas como falhas, para que uma tarefa que
+# derruba o worker não seja repetida indefinidamente.
+
+
+def requeue_stale():
+    now = timezone.now()
+    stale = Job.objects.filter(
+        status=Job.Status.RUNNING,
+        heartbeat_at__lt=now - timedelta(seconds=settings.JOBS_HEARTBEAT_TIMEOUT),
+    )
+    requeued = stale.filter(attempts__lt=F("max_attempts")).update(
+        status=Job.Status.QUEUED, run_at=now
+    )
+    stale.update(
+        status=Job.Status.FAILED,
+        finished_at=now,
+        last_error="Worker encerrado durante a execução (sem heartbeat).",
+    )
+    return requeued
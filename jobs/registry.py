@@ -0,0 +1,27 @@
+# Registro das funções que podem ser executadas como tarefas.
+# As funções são declaradas nos módulos tasks.py de cada app com o decorador
+# @task e registradas pelo nome "módulo.função". O decorador acrescenta à função
+# o atalho .enqueue(**kwargs), equivalente a queue.enqueue(função, kwargs).
+
+TASKS = {}
+
+
+def task_name(func):
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def task(func=None, *, max_attempts=None):
+    def decorator(func):
+        from .queue import enqueue
+
+        func.task_name = task_name(func)
+        func.max_attempts = max_attempts
+        func.enqueue = lambda **kwargs: enqueue(func, kwargs)
+        TASKS[func.task_name] = func
+        return func
+
+    return decorator(func) if func else decorator
+
+
+def get_task(name):
+    return TASKS[name]
@@ -0,0 +1,76 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import Job
+from .queue import claim_job, enqueue, requeue_stale, run_job
+from .registry import task
+
+calls = []
+
+
+@task(max_attempts=2)
+def record_call(value):
+    calls.append(value)
+
+
+class QueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_claim_and_run(self):
+        job = enqueue(record_call, {"value": 1})
+
+        claimed = claim_job("worker-1")
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual(run_job(claimed), "succeeded")
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.SUCCEEDED)
+        self.assertEqual(calls, [1])
+
+    def test_failure_is_retried_later(self):
+        enqueue(record_call, {"value": 1})
+        job = claim_job("worker-1")
+
+        with mock.patch.dict("jobs.registry.TASKS", {job.task: mock.Mock(side_effect=ValueError)}):
+            self.assertEqual(run_job(job), "retried")
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.QUEUED)
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn("ValueError", job.last_error)
+
+    def test_requeues_only_jobs_without_heartbeat(self):
+        enqueue(record_call, {"value": 1})
+        enqueue(record_call, {"value": 2})
+        dead = claim_job("worker-1")
+        alive = claim_job("worker-2")
+        old = timezone.now() - timedelta(seconds=settings.JOBS_HEARTBEAT_TIMEOUT + 1)
+        Job.objects.filter(pk=dead.pk).update(heartbeat_at=old)
+        Job.objects.filter(pk=alive.pk).update(started_at=old)
+
+        self.assertEqual(requeue_stale(), 1)
+
+        dead.refresh_from_db()
+        alive.refresh_from_db()
+        self.assertEqual(dead.status, Job.Status.QUEUED)
+        self.assertEqual(alive.status, Job.Status.RUNNING)
+
+    def test_requeued_job_is_not_overwritten_by_the_old_run(self):
+        enqueue(record_call, {"value": 1})
+        job = claim_job("worker-1")
+        Job.objects.filter(pk=job.pk).update(
+            heartbeat_at=timezone.now()
+            - timedelta(seconds=settings.JOBS_HEARTBEAT_TIMEOUT + 1)
+        )
+        requeue_stale()
+
+        run_job(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.QUEUED)
+        self.assertIsNone(job.finished_at)
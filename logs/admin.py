@@ -1,9 +1,36 @@
 from django.contrib import admin
-from .models import SearchLog
+
+from core.admin import LargeTableAdminMixin
+from .models import SearchLog, SearchTerm
+from .terms import normalize_term
 
 
 @admin.register(SearchLog)
-class SearchLogAdmin(admin.ModelAdmin):
-    list_display = ("search_term", "found", "component", "created_at")
-    search_fields = ("search_term",)
+class SearchLogAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ("term", "found", "result_count", "component", "created_at")
+    list_select_related = ("term", "component")
+    search_fields = ("term__term",)
+    search_help_text = "Busca pelo início do termo (sem diferenciar maiúsculas nem acentos)."
+    # Filtro por período (hoje, últimos 7 dias, este mês...) em vez de
+    # date_hierarchy, que monta os links com um SELECT DISTINCT de datas sobre a
+    # tabela inteira; o intervalo é resolvido pelo índice de created_at.
     list_filter = ("found", "created_at")
+    raw_id_fields = ("term", "component")
+
+    # O texto digitado é normalizado como os termos do dicionário e buscado
+    # pelo prefixo (índice _like do campo único SearchTerm.term); o log é
+    # filtrado pelos ids encontrados.
+
+    def get_search_results(self, request, queryset, search_term):
+        term = normalize_term(search_term)
+        if not term:
+            return queryset, False
+        terms = SearchTerm.objects.filter(term__startswith=term).values("id")
+        return queryset.filter(term_id__in=terms), False
+
+
+@admin.register(SearchTerm)
+class SearchTermAdmin(admin.ModelAdmin):
+    list_display = ("term", "query")
+    search_fields = ("term",)
+    ordering = ("term",)
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('components', '0006_component_popularity'),
+        ('logs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='searchlog',
+            name='result_count',
+            field=models.PositiveIntegerField(default=0, help_text='Quantidade de componentes retornados pela busca.'),
+        ),
+        migrations.AlterField(
+            model_name='searchlog',
+            name='component',
+            field=models.ForeignKey(blank=True, help_text='Componente que apareceu em primeiro lugar nos resultados.', null=True, on_delete=django.db.models.deletion.SET_NULL, to='components.component'),
+        ),
+        # Popularidade inicial: buscas antigas que já tinham o componente vinculado.
+        migrations.RunSQL(
+            sql="""
+                UPDATE components_component AS c
+                SET popularity = c.popularity + s.hits
+                FROM (
+                    SELECT component_id, COUNT(*) AS hits
+                    FROM logs_searchlog
+                    WHERE component_id IS NOT NULL
+                    GROUP BY component_id
+                ) AS s
+                WHERE c.id = s.component_id
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
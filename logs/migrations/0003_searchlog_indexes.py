@@ -0,0 +1,24 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:37
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('components', '0006_component_popularity'),
+        ('logs', '0002_searchlog_result_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='searchlog',
+            index=models.Index(fields=['created_at'], name='searchlog_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='searchlog',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('search_term'), name='text_pattern_ops'), name='searchlog_term_prefix_idx'),
+        ),
+    ]
@@ -0,0 +1,77 @@
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+# Mesma normalização de logs/terms.py, copiada para que a migração não dependa
+# de mudanças futuras no código.
+
+
+def normalize_term(term):
+    decomposed = unicodedata.normalize("NFKD", term.strip().lower())
+    folded = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return folded.strip()[:255]
+
+
+# Cria os termos a partir dos valores distintos de search_term e preenche
+# term_id com um único UPDATE a partir de uma tabela temporária com o
+# mapeamento termo digitado -> id. search_term não tem índice btree, então um
+# UPDATE por lote de termos percorreria o SearchLog inteiro a cada lote.
+
+
+def backfill_terms(apps, schema_editor):
+    SearchLog = apps.get_model("logs", "SearchLog")
+    SearchTerm = apps.get_model("logs", "SearchTerm")
+
+    raw_terms = list(SearchLog.objects.values_list("search_term", flat=True).distinct())
+    normalized = {raw: normalize_term(raw) for raw in raw_terms}
+    SearchTerm.objects.bulk_create(
+        [SearchTerm(term=term) for term in set(normalized.values())],
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    ids = dict(SearchTerm.objects.values_list("term", "id"))
+
+    table = SearchLog._meta.db_table
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE TEMPORARY TABLE searchterm_mapping "
+            "(search_term varchar(255) PRIMARY KEY, term_id bigint NOT NULL) "
+            "ON COMMIT DROP"
+        )
+        cursor.executemany(
+            "INSERT INTO searchterm_mapping (search_term, term_id) VALUES (%s, %s)",
+            [(raw, ids[normalized[raw]]) for raw in raw_terms],
+        )
+        cursor.execute("ANALYZE searchterm_mapping")
+        cursor.execute(
+            f"UPDATE {table} AS log SET term_id = mapping.term_id "
+            "FROM searchterm_mapping AS mapping "
+            "WHERE log.search_term = mapping.search_term"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logs', '0003_searchlog_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(help_text='Termo sem espaços nas pontas, em minúsculas e sem acentos.', max_length=255, unique=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='searchlog',
+            name='term',
+            field=models.ForeignKey(help_text='Termo buscado, já normalizado.', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='searches', to='logs.searchterm'),
+        ),
+        migrations.RunPython(backfill_terms, migrations.RunPython.noop),
+    ]
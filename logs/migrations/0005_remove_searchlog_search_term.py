@@ -0,0 +1,48 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Ao desfazer a migração, search_term volta a ser preenchido com o termo
+# normalizado (o texto original digitado não é mais conhecido).
+
+
+def restore_raw_terms(apps, schema_editor):
+    SearchLog = apps.get_model("logs", "SearchLog")
+    SearchTerm = apps.get_model("logs", "SearchTerm")
+    SearchLog.objects.update(
+        search_term=models.Subquery(
+            SearchTerm.objects.filter(pk=models.OuterRef("term_id")).values("term")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logs', '0004_searchterm'),
+        # O backfill de dashboard.0003 lê logs_searchlog.search_term, que é
+        # removida aqui.
+        ('dashboard', '0003_searchtermcount'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='searchlog',
+            name='search_term',
+            field=models.CharField(help_text='Termo que o usuário digitou no campo de busca.', max_length=255, null=True),
+        ),
+        migrations.RunPython(migrations.RunPython.noop, restore_raw_terms),
+        migrations.RemoveIndex(
+            model_name='searchlog',
+            name='searchlog_term_prefix_idx',
+        ),
+        migrations.RemoveField(
+            model_name='searchlog',
+            name='search_term',
+        ),
+        migrations.AlterField(
+            model_name='searchlog',
+            name='term',
+            field=models.ForeignKey(help_text='Termo buscado, já normalizado.', on_delete=django.db.models.deletion.PROTECT, related_name='searches', to='logs.searchterm'),
+        ),
+    ]
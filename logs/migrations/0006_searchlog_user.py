@@ -0,0 +1,26 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('components', '0007_relatedcomponent'),
+        ('logs', '0005_remove_searchlog_search_term'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='searchlog',
+            name='user',
+            field=models.ForeignKey(blank=True, help_text='Usuário que fez a busca.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='searchlog',
+            index=models.Index(condition=models.Q(('component__isnull', False), ('user__isnull', False)), fields=['user', 'created_at'], name='searchlog_user_created_idx'),
+        ),
+    ]
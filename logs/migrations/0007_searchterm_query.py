@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+
+# Para os termos já existentes o texto digitado não é mais conhecido (ver
+# 0005), então query recebe o próprio termo normalizado.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logs', '0006_searchlog_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='searchterm',
+            name='query',
+            field=models.CharField(default='', help_text='Termo como chegou à busca (sem espaços nas pontas e em minúsculas), na primeira vez em que foi buscado.', max_length=255),
+            preserve_default=False,
+        ),
+        migrations.RunSQL(
+            sql="UPDATE logs_searchterm SET query = term",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
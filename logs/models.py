@@ -1,27 +1,79 @@
+from django.conf import settings
 from django.db import models
 from components.models import Component
 
 
+class SearchTerm(models.Model):
+    # Dicionário de termos de busca normalizados (ver terms.py).
+    # Cada termo aparece uma única vez; o SearchLog e as contagens do dashboard
+    # referenciam o termo pelo id. No PostgreSQL o campo único também ganha o
+    # índice "_like" (varchar_pattern_ops), que atende buscas por prefixo.
+
+    term = models.CharField(
+        max_length=255,
+        unique=True,
+        help_text="Termo sem espaços nas pontas, em minúsculas e sem acentos.",
+    )
+    # A busca de componentes diferencia acentos, então o aquecimento do cache
+    # (core/warmup.py) usa o termo como foi digitado, e não a forma normalizada.
+    query = models.CharField(
+        max_length=255,
+        help_text=(
+            "Termo como chegou à busca (sem espaços nas pontas e em minúsculas), "
+            "na primeira vez em que foi buscado."
+        ),
+    )
+
+    def __str__(self):
+        return self.term
+
+
 class SearchLog(models.Model):
     # Modelo responsável por registrar as buscas realizadas pelos usuários no sistema.
-    # Armazena o termo buscado, se a busca teve resultados, e o componente vinculado.
+    # Armazena o termo buscado, quem buscou, se a busca teve resultados, quantos
+    # resultados retornou e o componente que apareceu em primeiro lugar.
 
-    search_term = models.CharField(
-        max_length=255, help_text="Termo que o usuário digitou no campo de busca."
+    term = models.ForeignKey(
+        SearchTerm,
+        on_delete=models.PROTECT,
+        related_name="searches",
+        help_text="Termo buscado, já normalizado.",
     )
     found = models.BooleanField(
         default=False, help_text="Indica se a busca retornou ao menos um resultado."
     )
+    result_count = models.PositiveIntegerField(
+        default=0, help_text="Quantidade de componentes retornados pela busca."
+    )
     component = models.ForeignKey(
         Component,
         on_delete=models.SET_NULL,
         null=True,
         blank=True,
-        help_text="Referência ao componente encontrado, se for um único item.",
+        help_text="Componente que apareceu em primeiro lugar nos resultados.",
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        help_text="Usuário que fez a busca.",
     )
     created_at = models.DateTimeField(
         auto_now_add=True, help_text="Data e hora em que a busca foi registrada."
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"], name="searchlog_created_at_idx"),
+            # Sessões de busca por usuário (ver components/related.py).
+            models.Index(
+                fields=["user", "created_at"],
+                name="searchlog_user_created_idx",
+                condition=models.Q(user__isnull=False, component__isnull=False),
+            ),
+        ]
+
     def __str__(self):
-        return f"SearchLog(term='{self.search_term}', found={self.found})"
+        return f"SearchLog(term='{self.term}', found={self.found})"
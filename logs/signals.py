@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from core.metrics import SEARCHES
+from .models import SearchLog
+
+# Contabiliza nas métricas cada busca registrada, separando as que
+# encontraram resultados das que não encontraram.
+
+
+@receiver(post_save, sender=SearchLog)
+def count_search(sender, instance, created, **kwargs):
+    if created:
+        SEARCHES.labels("true" if instance.found else "false").inc()
@@ -0,0 +1,70 @@
+import threading
+import unicodedata
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import SearchTerm
+
+# Dicionário de termos de busca.
+# Cada busca registrada no SearchLog aponta para um SearchTerm com o termo
+# normalizado (sem espaços nas pontas, em minúsculas e sem acentos), de modo
+# que "Resistor", "resistor " e "resistôr" contam como o mesmo termo e cada
+# linha do log guarda apenas um inteiro. Os ids dos termos já vistos ficam em
+# um cache LRU do processo, então registrar uma busca repetida não consulta o
+# dicionário.
+
+MAX_LENGTH = SearchTerm._meta.get_field("term").max_length
+
+
+def normalize_term(term):
+    decomposed = unicodedata.normalize("NFKD", term.strip().lower())
+    folded = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return folded.strip()[:MAX_LENGTH]
+
+
+class TermIdCache:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, term):
+        with self._lock:
+            term_id = self._entries.get(term)
+            if term_id is not None:
+                self._entries.move_to_end(term)
+            return term_id
+
+    def set(self, term, term_id):
+        with self._lock:
+            self._entries[term] = term_id
+            self._entries.move_to_end(term)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+term_ids = TermIdCache(settings.SEARCH_TERM_CACHE_SIZE)
+
+
+# Retorna o SearchTerm do termo digitado, criando-o se ainda não existir.
+# Quando o termo vem do cache o objeto é montado só com id e texto, sem consulta.
+# O id só entra no cache depois do commit, para que um termo criado em uma
+# transação desfeita nunca seja reaproveitado.
+
+
+def get_search_term(raw_term):
+    term = normalize_term(raw_term)
+    term_id = term_ids.get(term)
+    if term_id is not None:
+        return SearchTerm(pk=term_id, term=term)
+    search_term, _ = SearchTerm.objects.get_or_create(
+        term=term, defaults={"query": raw_term.strip().lower()[:MAX_LENGTH]}
+    )
+    transaction.on_commit(lambda: term_ids.set(term, search_term.pk))
+    return search_term
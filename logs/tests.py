@@ -1,3 +1,29 @@
-from django.test import TestCase
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
 
-# Create your tests here.
+
+class MigrationsFromZeroTests(TransactionTestCase):
+    """Aplica todas as migrações a partir de um banco vazio, como faz o entrypoint."""
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+
+    def test_migrate_from_zero(self):
+        executor = MigrationExecutor(connection)
+        leaves = executor.loader.graph.leaf_nodes()
+        apps = {app for app, _ in leaves}
+
+        self.migrate([(app, None) for app in apps])
+        self.migrate(leaves)
+
+        with connection.cursor() as cursor:
+            columns = {
+                column.name
+                for column in connection.introspection.get_table_description(
+                    cursor, "logs_searchlog"
+                )
+            }
+        self.assertNotIn("search_term", columns)
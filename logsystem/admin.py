@@ -1,9 +1,128 @@
 from django.contrib import admin
-from .models import ErrorLog
+from django.contrib.postgres.search import SearchQuery
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
+
+from core.admin import LargeTableAdminMixin
+from .models import ErrorGroup, ErrorLog, RequestProfile, error_search_vector
+from .profiling import load_stats
+
+
+@admin.register(ErrorGroup)
+class ErrorGroupAdmin(admin.ModelAdmin):
+    list_display = ("exception_type", "location", "occurrences", "first_seen", "last_seen", "samples_link")
+    ordering = ("-last_seen",)
+    # Filtro por período em vez de date_hierarchy (ver ErrorLogAdmin).
+    list_filter = ("last_seen",)
+    search_fields = ("exception_type", "location")
+    readonly_fields = (
+        "fingerprint",
+        "exception_type",
+        "location",
+        "message",
+        "occurrences",
+        "first_seen",
+        "last_seen",
+        "samples_link",
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    # Ocorrências do grupo que tiveram o traceback guardado.
+
+    @admin.display(description="Amostras")
+    def samples_link(self, obj):
+        url = reverse("admin:logsystem_errorlog_changelist")
+        return format_html('<a href="{}?group__id__exact={}">ver tracebacks</a>', url, obj.pk)
 
 
 @admin.register(ErrorLog)
-class ErrorLogAdmin(admin.ModelAdmin):
-    list_display = ("created_at", "method", "path", "status_code")
-    search_fields = ("path", "error_message", "traceback")
+class ErrorLogAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ("created_at", "method", "path", "status_code", "group")
+    # Filtro por período (hoje, últimos 7 dias, este mês...) em vez de
+    # date_hierarchy, que monta os links com um SELECT DISTINCT de datas sobre a
+    # tabela inteira; o intervalo é resolvido pelo índice de created_at.
+    list_filter = ("created_at", "method", "status_code")
+    list_select_related = ("group",)
+    raw_id_fields = ("group",)
     readonly_fields = ("created_at",)
+    # A busca é feita por texto completo na mensagem e no traceback (índice GIN,
+    # ver ErrorLog.Meta), em vez de LIKE '%...%' em cada coluna.
+    search_fields = ("error_message",)
+    search_help_text = "Busca por palavras na mensagem de erro e no traceback."
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        queryset = queryset.annotate(search=error_search_vector()).filter(
+            search=SearchQuery(search_term, config="simple", search_type="websearch")
+        )
+        return queryset, False
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = (
+        "created_at",
+        "method",
+        "path",
+        "status_code",
+        "duration_ms",
+        "query_count",
+        "trigger",
+        "download_link",
+    )
+    list_filter = ("trigger", "method")
+    search_fields = ("path",)
+    exclude = ("stats",)
+    readonly_fields = (
+        "created_at",
+        "method",
+        "path",
+        "status_code",
+        "duration_ms",
+        "query_count",
+        "trigger",
+        "user",
+        "download_link",
+        "summary_text",
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        urls = [
+            path(
+                "<int:pk>/download/",
+                self.admin_site.admin_view(self.download),
+                name="logsystem_requestprofile_download",
+            )
+        ]
+        return urls + super().get_urls()
+
+    # Baixa o perfil no formato do pstats (abrir com pstats, snakeviz etc.).
+
+    def download(self, request, pk):
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        response = HttpResponse(load_stats(profile), content_type="application/octet-stream")
+        response["Content-Disposition"] = f'attachment; filename="profile-{pk}.prof"'
+        return response
+
+    @admin.display(description="Arquivo")
+    def download_link(self, obj):
+        url = reverse("admin:logsystem_requestprofile_download", args=[obj.pk])
+        return format_html('<a href="{}">profile-{}.prof</a>', url, obj.pk)
+
+    @admin.display(description="Resumo")
+    def summary_text(self, obj):
+        return format_html("<pre>{}</pre>", obj.summary)
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from logsystem.profiling import make_token
+
+# Gera um token para o cabeçalho X-Profile, que ativa o profiling da requisição.
+# O token é assinado com a SECRET_KEY e vale por PROFILING_TOKEN_MAX_AGE segundos.
+
+
+class Command(BaseCommand):
+    help = "Gera um token assinado para perfilar requisições (cabeçalho X-Profile)."
+
+    def handle(self, *args, **options):
+        self.stdout.write(make_token())
+        self.stderr.write(
+            self.style.SUCCESS(
+                f"Token válido por {settings.PROFILING_TOKEN_MAX_AGE} segundos. "
+                "Envie no cabeçalho X-Profile."
+            )
+        )
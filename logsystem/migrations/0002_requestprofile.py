@@ -0,0 +1,35 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logsystem', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=500)),
+                ('method', models.CharField(max_length=10)),
+                ('status_code', models.IntegerField()),
+                ('duration_ms', models.FloatField(help_text='Tempo total da requisição, em milissegundos.')),
+                ('query_count', models.PositiveIntegerField(default=0)),
+                ('trigger', models.CharField(choices=[('header', 'Cabeçalho assinado'), ('param', 'Parâmetro (administrador)'), ('sample', 'Amostragem')], max_length=10)),
+                ('summary', models.TextField(blank=True)),
+                ('stats', models.BinaryField(help_text='Estatísticas do cProfile comprimidas com zlib.')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_at'], name='logsystem_r_created_cdf1ed_idx')],
+            },
+        ),
+    ]
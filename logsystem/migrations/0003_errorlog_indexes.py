@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:37
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logsystem', '0002_requestprofile'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='errorlog',
+            index=models.Index(fields=['created_at'], name='errorlog_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='errorlog',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('error_message', 'traceback', config='simple'), name='errorlog_search_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logsystem', '0003_errorlog_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ErrorGroup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=40, unique=True)),
+                ('exception_type', models.CharField(max_length=255)),
+                ('location', models.CharField(blank=True, help_text='Último frame do projeto (arquivo:função).', max_length=500)),
+                ('message', models.TextField(help_text='Mensagem da primeira ocorrência.')),
+                ('occurrences', models.PositiveBigIntegerField(default=1)),
+                ('first_seen', models.DateTimeField()),
+                ('last_seen', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['last_seen'], name='errorgroup_last_seen_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='errorlog',
+            name='group',
+            field=models.ForeignKey(blank=True, help_text='Grupo do erro; o registro é uma ocorrência amostrada do grupo.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='samples', to='logsystem.errorgroup'),
+        ),
+    ]
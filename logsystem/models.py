@@ -1,7 +1,50 @@
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
 from django.db import models
 
 
+# Vetor de busca textual da mensagem e do traceback. A mesma expressão é usada
+# no índice GIN e nas consultas, para que o PostgreSQL use o índice.
+
+
+def error_search_vector():
+    return SearchVector("error_message", "traceback", config="simple")
+
+
+class ErrorGroup(models.Model):
+    # Agrupamento de erros internos iguais.
+    # Erros com o mesmo tipo de exceção e a mesma sequência de chamadas
+    # (arquivo e função de cada frame, sem números de linha) têm a mesma
+    # impressão digital e são contados no mesmo grupo. Apenas a primeira
+    # ocorrência e uma amostra das seguintes geram um ErrorLog com o traceback.
+
+    fingerprint = models.CharField(max_length=40, unique=True)
+    exception_type = models.CharField(max_length=255)
+    location = models.CharField(
+        max_length=500, blank=True, help_text="Último frame do projeto (arquivo:função)."
+    )
+    message = models.TextField(help_text="Mensagem da primeira ocorrência.")
+    occurrences = models.PositiveBigIntegerField(default=1)
+    first_seen = models.DateTimeField()
+    last_seen = models.DateTimeField()
+
+    class Meta:
+        indexes = [models.Index(fields=["last_seen"], name="errorgroup_last_seen_idx")]
+
+    def __str__(self):
+        return f"{self.exception_type} em {self.location or '?'} ({self.occurrences}x)"
+
+
 class ErrorLog(models.Model):
+    group = models.ForeignKey(
+        ErrorGroup,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="samples",
+        help_text="Grupo do erro; o registro é uma ocorrência amostrada do grupo.",
+    )
     path = models.CharField(max_length=500)
     method = models.CharField(max_length=10)
     status_code = models.IntegerField()
@@ -9,5 +52,42 @@ class ErrorLog(models.Model):
     traceback = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"], name="errorlog_created_at_idx"),
+            GinIndex(error_search_vector(), name="errorlog_search_idx"),
+        ]
+
     def __str__(self):
         return f"[{self.created_at}] {self.method} {self.path} ({self.status_code})"
+
+
+class RequestProfile(models.Model):
+    # Perfil de execução (cProfile) de uma requisição, capturado sob demanda
+    # (ver profiling.py). O perfil completo fica comprimido em "stats", no
+    # formato do pstats, e pode ser baixado pelo admin; "summary" guarda as
+    # funções mais custosas em texto para leitura direta.
+
+    class Trigger(models.TextChoices):
+        HEADER = "header", "Cabeçalho assinado"
+        PARAM = "param", "Parâmetro (administrador)"
+        SAMPLE = "sample", "Amostragem"
+
+    path = models.CharField(max_length=500)
+    method = models.CharField(max_length=10)
+    status_code = models.IntegerField()
+    duration_ms = models.FloatField(help_text="Tempo total da requisição, em milissegundos.")
+    query_count = models.PositiveIntegerField(default=0)
+    trigger = models.CharField(max_length=10, choices=Trigger.choices)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    summary = models.TextField(blank=True)
+    stats = models.BinaryField(help_text="Estatísticas do cProfile comprimidas com zlib.")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["created_at"])]
+
+    def __str__(self):
+        return f"[{self.created_at}] {self.method} {self.path} ({self.duration_ms:.1f} ms)"
@@ -0,0 +1,146 @@
+import cProfile
+import io
+import logging
+import marshal
+import pstats
+import random
+import threading
+import time
+import zlib
+
+from django.conf import settings
+from django.core import signing
+from django.db import connection
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .models import RequestProfile
+
+logger = logging.getLogger(__name__)
+
+# Profiling de requisições sob demanda.
+# Uma requisição é perfilada quando:
+# - traz o cabeçalho X-Profile com um token assinado válido (gerado pelo comando
+#   profiling_token), ou
+# - traz o parâmetro ?profile=1 e o usuário autenticado é administrador (staff), ou
+# - é sorteada pela amostragem PROFILING_SAMPLE_RATE (0 desliga).
+# Nos demais casos o middleware apenas repassa a requisição: o cProfile não é
+# ativado e nenhum custo de profiling é adicionado.
+# O resultado é gravado em RequestProfile e o id volta no cabeçalho X-Profile-Id.
+
+HEADER = "HTTP_X_PROFILE"
+PARAM = "profile"
+SIGNING_SALT = "logsystem.profiling"
+
+# O cProfile não permite dois perfis ativos ao mesmo tempo no mesmo processo.
+_active = threading.Lock()
+
+
+def make_token():
+    return signing.TimestampSigner(salt=SIGNING_SALT).sign("profile")
+
+
+def valid_token(token):
+    try:
+        signing.TimestampSigner(salt=SIGNING_SALT).unsign(
+            token, max_age=settings.PROFILING_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def get_staff_user(request):
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return user if user.is_staff else None
+    try:
+        result = JWTAuthentication().authenticate(request)
+    except Exception:
+        return None
+    if result and result[0].is_staff:
+        return result[0]
+    return None
+
+
+def get_trigger(request):
+    if HEADER in request.META:
+        if valid_token(request.META[HEADER]):
+            return RequestProfile.Trigger.HEADER, None
+        return None, None
+    if request.GET.get(PARAM) in ("1", "true"):
+        user = get_staff_user(request)
+        if user is not None:
+            return RequestProfile.Trigger.PARAM, user
+        return None, None
+    rate = settings.PROFILING_SAMPLE_RATE
+    if rate and random.random() < rate:
+        return RequestProfile.Trigger.SAMPLE, None
+    return None, None
+
+
+def summarize(profiler):
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats("cumulative").print_stats(settings.PROFILING_SUMMARY_LINES)
+    return stream.getvalue()
+
+
+def save_profile(request, response, profiler, trigger, user, duration, queries):
+    # pstats.Stats esvazia profiler.stats, por isso o conteúdo é serializado antes.
+    profiler.create_stats()
+    stats = zlib.compress(marshal.dumps(profiler.stats))
+    profile = RequestProfile.objects.create(
+        path=request.path[:500],
+        method=request.method,
+        status_code=response.status_code,
+        duration_ms=round(duration * 1000, 3),
+        query_count=queries,
+        trigger=trigger,
+        user=user,
+        summary=summarize(profiler),
+        stats=stats,
+    )
+    return profile
+
+
+# Conteúdo no formato de arquivo do pstats (o mesmo de cProfile.dump_stats),
+# que pode ser aberto com pstats, snakeviz ou similares.
+
+
+def load_stats(profile):
+    return zlib.decompress(bytes(profile.stats))
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        trigger, user = get_trigger(request)
+        if trigger is None or not _active.acquire(blocking=False):
+            return self.get_response(request)
+
+        try:
+            queries = []
+            profiler = cProfile.Profile()
+            started = time.perf_counter()
+            with connection.execute_wrapper(
+                lambda execute, *args: queries.append(1) or execute(*args)
+            ):
+                profiler.enable()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    profiler.disable()
+            duration = time.perf_counter() - started
+        finally:
+            _active.release()
+
+        try:
+            profile = save_profile(
+                request, response, profiler, trigger, user, duration, len(queries)
+            )
+            response["X-Profile-Id"] = str(profile.pk)
+        except Exception:
+            logger.exception("Falha ao gravar o perfil de %s", request.path)
+        return response
@@ -1,16 +1,95 @@
+import hashlib
+import os
+import random
 import traceback
-from .models import ErrorLog
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.metrics import INTERNAL_ERRORS
+from .models import ErrorGroup, ErrorLog
 
 # Registra um erro interno (HTTP 500) no banco de dados.
-# Captura o caminho, método HTTP, mensagem de erro e traceback completo.
+# O erro é agrupado pela impressão digital (tipo da exceção + frames
+# normalizados) em ErrorGroup, cujo contador e data da última ocorrência são
+# atualizados com um único UPDATE. O ErrorLog com caminho, método, mensagem e
+# traceback completo é gravado apenas na primeira ocorrência do grupo e em uma
+# fração ERROR_TRACEBACK_SAMPLE_RATE das seguintes.
 # Essa função deve ser chamada dentro de blocos try/except para rastreamento de falhas.
 
 
+def exception_type_name(exception):
+    cls = type(exception)
+    if cls.__module__ == "builtins":
+        return cls.__qualname__
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+# Arquivo relativo ao projeto (ou ao site-packages) e nome da função de cada
+# frame. Números de linha ficam de fora para que mudanças em outras partes do
+# arquivo não separem o mesmo erro em grupos diferentes.
+# Retorna (impressão digital, último frame do projeto).
+
+
+def fingerprint(exception):
+    base_dir = str(settings.BASE_DIR)
+    frames = []
+    location = ""
+    for frame in traceback.extract_tb(exception.__traceback__):
+        filename = frame.filename
+        if filename.startswith(base_dir) and "site-packages" not in filename:
+            filename = os.path.relpath(filename, base_dir)
+            location = f"{filename}:{frame.name}"
+        elif "site-packages" in filename:
+            filename = filename.split("site-packages", 1)[1].lstrip("/\\")
+        frames.append(f"{filename}:{frame.name}")
+    content = "\n".join([exception_type_name(exception), *frames])
+    return hashlib.sha1(content.encode("utf-8")).hexdigest(), location
+
+
+# Incrementa o grupo do erro, criando-o na primeira ocorrência.
+# Retorna (grupo, criado).
+
+
+def record_group(exception, now):
+    digest, location = fingerprint(exception)
+    updated = ErrorGroup.objects.filter(fingerprint=digest).update(
+        occurrences=F("occurrences") + 1, last_seen=now
+    )
+    if updated:
+        return ErrorGroup.objects.only("id").get(fingerprint=digest), False
+    try:
+        with transaction.atomic():
+            group = ErrorGroup.objects.create(
+                fingerprint=digest,
+                exception_type=exception_type_name(exception)[:255],
+                location=location[:500],
+                message=str(exception),
+                first_seen=now,
+                last_seen=now,
+            )
+        return group, True
+    except IntegrityError:
+        # Outro processo criou o grupo ao mesmo tempo.
+        ErrorGroup.objects.filter(fingerprint=digest).update(
+            occurrences=F("occurrences") + 1, last_seen=now
+        )
+        return ErrorGroup.objects.only("id").get(fingerprint=digest), False
+
+
 def log_internal_error(request, exception):
+    INTERNAL_ERRORS.inc()
+    group, created = record_group(exception, timezone.now())
+    if not created and random.random() >= settings.ERROR_TRACEBACK_SAMPLE_RATE:
+        return group
     ErrorLog.objects.create(
+        group=group,
         path=request.path,
         method=request.method,
         status_code=500,
         error_message=str(exception),
-        traceback=traceback.format_exc(),
+        traceback="".join(traceback.format_exception(exception)),
     )
+    return group
@@ -0,0 +1,148 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+
+from .hashing import init_worker
+from .messages import UserMessages
+from .serializers import UserImportSerializer
+
+User = get_user_model()
+
+# Importação de usuários em lote.
+# O custo de criar um usuário está quase todo no hash da senha (PBKDF2), então
+# os hashes são calculados em paralelo em um pool de processos usando todos os
+# núcleos, e os usuários são inseridos de uma vez com bulk_create.
+# Retorna um relatório com a quantidade criada, usuários por segundo e os erros
+# de cada linha (identificada pela posição na lista recebida).
+
+
+class PasswordHasher:
+    # Calcula hashes de senha em um pool de processos.
+    # Cada processo do pool executa django.setup() ao iniciar, então o pool é
+    # criado uma única vez (na primeira chamada com mais de uma senha) e
+    # reaproveitado até o fim do bloco "with": uma importação em vários blocos
+    # (import_users) paga a inicialização só uma vez.
+    #
+    # Os processos filhos não usam o banco e partem sempre do "forkserver", que
+    # não herda os sockets do banco nem as travas das outras threads deste
+    # processo (servidor com threads, requisição dentro de uma transação).
+
+    def __init__(self, workers=None):
+        self.workers = workers or settings.USER_IMPORT_WORKERS
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def hash(self, passwords):
+        if self.workers <= 1 or len(passwords) < 2:
+            return [make_password(password) for password in passwords]
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=init_worker,
+                mp_context=multiprocessing.get_context("forkserver"),
+            )
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        return list(self._pool.map(make_password, passwords, chunksize=chunksize))
+
+
+def import_users(rows, hasher=None):
+    if hasher is None:
+        with PasswordHasher() as hasher:
+            return import_users(rows, hasher)
+
+    started = time.perf_counter()
+    errors = []
+    valid = []
+
+    for index, row in enumerate(rows):
+        serializer = UserImportSerializer(data=row)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors.append({"row": index, "errors": serializer.errors})
+
+    # Unicidade do username dentro do lote e no banco, com uma única consulta.
+    seen = set()
+    unique = []
+    for index, data in valid:
+        if data["username"] in seen:
+            errors.append(
+                {"row": index, "errors": {"username": [UserMessages.DUPLICATE_IN_BATCH]}}
+            )
+            continue
+        seen.add(data["username"])
+        unique.append((index, data))
+
+    taken = set(
+        User.objects.filter(username__in=seen).values_list("username", flat=True)
+    )
+    pending = []
+    for index, data in unique:
+        if data["username"] in taken:
+            errors.append(
+                {"row": index, "errors": {"username": [UserMessages.USERNAME_TAKEN]}}
+            )
+        else:
+            pending.append((index, data))
+
+    hashes = hasher.hash([data["password"] for _, data in pending])
+    users = [
+        User(username=data["username"], email=data["email"], password=password_hash)
+        for (_, data), password_hash in zip(pending, hashes)
+    ]
+
+    created = _insert_users(pending, users, errors)
+    elapsed = time.perf_counter() - started
+    errors.sort(key=lambda error: error["row"])
+    return {
+        "created": len(created),
+        "failed": len(errors),
+        "elapsed_seconds": round(elapsed, 3),
+        "users_per_second": round(len(created) / elapsed, 2) if elapsed else None,
+        "users": [{"id": user.pk, "username": user.username} for user in created],
+        "errors": errors,
+    }
+
+
+# Insere os usuários em lote. Se outro processo criar o mesmo username entre a
+# validação e a inserção (ou outra restrição do banco falhar), o lote falha por
+# inteiro; nesse caso as linhas são inseridas uma a uma para identificar
+# exatamente quais falharam. Só é informado que o username já existe quando ele
+# de fato existe; as demais falhas recebem uma mensagem genérica.
+
+
+def _insert_users(pending, users, errors):
+    try:
+        with transaction.atomic():
+            return User.objects.bulk_create(users, batch_size=500)
+    except IntegrityError:
+        pass
+
+    created = []
+    for (index, _), user in zip(pending, users):
+        try:
+            with transaction.atomic():
+                user.save()
+            created.append(user)
+        except IntegrityError:
+            if User.objects.filter(username=user.username).exists():
+                row_errors = {"username": [UserMessages.USERNAME_TAKEN]}
+            else:
+                row_errors = {"non_field_errors": [UserMessages.ROW_REJECTED]}
+            errors.append({"row": index, "errors": row_errors})
+    return created
@@ -0,0 +1,13 @@
+import os
+
+# Inicialização dos processos que calculam hashes de senha (ver
+# bulk.PasswordHasher). Os processos partem do "forkserver" e não herdam o
+# Django já configurado; por isso este módulo não importa modelos nem
+# serializers, que exigem django.setup() antes de serem carregados.
+
+
+def init_worker():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    import django
+
+    django.setup()
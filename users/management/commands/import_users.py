@@ -0,0 +1,73 @@
+import csv
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from users.bulk import PasswordHasher, import_users
+
+# Importa usuários de um arquivo CSV com as colunas username, email e password.
+# As linhas são processadas em blocos; os hashes de senha de cada bloco são
+# calculados em paralelo usando todos os núcleos (ou --workers), em um mesmo
+# pool de processos para todo o arquivo.
+
+
+class Command(BaseCommand):
+    help = "Importa usuários em lote a partir de um CSV (username,email,password)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Arquivo CSV, ou '-' para ler da entrada padrão.")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.USER_IMPORT_WORKERS,
+            help="Processos usados para calcular os hashes de senha.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.USER_IMPORT_MAX_ROWS,
+            help="Quantidade de linhas importadas por bloco.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            handle = (
+                sys.stdin
+                if options["path"] == "-"
+                else open(options["path"], newline="", encoding="utf-8")
+            )
+        except OSError as e:
+            raise CommandError(str(e))
+
+        started = time.perf_counter()
+        created = failed = 0
+        with handle, PasswordHasher(options["workers"]) as hasher:
+            reader = csv.DictReader(handle)
+            offset = 0
+            while True:
+                chunk = [row for _, row in zip(range(options["chunk_size"]), reader)]
+                if not chunk:
+                    break
+                report = import_users(chunk, hasher)
+                created += report["created"]
+                failed += report["failed"]
+                for error in report["errors"]:
+                    # +2: cabeçalho do CSV e numeração a partir de 1.
+                    line = offset + error["row"] + 2
+                    messages = "; ".join(
+                        f"{field}: {' '.join(str(m) for m in field_errors)}"
+                        for field, field_errors in error["errors"].items()
+                    )
+                    self.stderr.write(f"Linha {line}: {messages}")
+                offset += len(chunk)
+
+        elapsed = time.perf_counter() - started
+        rate = created / elapsed if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{created} usuário(s) criado(s), {failed} com erro, "
+                f"em {elapsed:.2f}s ({rate:.1f} usuários/s)."
+            )
+        )
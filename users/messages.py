@@ -5,3 +5,9 @@ class UserMessages:
     NOT_FOUND = "Usuário não encontrado."
     ERROR = "Erro interno. Tente novamente mais tarde."
     CANNOT_DELETE_ADMIN = "Não é permitido deletar um usuário admin."
+    BULK_INVALID_PAYLOAD = "Envie uma lista de usuários (ou um objeto com a chave 'users')."
+    BULK_TOO_MANY_ROWS = "A importação aceita no máximo {max_rows} usuários por requisição."
+    BULK_CREATED = "{created} usuário(s) criado(s), {failed} com erro."
+    DUPLICATE_IN_BATCH = "Nome de usuário repetido na importação."
+    USERNAME_TAKEN = "Já existe um usuário com este nome."
+    ROW_REJECTED = "O usuário não pôde ser gravado (restrição do banco de dados)."
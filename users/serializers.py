@@ -28,3 +28,13 @@ class UserSerializer(serializers.ModelSerializer):
             instance.set_password(password)
         instance.save()
         return instance
+
+
+class UserImportSerializer(serializers.Serializer):
+    # Valida uma linha da importação em lote.
+    # A unicidade do username é verificada para o lote inteiro de uma vez
+    # (ver bulk.py), por isso não há validador de unicidade aqui.
+
+    username = serializers.CharField(max_length=100)
+    email = serializers.EmailField(required=False, allow_blank=True, default="")
+    password = serializers.CharField(write_only=True)
@@ -1,7 +1,8 @@
 from django.urls import path
-from .views import UserListCreateAPIView, UserDetailAPIView
+from .views import UserListCreateAPIView, UserBulkImportAPIView, UserDetailAPIView
 
 urlpatterns = [
     path("", UserListCreateAPIView.as_view(), name="user-list-create"),
+    path("bulk/", UserBulkImportAPIView.as_view(), name="user-bulk-import"),
     path("<int:pk>/", UserDetailAPIView.as_view(), name="user-detail"),
 ]
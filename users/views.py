@@ -1,10 +1,16 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
+from rest_framework.exceptions import NotFound
+from core.swagger import openapi, swagger_auto_schema
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
 
+from core.pagination import DefaultPagination
+from idempotency.decorators import idempotent
+from .bulk import import_users
 from .serializers import UserSerializer
 from logsystem.utils import log_internal_error
 from .messages import UserMessages
@@ -16,17 +22,54 @@ class UserListCreateAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     @swagger_auto_schema(
-        operation_description="Lista todos os usuários.",
+        operation_description="Lista os usuários de forma paginada.",
+        manual_parameters=[
+            openapi.Parameter(
+                "page", in_=openapi.IN_QUERY, type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                "page_size", in_=openapi.IN_QUERY, type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                "search",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="Filtra por parte do username ou do email",
+            ),
+            openapi.Parameter(
+                "is_active", in_=openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN
+            ),
+            openapi.Parameter(
+                "is_staff", in_=openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN
+            ),
+        ],
         responses={200: UserSerializer(many=True)},
     )
-    # Recupera todos os usuários cadastrados no sistema.
+    # Recupera os usuários cadastrados no sistema, uma página por vez.
+    # Aceita os filtros "search" (username ou email), "is_active" e "is_staff".
     # Serializa e retorna os dados em formato JSON com status 200.
+    # Página inexistente ou inválida retorna status 404.
     # Em caso de erro interno, registra no sistema de logs.
     def get(self, request):
         try:
-            users = User.objects.all()
-            serializer = UserSerializer(users, many=True)
-            return Response(serializer.data)
+            users = User.objects.order_by("id")
+
+            search = request.query_params.get("search")
+            if search:
+                users = users.filter(
+                    Q(username__icontains=search) | Q(email__icontains=search)
+                )
+            for field in ("is_active", "is_staff"):
+                value = request.query_params.get(field)
+                if value is not None:
+                    users = users.filter(**{field: value.lower() in ("1", "true")})
+
+            paginator = DefaultPagination()
+            page = paginator.paginate_queryset(users, request, view=self)
+            serializer = UserSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+        except NotFound:
+            raise
         except Exception as e:
             log_internal_error(request, e)
             return Response(
@@ -37,17 +80,29 @@ class UserListCreateAPIView(APIView):
     @swagger_auto_schema(
         operation_description="Cria um novo usuário.",
         request_body=UserSerializer,
+        manual_parameters=[
+            openapi.Parameter(
+                "Idempotency-Key",
+                in_=openapi.IN_HEADER,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="Chave única da operação; repetições recebem a mesma resposta.",
+            ),
+        ],
         responses={201: UserSerializer},
     )
     # Valida os dados recebidos e cria um novo usuário no sistema.
     # Retorna os dados do usuário criado com status 201 em caso de sucesso.
     # Em caso de erro de validação, retorna status 400.
+    # Com o cabeçalho Idempotency-Key, repetições recebem a resposta original.
     # Em caso de erro interno, registra no sistema de logs.
+    @idempotent
     def post(self, request):
         try:
             serializer = UserSerializer(data=request.data)
             if serializer.is_valid():
-                serializer.save()
+                with transaction.atomic():
+                    serializer.save()
                 return Response(
                     {"message": UserMessages.CREATED, "data": serializer.data},
                     status=status.HTTP_201_CREATED,
@@ -61,6 +116,88 @@ class UserListCreateAPIView(APIView):
             )
 
 
+class UserBulkImportAPIView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Cria vários usuários de uma vez. Recebe uma lista de objetos com "
+            "username, email e password (ou um objeto com a chave 'users')."
+        ),
+        request_body=openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            items=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "username": openapi.Schema(type=openapi.TYPE_STRING),
+                    "email": openapi.Schema(type=openapi.TYPE_STRING),
+                    "password": openapi.Schema(type=openapi.TYPE_STRING),
+                },
+            ),
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                "Idempotency-Key",
+                in_=openapi.IN_HEADER,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="Chave única da operação; repetições recebem a mesma resposta.",
+            ),
+        ],
+        responses={
+            201: "Relatório da importação",
+            400: "Nenhum usuário criado ou requisição inválida",
+        },
+    )
+    # Importa usuários em lote (restrito a administradores).
+    # Os hashes de senha são calculados em paralelo e os usuários inseridos com bulk_create.
+    # Retorna o relatório com usuários criados, usuários por segundo e erros por linha.
+    # Se nenhum usuário for criado, retorna status 400 com o mesmo relatório.
+    # Com o cabeçalho Idempotency-Key, repetições recebem o relatório original.
+    # Em caso de erro interno, registra no sistema de logs.
+    @idempotent
+    def post(self, request):
+        try:
+            rows = request.data
+            if isinstance(rows, dict):
+                rows = rows.get("users")
+            if not isinstance(rows, list) or not all(
+                isinstance(row, dict) for row in rows
+            ):
+                return Response(
+                    {"detail": UserMessages.BULK_INVALID_PAYLOAD},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if len(rows) > settings.USER_IMPORT_MAX_ROWS:
+                return Response(
+                    {
+                        "detail": UserMessages.BULK_TOO_MANY_ROWS.format(
+                            max_rows=settings.USER_IMPORT_MAX_ROWS
+                        )
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            report = import_users(rows)
+            return Response(
+                {
+                    "message": UserMessages.BULK_CREATED.format(**report),
+                    "data": report,
+                },
+                status=(
+                    status.HTTP_201_CREATED
+                    if report["created"]
+                    else status.HTTP_400_BAD_REQUEST
+                ),
+            )
+        except Exception as e:
+            log_internal_error(request, e)
+            return Response(
+                {"detail": UserMessages.ERROR},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
 class UserDetailAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 